@@ -0,0 +1,145 @@
+"""Monthly tar packs of old recordings."""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Iterator, Optional
+
+from hns.files import _write_text_atomic
+
+
+class RecordingArchive:
+    """Per-month tar packs of old recordings in `<save_dir>/archive`, each with a JSON offset index.
+
+    Packs are plain uncompressed tar files, so any tool can unpack them. The index maps every
+    member (`folder/file`) to the offset and size of its data, so reading one file from a pack is
+    a single seek rather than a scan, and keeps the file's mtime so the search index stays valid.
+    """
+
+    DIRNAME = "archive"
+
+    def __init__(self, save_dir: Path):
+        self.save_dir = save_dir
+        self.archive_dir = save_dir / self.DIRNAME
+        self._indexes = {}
+
+    @staticmethod
+    def pack_name(folder_name: str) -> str:
+        # Recording folders start with YYYY_MM_DD, so the month is the first seven characters
+        return folder_name[:7]
+
+    def _pack_path(self, month: str) -> Path:
+        return self.archive_dir / f"{month}.tar"
+
+    def _index_path(self, month: str) -> Path:
+        # Not .json, so the index is never mistaken for a recording's metadata
+        return self.archive_dir / f"{month}.tar.idx"
+
+    def _load_index(self, month: str) -> dict:
+        if month not in self._indexes:
+            try:
+                self._indexes[month] = json.loads(self._index_path(month).read_text())["members"]
+            except (OSError, ValueError, KeyError, TypeError):
+                self._indexes[month] = {}
+        return self._indexes[month]
+
+    def _save_index(self, month: str, members: dict):
+        _write_text_atomic(self._index_path(month), json.dumps({"members": members}))
+        self._indexes[month] = members
+
+    def members(self) -> Iterator[tuple[str, float]]:
+        """Yield (member path, mtime) for every archived file."""
+        for index_path in sorted(self.archive_dir.glob("*.tar.idx")):
+            for name, (_, _, mtime) in self._load_index(index_path.name.split(".")[0]).items():
+                yield name, mtime
+
+    def read(self, name: str) -> Optional[bytes]:
+        """Contents of an archived file, or None if it is not in any pack."""
+        month = self.pack_name(name)
+        entry = self._load_index(month).get(name)
+        if entry is None:
+            return None
+        offset, size, _ = entry
+        with self._pack_path(month).open("rb") as f:
+            f.seek(offset)
+            return f.read(size)
+
+    @staticmethod
+    def can_archive(folder: Path) -> bool:
+        """Whether every entry of the folder is a plain file, the only kind a pack holds."""
+        return all(path.is_file() and not path.is_symlink() for path in folder.iterdir())
+
+    def add(self, folders: list[Path]) -> list[Path]:
+        """Move recording folders into their month's pack, appending to packs that already exist.
+
+        Folders that also hold subfolders, symlinks or other special files are left in place, since
+        removing them after packing would lose what could not be packed. Returns those folders.
+        """
+        by_month, skipped = {}, []
+        for folder in folders:
+            if not self.can_archive(folder):
+                skipped.append(folder)
+                continue
+            by_month.setdefault(self.pack_name(folder.name), []).append(folder)
+        for month, month_folders in sorted(by_month.items()):
+            self._append(month, month_folders)
+        return skipped
+
+    def _append(self, month: str, folders: list[Path]):
+        import tarfile
+
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        members = dict(self._load_index(month))
+        # Anything after the last indexed member was left by an interrupted run (or is the end-of-archive
+        # marker) and is overwritten
+        end = max((offset + size for offset, size, _ in members.values()), default=0)
+        end = -(-end // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+        with self._pack_path(month).open("a+b") as f:
+            f.truncate(end)
+            f.seek(end)
+            with tarfile.open(fileobj=f, mode="w") as tar:
+                for folder in folders:
+                    for path in sorted(folder.iterdir()):
+                        # Built from stat rather than gettarinfo(), which stores hard-linked audio as an empty link
+                        stat = path.stat()
+                        info = tarfile.TarInfo(f"{folder.name}/{path.name}")
+                        info.size, info.mtime, info.mode = stat.st_size, stat.st_mtime, stat.st_mode & 0o777
+                        with path.open("rb") as src:
+                            tar.addfile(info, src)
+                        # The member's data is what was just written, padded to a whole block
+                        padded_size = -(-info.size // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+                        members[info.name] = [tar.offset - padded_size, info.size, stat.st_mtime]
+            f.flush()
+            os.fsync(f.fileno())
+        # Originals are only deleted once the index pointing into the pack is safely on disk
+        self._save_index(month, members)
+        for folder in folders:
+            shutil.rmtree(folder)
+
+    def restore(self, folder_name: str) -> int:
+        """Unpack one recording folder back into the library; returns the number of files restored."""
+        month = self.pack_name(folder_name)
+        members = dict(self._load_index(month))
+        names = [name for name in members if name.split("/")[0] == folder_name]
+        if not names:
+            return 0
+        (self.save_dir / folder_name).mkdir(exist_ok=True)
+        for name in names:
+            dest = self.save_dir / name
+            dest.write_bytes(self.read(name))
+            mtime = members.pop(name)[2]
+            os.utime(dest, (mtime, mtime))
+        self._save_index(month, members)
+        return len(names)
+
+
+def _read_library_file(path: Path, archive: Optional[RecordingArchive] = None) -> Optional[bytes]:
+    """Read a file of the recordings library (`save_dir/folder/file`), from its pack if it was archived."""
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        archive = archive or RecordingArchive(path.parent.parent)
+        return archive.read(f"{path.parent.name}/{path.name}")
@@ -0,0 +1,550 @@
+"""Audio files, codecs and the signal processing used while recording and before decoding."""
+
+from __future__ import annotations
+
+import os
+import wave
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Optional, Union
+
+from hns.timings import TranscriptTimings
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+# Both backends expect 16 kHz mono float32 when given audio as a NumPy array
+MODEL_SAMPLE_RATE = 16000
+# Size of the header the wave module writes for PCM files; the sample data starts right after it
+WAV_HEADER_BYTES = 44
+
+
+# Storage codecs for saved recordings, mapped to their file extension
+AUDIO_FORMATS = {"wav": ".wav", "flac": ".flac", "opus": ".opus"}
+# Speech stays fully intelligible at this bitrate, about 180 KB per minute instead of 1.9 MB for 16 kHz WAV
+OPUS_BITRATE = 24000
+OPUS_SAMPLE_RATES = (8000, 12000, 16000, 24000, 48000)
+
+
+def _is_wav(audio_file_path: Union[Path, str]) -> bool:
+    return Path(audio_file_path).suffix.lower() == ".wav"
+
+
+def _encode_audio(wav_source: Path, dest: Path, audio_format: str, block_seconds: float = 1.0):
+    """Encode a 16-bit PCM WAV file to FLAC or Opus, streaming it block by block through PyAV.
+
+    The output is written to a temporary file and renamed into place once complete.
+    """
+    partial_path = dest.with_name(f".{dest.name}.{os.getpid()}.partial")
+    try:
+        _encode_audio_to(wav_source, partial_path, audio_format, block_seconds)
+        partial_path.replace(dest)
+    except BaseException:
+        partial_path.unlink(missing_ok=True)
+        raise
+
+
+def _encode_audio_to(wav_source: Path, dest: Path, audio_format: str, block_seconds: float):
+    import av
+    import numpy as np
+
+    with wave.open(str(wav_source), "rb") as src:
+        sample_rate, channels = src.getframerate(), src.getnchannels()
+        if src.getsampwidth() != 2:
+            raise ValueError(f"Unsupported WAV sample width: {8 * src.getsampwidth()}-bit")
+        layout = "mono" if channels == 1 else "stereo"
+
+        with av.open(str(dest), "w", format=audio_format) as container:
+            if audio_format == "flac":
+                stream = container.add_stream("flac", rate=sample_rate, layout=layout)
+            else:
+                rate = sample_rate if sample_rate in OPUS_SAMPLE_RATES else 48000
+                stream = container.add_stream("libopus", rate=rate, layout=layout)
+                stream.bit_rate = OPUS_BITRATE
+                stream.options = {"application": "voip"}
+            resampler = av.AudioResampler(format=stream.format.name, layout=layout, rate=stream.rate)
+
+            def encode(frame):
+                for resampled in resampler.resample(frame):
+                    container.mux(stream.encode(resampled))
+
+            block_frames = max(1, int(sample_rate * block_seconds))
+            while data := src.readframes(block_frames):
+                frame = av.AudioFrame.from_ndarray(
+                    np.frombuffer(data, dtype=np.int16).reshape(1, -1), format="s16", layout=layout
+                )
+                frame.sample_rate = sample_rate
+                encode(frame)
+            encode(None)
+            container.mux(stream.encode(None))
+
+
+def _iter_decoded_blocks(
+    audio_file_path: Union[Path, str], sample_rate: int = MODEL_SAMPLE_RATE
+) -> Iterator[np.ndarray]:
+    """Decode any audio file PyAV can read (FLAC, Opus, ...) into mono float32 blocks at sample_rate."""
+    import av
+
+    with av.open(str(audio_file_path)) as container:
+        stream = container.streams.audio[0]
+        resampler = av.AudioResampler(format="flt", layout="mono", rate=sample_rate)
+        for frame in container.decode(stream):
+            for resampled in resampler.resample(frame):
+                yield resampled.to_ndarray()[0]
+        for resampled in resampler.resample(None):
+            yield resampled.to_ndarray()[0]
+
+
+def _get_audio_file_duration(audio_file_path: Union[Path, str]) -> Optional[float]:
+    """Duration of a WAV or compressed audio file in seconds, or None if it cannot be read."""
+    try:
+        if _is_wav(audio_file_path):
+            with wave.open(str(audio_file_path), "rb") as f:
+                return f.getnframes() / float(f.getframerate())
+
+        import av
+
+        with av.open(str(audio_file_path)) as container:
+            stream = container.streams.audio[0]
+            if stream.duration is not None and stream.time_base is not None:
+                return float(stream.duration * stream.time_base)
+            if container.duration is not None:
+                return container.duration / av.time_base
+    except Exception:
+        pass
+    return None
+
+
+def _iter_wav_blocks(audio_file_path: Union[Path, str], block_seconds: float = 1.0) -> Iterator[np.ndarray]:
+    """Read a PCM WAV file as mono float32 blocks without loading the whole file."""
+    import numpy as np
+
+    with wave.open(str(audio_file_path), "rb") as f:
+        sample_width, channels = f.getsampwidth(), f.getnchannels()
+        if sample_width not in (1, 2, 4):
+            raise ValueError(f"Unsupported WAV sample width: {8 * sample_width}-bit")
+        dtype = {1: np.uint8, 2: np.int16, 4: np.int32}[sample_width]
+        scale = float(2 ** (8 * sample_width - 1))
+        offset = 1.0 if sample_width == 1 else 0.0  # 8-bit WAV is unsigned
+        block_frames = max(1, int(f.getframerate() * block_seconds))
+
+        while data := f.readframes(block_frames):
+            block = np.frombuffer(data, dtype=dtype).reshape(-1, channels).astype(np.float32) / scale - offset
+            yield block.mean(axis=1) if channels > 1 else block[:, 0]
+
+
+def _split_at_pauses(
+    blocks: Iterable[np.ndarray], sample_rate: int, max_chunk_seconds: float, search_seconds: float = 5.0
+) -> Iterator[np.ndarray]:
+    """Re-chunk a stream of mono blocks into pieces of at most max_chunk_seconds.
+
+    Each cut is placed at the quietest 30 ms frame within the last search_seconds of the window,
+    which lands in a pause between words for normal speech. No audio is dropped.
+    """
+    import numpy as np
+
+    max_length = int(max_chunk_seconds * sample_rate)
+    search_length = min(int(search_seconds * sample_rate), max_length)
+    frame_length = max(1, int(0.03 * sample_rate))
+    buffer = np.empty(0, dtype=np.float32)
+
+    for block in blocks:
+        buffer = np.concatenate((buffer, block))
+        while len(buffer) >= max_length:
+            search_start = max_length - search_length
+            frame_count = search_length // frame_length
+            window = buffer[search_start : search_start + frame_count * frame_length]
+            energy = np.mean(window.reshape(frame_count, frame_length) ** 2, axis=1)
+            cut = search_start + int(np.argmin(energy)) * frame_length + frame_length // 2
+            yield buffer[:cut]
+            buffer = buffer[cut:]
+
+    if len(buffer):
+        yield buffer
+
+
+class PackedSpeech:
+    """The speech regions of a recording packed back to back, with a map back to original time.
+
+    Speech is found in one vectorized pass over 30 ms frame energies, against a threshold that
+    follows the recording's noise floor but never exceeds SpeechSegmenter's. Regions are padded,
+    pauses shorter than MIN_SILENCE_SECONDS are kept, and longer ones are replaced by a short gap,
+    so the models only see (and spend compute on) audio that can contain words.
+    """
+
+    FRAME_SECONDS = 0.03
+    PAD_SECONDS = 0.2
+    MIN_SILENCE_SECONDS = 0.5
+    GAP_SECONDS = 0.1
+    NOISE_PERCENTILE = 10
+    NOISE_RATIO = 4.0
+    MIN_THRESHOLD = 0.002  # frame RMS, roughly -54 dBFS
+    # Packing is skipped when it would remove less than this fraction of the audio
+    MIN_SAVING = 0.1
+    # Finding less speech than this more likely means the threshold missed quiet speech over noise,
+    # so the backend gets the original audio and decides for itself
+    MIN_SPEECH_SECONDS = 0.5
+    # Longer files are left to the backends' own streaming readers instead of being loaded to pack them.
+    # Loading and packing holds about two copies in memory, so this bounds the peak at roughly 40 MB.
+    MAX_FILE_SECONDS = 300.0
+
+    def __init__(self, audio: np.ndarray, sample_rate: int = MODEL_SAMPLE_RATE):
+        import numpy as np
+
+        self.sample_rate = sample_rate
+        self.original_seconds = len(audio) / sample_rate
+        regions = self.detect(audio, sample_rate)
+        gap = np.zeros(int(self.GAP_SECONDS * sample_rate), dtype=np.float32)
+        pieces = []
+        for start, end in regions:
+            pieces.extend((audio[start:end], gap))
+        self.audio = np.concatenate(pieces[:-1]) if pieces else np.empty(0, dtype=np.float32)
+        lengths = regions[:, 1] - regions[:, 0] + len(gap)
+        # Region i starts at packed_starts[i] seconds in self.audio and original_starts[i] in the recording
+        self.packed_starts = np.concatenate(([0], np.cumsum(lengths)[:-1])) / sample_rate
+        self.original_starts = regions[:, 0] / sample_rate
+
+    @classmethod
+    def detect(cls, audio: np.ndarray, sample_rate: int = MODEL_SAMPLE_RATE) -> np.ndarray:
+        """Return the (start, end) sample ranges that contain speech, as an (n, 2) array."""
+        import numpy as np
+
+        frame_length = int(cls.FRAME_SECONDS * sample_rate)
+        if not len(audio):
+            return np.empty((0, 2), dtype=np.int64)
+        # Row-wise dot products of a reshaped view, so no full-length temporary is allocated
+        full_frames = len(audio) // frame_length
+        frames = audio[: full_frames * frame_length].reshape(full_frames, frame_length)
+        energy = np.einsum("ij,ij->i", frames, frames)
+        tail = audio[full_frames * frame_length :]
+        if len(tail):
+            energy = np.append(energy, np.dot(tail, tail))
+        rms = np.sqrt(energy / frame_length)
+        noise_floor = np.percentile(rms, cls.NOISE_PERCENTILE)
+        threshold = min(SpeechSegmenter.SPEECH_THRESHOLD, max(cls.MIN_THRESHOLD, noise_floor * cls.NOISE_RATIO))
+
+        # Pad every speech frame on both sides, then find where runs of speech begin and end
+        pad = int(cls.PAD_SECONDS / cls.FRAME_SECONDS)
+        speech = np.convolve(rms > threshold, np.ones(2 * pad + 1), mode="same") > 0
+        edges = np.diff(np.concatenate(([0], speech.astype(np.int8), [0])))
+        starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+        if not len(starts):
+            return np.empty((0, 2), dtype=np.int64)
+
+        # Merge regions separated by pauses too short to be worth removing
+        keep = starts[1:] - ends[:-1] >= int(cls.MIN_SILENCE_SECONDS / cls.FRAME_SECONDS)
+        starts, ends = starts[np.concatenate(([True], keep))], ends[np.concatenate((keep, [True]))]
+        return np.minimum(np.stack((starts, ends), axis=1) * frame_length, len(audio))
+
+    @classmethod
+    def read(cls, audio: Union[Path, str, np.ndarray]) -> Optional[np.ndarray]:
+        """Return audio as a 16 kHz float32 array, decoding files of up to MAX_FILE_SECONDS; None for longer ones."""
+        import numpy as np
+
+        if not isinstance(audio, (Path, str)):
+            return audio
+        duration = _get_audio_file_duration(audio)
+        if duration is None or duration > cls.MAX_FILE_SECONDS:
+            return None
+
+        # Decode straight into one buffer rather than collecting blocks and concatenating them
+        samples = np.empty(int((duration + 1) * MODEL_SAMPLE_RATE), dtype=np.float32)
+        filled = 0
+        for block in _iter_decoded_blocks(audio):
+            if filled + len(block) > len(samples):
+                # The container understated its length
+                samples = np.concatenate((samples[:filled], np.empty(len(samples) // 2 + len(block), np.float32)))
+            samples[filled : filled + len(block)] = block
+            filled += len(block)
+        return samples[:filled]
+
+    @property
+    def saving(self) -> float:
+        """Fraction of the original recording removed by packing."""
+        return 1 - len(self.audio) / max(1, round(self.original_seconds * self.sample_rate))
+
+    def to_original(self, seconds):
+        """Map a time (or array of times) in the packed audio back to the original recording."""
+        import numpy as np
+
+        region = np.maximum(np.searchsorted(self.packed_starts, seconds, side="right") - 1, 0)
+        return self.original_starts[region] + (seconds - self.packed_starts[region])
+
+    def copy_timings(self, source: TranscriptTimings, dest: TranscriptTimings):
+        """Add the timings recognized on the packed audio to dest, in original recording time."""
+        for rows, add in ((source.segments, dest.add_segment), (source.words, dest.add_word)):
+            for start, end, text in rows:
+                add(float(self.to_original(start)), float(self.to_original(end)), text)
+
+
+def _recognize_packed(
+    recognize: Callable[..., str],
+    audio: Union[Path, str, np.ndarray],
+    initial_prompt: Optional[str] = None,
+    timings: Optional[TranscriptTimings] = None,
+    **packed_options,
+) -> str:
+    """Run a backend's recognizer on the speech regions of audio only, with timings in original time.
+
+    packed_options are passed to recognize only along with packed audio, e.g. to skip the backend's own VAD.
+    """
+    samples = PackedSpeech.read(audio)
+    if samples is None:
+        return recognize(audio, initial_prompt=initial_prompt, timings=timings)
+    packed = PackedSpeech(samples)
+    if (
+        packed.saving < PackedSpeech.MIN_SAVING
+        or len(packed.audio) < PackedSpeech.MIN_SPEECH_SECONDS * packed.sample_rate
+    ):
+        # Hand over the samples already decoded rather than having the backend decode the file again
+        return recognize(samples, initial_prompt=initial_prompt, timings=timings)
+    del samples
+    packed_timings = TranscriptTimings() if timings is not None else None
+    text = recognize(packed.audio, initial_prompt=initial_prompt, timings=packed_timings, **packed_options)
+    if timings is not None:
+        packed.copy_timings(packed_timings, timings)
+    return text
+
+
+class AudioRingBuffer:
+    """Preallocated single-producer/single-consumer ring buffer of float32 audio frames.
+
+    The audio callback is the only writer and the recorder's writer thread the only reader. Each side
+    advances just its own monotonic index, so no lock is needed and the callback never allocates.
+    """
+
+    def __init__(self, capacity_frames: int, channels: int):
+        import numpy as np
+
+        self.capacity = capacity_frames
+        self._buffer = np.zeros((capacity_frames, channels), dtype=np.float32)
+        self._write_index = 0
+        self._read_index = 0
+        self.dropped_frames = 0
+
+    def write(self, data: np.ndarray) -> int:
+        """Copy frames in, dropping whatever does not fit. Returns the number of frames stored."""
+        frames = min(len(data), self.capacity - (self._write_index - self._read_index))
+        self.dropped_frames += len(data) - frames
+
+        start = self._write_index % self.capacity
+        first = min(frames, self.capacity - start)
+        self._buffer[start : start + first] = data[:first]
+        self._buffer[: frames - first] = data[first:frames]
+        # Publish only after the copy so the reader never sees a partially written block
+        self._write_index += frames
+        return frames
+
+    def read(self) -> np.ndarray:
+        """Return (as a new array) all frames written since the last read."""
+        import numpy as np
+
+        available = self._write_index - self._read_index
+        start = self._read_index % self.capacity
+        first = min(available, self.capacity - start)
+        data = np.concatenate((self._buffer[start : start + first], self._buffer[: available - first]))
+        self._read_index += available
+        return data
+
+
+class PolyphaseResampler:
+    """Streaming rational-rate resampler (e.g. 48 kHz or 44.1 kHz to 16 kHz) with a polyphase FIR filter.
+
+    Upsampling by L, low-pass filtering and downsampling by M is computed directly: each output
+    sample is the dot product of one of the L filter phases with the most recent input samples,
+    gathered for a whole block at once, so the cost is a fixed number of multiply-adds per output
+    sample. Filter history is carried between blocks, so blocks of any size can be fed.
+    """
+
+    # Zero crossings of the windowed sinc on each side, in units of the slower of the two rates
+    ZERO_CROSSINGS = 10
+    KAISER_BETA = 5.0
+
+    def __init__(self, input_rate: int, output_rate: int, channels: int = 1):
+        import math
+
+        import numpy as np
+
+        divisor = math.gcd(input_rate, output_rate)
+        self.up, self.down = output_rate // divisor, input_rate // divisor
+        half_length = self.ZERO_CROSSINGS * max(self.up, self.down)
+        self.taps_per_phase = -(-(2 * half_length + 1) // self.up)
+        n = np.arange(self.taps_per_phase * self.up) - half_length
+        cutoff = 0.5 / max(self.up, self.down)  # cycles per sample at the upsampled rate
+        window = np.kaiser(2 * half_length + 1, self.KAISER_BETA)
+        window = np.pad(window, (0, len(n) - len(window)))
+        taps = self.up * 2 * cutoff * np.sinc(2 * cutoff * n) * window
+        # Row p holds the taps applied to x[i], x[i-1], ... for outputs whose upsampled position is i*up + p
+        self._phases = taps.reshape(self.taps_per_phase, self.up).T.astype(np.float32)
+        self._history = np.zeros((self.taps_per_phase - 1, channels), dtype=np.float32)
+        self._position = 0  # upsampled position of the next output, relative to the next input block
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Resample a (frames, channels) float32 block, returning the output frames it completes."""
+        import numpy as np
+
+        x = np.concatenate((self._history, block))
+        count = max(0, -(-(len(block) * self.up - self._position) // self.down))
+        positions = self._position + np.arange(count) * self.down
+        newest = positions // self.up + len(self._history)
+        indices = newest[:, None] - np.arange(self.taps_per_phase)[None, :]
+        out = np.einsum("nkc,nk->nc", x[indices], self._phases[positions % self.up])
+        self._position += count * self.down - len(block) * self.up
+        self._history = x[len(x) - len(self._history) :]
+        return out.astype(np.float32, copy=False)
+
+
+class SpeechSegmenter:
+    """Split a live mono float32 stream into speech segments at pauses, using frame energy."""
+
+    FRAME_SECONDS = 0.03
+    SPEECH_THRESHOLD = 0.01  # frame RMS, roughly -40 dBFS
+    MIN_SILENCE_SECONDS = 0.6
+    MAX_SEGMENT_SECONDS = 28.0  # stays inside Whisper's 30 s window
+
+    def __init__(self, sample_rate: int = 16000):
+        import numpy as np
+
+        self.sample_rate = sample_rate
+        self.frame_length = int(sample_rate * self.FRAME_SECONDS)
+        self.min_silence_frames = int(self.MIN_SILENCE_SECONDS / self.FRAME_SECONDS)
+        self.max_segment_frames = int(self.MAX_SEGMENT_SECONDS / self.FRAME_SECONDS)
+        self._pending = np.empty(0, dtype=np.float32)
+        self._frames = []
+        self._has_speech = False
+        self._silent_frames = 0
+        # Sample positions in the stream, so every closed segment knows where it started
+        self._position = 0
+        self._start = 0
+        self.segment_starts = []  # seconds, one per segment returned by feed() or flush()
+
+    def _append_frame(self, frame: np.ndarray):
+        if not self._frames:
+            self._start = self._position
+        self._frames.append(frame)
+        self._position += len(frame)
+
+    def feed(self, samples: np.ndarray) -> list[np.ndarray]:
+        """Add samples and return the segments closed by them, oldest first."""
+        import numpy as np
+
+        samples = np.concatenate((self._pending, samples.astype(np.float32, copy=False)))
+        frame_count = len(samples) // self.frame_length
+        self._pending = samples[frame_count * self.frame_length :]
+        frames = samples[: frame_count * self.frame_length].reshape(frame_count, self.frame_length)
+        is_speech = np.sqrt(np.mean(frames**2, axis=1)) > self.SPEECH_THRESHOLD
+
+        closed = []
+        for frame, speech in zip(frames, is_speech):
+            self._append_frame(frame)
+            if speech:
+                self._has_speech = True
+                self._silent_frames = 0
+            else:
+                self._silent_frames += 1
+
+            if not self._has_speech:
+                # Only keep a short pre-roll of leading silence
+                if len(self._frames) > self.min_silence_frames:
+                    self._frames.pop(0)
+                    self._start += self.frame_length
+            elif self._silent_frames >= self.min_silence_frames or len(self._frames) >= self.max_segment_frames:
+                closed.append(self._close())
+        return closed
+
+    def flush(self) -> Optional[np.ndarray]:
+        """Return the unfinished tail segment, if it contains speech."""
+        if self._pending.size:
+            self._append_frame(self._pending)
+            self._pending = self._pending[:0]
+        return self._close() if self._has_speech else None
+
+    def _close(self) -> np.ndarray:
+        import numpy as np
+
+        segment = np.concatenate(self._frames)
+        self.segment_starts.append(self._start / self.sample_rate)
+        self._frames = []
+        self._has_speech = False
+        self._silent_frames = 0
+        return segment
+
+
+class VoiceActivityGate:
+    """Decide which captured audio to keep in hands-free (--vad-stop) mode, by frame energy.
+
+    Nothing is kept until speech starts, apart from a short pre-roll so the first syllable is not
+    clipped. Silence after speech is held back until speech resumes, and once it has lasted
+    `stop_seconds` the gate closes, keeping only a short tail of it.
+    """
+
+    FRAME_SECONDS = SpeechSegmenter.FRAME_SECONDS
+    SPEECH_THRESHOLD = SpeechSegmenter.SPEECH_THRESHOLD
+    DEFAULT_STOP_SECONDS = 2.0
+    ONSET_SECONDS = 0.09  # speech must last this long to start a recording, so a click does not count as onset
+    PRE_ROLL_SECONDS = 0.3
+    TAIL_SECONDS = 0.3
+
+    def __init__(self, sample_rate: int, stop_seconds: float = DEFAULT_STOP_SECONDS):
+        import collections
+
+        self.frame_length = int(sample_rate * self.FRAME_SECONDS)
+        self.onset_frames = max(1, round(self.ONSET_SECONDS / self.FRAME_SECONDS))
+        self.pre_roll_frames = round(self.PRE_ROLL_SECONDS / self.FRAME_SECONDS)
+        self.tail_frames = round(self.TAIL_SECONDS / self.FRAME_SECONDS)
+        self.stop_frames = max(1, round(stop_seconds / self.FRAME_SECONDS))
+        self.started = False
+        self.stopped = False
+        self._pending = None
+        # Before speech: the pre-roll plus the current run of speech frames. After: the current silence.
+        self._held = collections.deque(maxlen=self.pre_roll_frames + self.onset_frames)
+        self._speech_run = 0
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Take a (frames, channels) block of captured audio and return the part of it to keep."""
+        import numpy as np
+
+        if self._pending is not None:
+            block = np.concatenate((self._pending, block))
+        frame_count = len(block) // self.frame_length
+        self._pending = block[frame_count * self.frame_length :]
+        if self.stopped or not frame_count:
+            return block[:0]
+
+        frames = block[: frame_count * self.frame_length]
+        mono = frames.mean(axis=1) if frames.ndim > 1 else frames
+        rms = np.sqrt(np.mean(mono.reshape(frame_count, self.frame_length) ** 2, axis=1))
+
+        kept = []
+        for i, speech in enumerate(rms > self.SPEECH_THRESHOLD):
+            frame = frames[i * self.frame_length : (i + 1) * self.frame_length]
+            if not self.started:
+                self._held.append(frame)
+                self._speech_run = self._speech_run + 1 if speech else 0
+                if self._speech_run >= self.onset_frames:
+                    self.started = True
+                    kept.extend(self._held)
+                    self._held = []
+            elif speech:
+                kept.extend(self._held)
+                kept.append(frame)
+                self._held = []
+            else:
+                self._held.append(frame)
+                if len(self._held) >= self.stop_frames:
+                    self.stopped = True
+                    kept.extend(self._held[: self.tail_frames])
+                    self._held = []
+                    break
+        return np.concatenate(kept) if kept else block[:0]
+
+    def finish(self) -> Optional[np.ndarray]:
+        """Return the tail of silence to keep when the recording is stopped by hand, if any."""
+        import numpy as np
+
+        if not self.started or self.stopped or not self._held:
+            return None
+        self.stopped = True
+        tail = np.concatenate(self._held[: self.tail_frames])
+        self._held = []
+        return tail
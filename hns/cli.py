@@ -1,209 +1,136 @@
+from __future__ import annotations
+
 import json
 import os
+import queue
 import re
 import shutil
+import signal
+import socket
 import sys
 import threading
 import time
 import wave
+from concurrent.futures import Future
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Optional, Union
 
 import click
-import numpy as np
-import pyperclip
-import sounddevice as sd
-from rich.console import Console
-from rich.markup import escape
-
-if sys.version_info >= (3, 11):
-    import tomllib
-else:
-    import tomli as tomllib
-
-console = Console(stderr=True)
-stdout_console = Console()
-
-
-def format_duration(seconds: float) -> str:
-    """Format duration in seconds to HH:MM:SS or MM:SS format."""
-    total_seconds = int(seconds)
-    hours = total_seconds // 3600
-    minutes = (total_seconds % 3600) // 60
-    secs = total_seconds % 60
-
-    if hours > 0:
-        return f"{hours}:{minutes:02d}:{secs:02d}"
-    else:
-        return f"{minutes:02d}:{secs:02d}"
-
-
-def get_default_save_dir() -> Path:
-    if sys.platform == "win32":
-        return Path.home() / "AppData" / "Roaming" / "hns" / "Recordings"
-    elif sys.platform == "darwin":
-        return Path.home() / "Library" / "Application Support" / "hns" / "recordings"
-    else:
-        return Path.home() / ".local" / "share" / "hns" / "recordings"
-
-
-def load_config() -> dict:
-    config_path = Path.home() / ".config" / "hns" / "config.toml"
-    if not config_path.exists():
-        return {}
-    try:
-        with config_path.open("rb") as f:
-            return tomllib.load(f)
-    except Exception as e:
-        console.print(f"⚠️ [bold yellow]Could not parse config file {config_path}: {e}[/bold yellow]")
-        return {}
-
-
-def save_recording(
-    wav_source: Path,
-    text: str,
-    model_name: str,
-    language: Optional[str],
-    audio_duration: Optional[float],
-    transcription_time: Optional[float],
-    save_dir: Path,
-    recorded_at: datetime,
-) -> None:
-    words = re.sub(r"[^a-z0-9 ]", "", text.lower()).split()
-    slug = "_".join(words[:5]) if words else "no_speech"
-    folder_name = recorded_at.strftime("%Y_%m_%d") + f"_{slug}"
-    recording_dir = save_dir / folder_name
-    recording_dir.mkdir(parents=True, exist_ok=True)
-
-    wav_dest = recording_dir / f"{folder_name}.wav"
-    json_dest = recording_dir / f"{folder_name}.json"
-
-    try:
-        shutil.copy2(wav_source, wav_dest)
-    except Exception as e:
-        console.print(f"⚠️ [bold yellow]Failed to save WAV recording: {e}[/bold yellow]")
-
-    try:
-        metadata = {
-            "text": text,
-            "model": model_name,
-            "language": language,
-            "recorded_at": recorded_at.isoformat(),
-            "audio_duration_seconds": audio_duration,
-            "transcription_time_seconds": transcription_time,
-            "wav_file": f"{folder_name}.wav",
-        }
-        json_dest.write_text(json.dumps(metadata, indent=2))
-    except Exception as e:
-        console.print(f"⚠️ [bold yellow]Failed to save transcript JSON: {e}[/bold yellow]")
-
-
-class AudioRecorder:
-    def __init__(self, sample_rate: int = 16000, channels: int = 1):
-        self.sample_rate = sample_rate
-        self.channels = channels
-        self.audio_file_path = self._get_audio_file_path()
-        self.wave_file = None
-        self.recording_frames = 0
-
-    def _audio_callback(self, indata, frames, time, status):
-        if status:
-            console.print(f"⚠️ [bold yellow]Audio warning: {status}[/bold yellow]")
-        if self.wave_file:
-            audio_int16 = (indata * 32767).astype(np.int16)
-            self.wave_file.writeframes(audio_int16.tobytes())
-            self.recording_frames += frames
 
-    def record(self) -> Path:
-        self._validate_audio_device()
-        self._prepare_wave_file()
-
-        try:
-            stream = sd.InputStream(
-                samplerate=self.sample_rate, channels=self.channels, callback=self._audio_callback, dtype=np.float32
-            )
-        except Exception as e:
-            self._close_wave_file()
-            raise RuntimeError(f"Failed to initialize audio stream: {e}")
-
-        # Setup timer for live recording display
-        start_time = time.time()
-        recording_stopped = threading.Event()
-
-        try:
-            with stream:
-
-                def update_timer():
-                    """Update the display with elapsed time."""
-                    while not recording_stopped.is_set():
-                        elapsed = time.time() - start_time
-                        time_str = format_duration(elapsed)
-                        # Overwrite the same line
-                        console.print(
-                            f"🎤 [bold blue]Recording ...... {time_str} Press Enter to stop[/bold blue]", end="\r"
-                        )
-                        time.sleep(1)
-
-                # Start timer thread
-                timer_thread = threading.Thread(target=update_timer)
-                timer_thread.daemon = True
-                timer_thread.start()
-
-                # Wait for user input
-                input()
-
-                # Stop timer and wait for thread to finish
-                recording_stopped.set()
-                timer_thread.join(timeout=2)  # Wait up to 2 seconds for thread to finish
-
-                # Clear the recording line completely
-                console.print(" " * 50, end="\r")  # Clear line with spaces
-
-        except KeyboardInterrupt:
-            recording_stopped.set()
-            console.print("\n⏹️ [bold yellow]Recording cancelled[/bold yellow]")
-            self._close_wave_file()
-            sys.exit(0)
-        finally:
-            recording_stopped.set()
-            self._close_wave_file()
-
-        if self.recording_frames == 0:
-            raise ValueError("No audio recorded")
-
-        return self.audio_file_path
-
-    def _validate_audio_device(self):
-        try:
-            default_input = sd.query_devices(kind="input")
-            if default_input is None:
-                raise RuntimeError("No audio input device found")
-        except Exception as e:
-            raise RuntimeError(f"Failed to access audio devices: {e}")
-
-    def _get_audio_file_path(self) -> Path:
-        if sys.platform == "win32":
-            cache_dir = Path.home() / "AppData" / "Local" / "hns" / "Cache"
-        elif sys.platform == "darwin":
-            cache_dir = Path.home() / "Library" / "Caches" / "hns"
-        else:
-            cache_dir = Path.home() / ".cache" / "hns"
-
-        cache_dir.mkdir(parents=True, exist_ok=True)
-        return cache_dir / "last_recording.wav"
-
-    def _prepare_wave_file(self):
-        self.recording_frames = 0
-        self.wave_file = wave.open(str(self.audio_file_path), "wb")
-        self.wave_file.setnchannels(self.channels)
-        self.wave_file.setsampwidth(2)  # 16-bit audio
-        self.wave_file.setframerate(self.sample_rate)
-
-    def _close_wave_file(self):
-        if self.wave_file:
-            self.wave_file.close()
-            self.wave_file = None
+from hns.archive import RecordingArchive
+from hns.audio import (
+    AUDIO_FORMATS,
+    MODEL_SAMPLE_RATE,
+    WAV_HEADER_BYTES,
+    SpeechSegmenter,
+    VoiceActivityGate,
+    _get_audio_file_duration,
+    _is_wav,
+    _iter_decoded_blocks,
+    _iter_wav_blocks,
+    _recognize_packed,
+    _split_at_pauses,
+)
+from hns.config import get_audio_format, get_cache_dir, get_save_dir, load_config
+from hns.console import console, format_duration, stdout_console
+from hns.daemon import (
+    TranscriptionDaemon,
+    _daemon_serves,
+    _daemon_status,
+    _get_daemon_socket_path,
+    _transcribe_with_daemon,
+)
+from hns.export import EXPORT_FORMATS, _export_library
+from hns.files import _write_text_atomic
+from hns.recorder import AudioRecorder
+from hns.search import EmbeddingIndex, RecordingIndex, TranscriptEmbedder, _load_timings_sidecar
+from hns.storage import JobQueue, TranscriptCache, _process_exited
+from hns.timings import TranscriptTimings
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# numpy, sounddevice, pyperclip and rich are imported where they are used so that lightweight
+# commands like `hns --list-models` and `hns config --show` start fast (see tests/test_startup.py).
+
+
+# faster-whisper decoding settings, chosen with --profile or `profile` in config. "balanced" is how hns has always
+# decoded: beam search with faster-whisper's defaults for everything else.
+DEFAULT_VAD_PARAMETERS = {
+    "min_silence_duration_ms": 500,
+    "speech_pad_ms": 400,
+    "threshold": 0.5,
+    "max_speech_duration_s": 29.0,
+}
+DECODING_PROFILES = {
+    # Greedy decoding without temperature fallback: 2-3x faster, near-identical text on clean dictation
+    "fast": {
+        "beam_size": 1,
+        "best_of": 1,
+        "temperature": 0.0,
+        "condition_on_previous_text": False,
+        "vad_filter": True,
+        "vad_parameters": DEFAULT_VAD_PARAMETERS,
+    },
+    "balanced": {"beam_size": 5, "vad_filter": True, "vad_parameters": DEFAULT_VAD_PARAMETERS},
+    # Wider beam, and a more sensitive VAD with more padding, so quiet or clipped words are kept
+    "accurate": {
+        "beam_size": 8,
+        "best_of": 8,
+        "patience": 1.5,
+        "vad_filter": True,
+        "vad_parameters": {**DEFAULT_VAD_PARAMETERS, "threshold": 0.35, "speech_pad_ms": 600},
+    },
+}
+DEFAULT_DECODING_PROFILE = "balanced"
+PROFILE_KEYS = {
+    "beam_size",
+    "best_of",
+    "patience",
+    "temperature",
+    "condition_on_previous_text",
+    "compression_ratio_threshold",
+    "log_prob_threshold",
+    "no_speech_threshold",
+    "vad_filter",
+    "vad_parameters",
+}
+
+
+def _resolve_decoding_profile(cfg: dict, name: Optional[str]) -> tuple[str, dict]:
+    """Return the profile name and its faster-whisper options, from --profile, config, or the default.
+
+    Custom profiles are [profiles.NAME] tables in config.toml. They start from the built-in profile of the same
+    name, or the one named by their `base` key, or balanced; their vad_parameters are merged, not replaced.
+    """
+    name = name or os.environ.get("HNS_PROFILE") or cfg.get("profile") or DEFAULT_DECODING_PROFILE
+    custom = dict(cfg.get("profiles", {}).get(name, {}))
+    if name not in DECODING_PROFILES and not custom:
+        available = sorted({*DECODING_PROFILES, *cfg.get("profiles", {})})
+        raise ValueError(f"Unknown decoding profile '{name}' (choose from {', '.join(available)})")
+
+    base = custom.pop("base", name if name in DECODING_PROFILES else DEFAULT_DECODING_PROFILE)
+    if base not in DECODING_PROFILES:
+        raise ValueError(
+            f"Decoding profile '{name}' has unknown base '{base}' (choose from {', '.join(DECODING_PROFILES)})"
+        )
+    unknown = sorted(set(custom) - PROFILE_KEYS)
+    if unknown:
+        raise ValueError(
+            f"Unknown setting(s) {', '.join(unknown)} in decoding profile '{name}' "
+            f"(choose from {', '.join(sorted(PROFILE_KEYS))})"
+        )
+
+    if not custom.get("vad_filter", True):
+        # BatchedInferencePipeline cuts recordings into batches with the VAD, so it has nothing to decode without it
+        raise ValueError(
+            f"Decoding profile '{name}' sets vad_filter = false, which is not supported; tune vad_parameters instead"
+        )
+
+    options = {**DECODING_PROFILES[base], **custom}
+    options["vad_parameters"] = {**DECODING_PROFILES[base]["vad_parameters"], **custom.get("vad_parameters", {})}
+    return name, options
 
 
 class WhisperTranscriber:
@@ -228,23 +155,38 @@ class WhisperTranscriber:
         "large-v3-turbo",
         "turbo",
     ]
-
-    def __init__(self, model_name: Optional[str] = None, language: Optional[str] = None, device: Optional[str] = None):
+    # Recordings at least this long are decoded with BatchedInferencePipeline
+    DEFAULT_BATCH_THRESHOLD_SECONDS = 600.0
+    BATCH_SIZE = 8
+    # Word-level timestamps need an extra alignment pass, so they are opt-in (word_timestamps in config)
+    word_timestamps = False
+    # Options of the selected decoding profile; None means DEFAULT_DECODING_PROFILE
+    decoding_options = None
+
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        language: Optional[str] = None,
+        device: Optional[str] = None,
+        batch_threshold: Optional[float] = None,
+        word_timestamps: bool = False,
+        decoding_options: Optional[dict] = None,
+    ):
         self.model_name = self._get_model_name(model_name)
         self.language = language or os.environ.get("HNS_LANG")
+        self.batch_threshold = self._get_batch_threshold(batch_threshold)
+        self.word_timestamps = word_timestamps
+        self.decoding_options = decoding_options
+        self.timings = None
         self.device, self.compute_type = self._resolve_device(device)
         self.model = self._load_model()
+        self._batched_pipeline = None
 
-    def _get_audio_duration(self, audio_file_path: Union[Path, str]) -> Optional[float]:
-        """Get duration of audio file in seconds."""
-        try:
-            with wave.open(str(audio_file_path), "rb") as audio_file:
-                frames = audio_file.getnframes()
-                sample_rate = audio_file.getframerate()
-                duration = frames / float(sample_rate)
-                return duration
-        except Exception:
-            return None
+    def _get_audio_duration(self, audio_file_path: Union[Path, str, np.ndarray]) -> Optional[float]:
+        """Get duration of audio file (or in-memory 16 kHz samples) in seconds."""
+        if not isinstance(audio_file_path, (Path, str)):
+            return len(audio_file_path) / MODEL_SAMPLE_RATE
+        return _get_audio_file_duration(audio_file_path)
 
     def _get_model_name(self, model_name: Optional[str]) -> str:
         model = model_name or os.environ.get("HNS_WHISPER_MODEL", "base")
@@ -256,6 +198,20 @@ class WhisperTranscriber:
 
         return model
 
+    @classmethod
+    def _get_batch_threshold(cls, batch_threshold: Optional[float]) -> float:
+        value = batch_threshold if batch_threshold is not None else os.environ.get("HNS_BATCH_THRESHOLD")
+        if value is None:
+            return cls.DEFAULT_BATCH_THRESHOLD_SECONDS
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            console.print(
+                f"⚠️ [bold yellow]Invalid batch threshold '{value}', "
+                f"using {cls.DEFAULT_BATCH_THRESHOLD_SECONDS:g} seconds instead[/bold yellow]"
+            )
+            return cls.DEFAULT_BATCH_THRESHOLD_SECONDS
+
     def _resolve_device(self, device: Optional[str]) -> tuple[str, str]:
         import ctranslate2
 
@@ -278,21 +234,83 @@ class WhisperTranscriber:
         except Exception as e:
             raise RuntimeError(f"Failed to load model: {e}")
 
-    def transcribe(self, audio_source: Union[Path, str], show_progress: bool = True) -> str:
-        transcribe_kwargs = {
-            "beam_size": 5,
-            "vad_filter": True,
-            "vad_parameters": {
-                "min_silence_duration_ms": 500,
-                "speech_pad_ms": 400,
-                "threshold": 0.5,
-                "max_speech_duration_s": 29.0,
-            },
-        }
-
-        if self.language:
-            transcribe_kwargs["language"] = self.language
-
+    def _transcribe_kwargs(self) -> dict:
+        transcribe_kwargs = self.transcribe_options(self.language, self.decoding_options)
+        if self.word_timestamps:
+            transcribe_kwargs["word_timestamps"] = True
+        return transcribe_kwargs
+
+    @staticmethod
+    def transcribe_options(language: Optional[str], decoding_options: Optional[dict] = None) -> dict:
+        """Keyword arguments for faster_whisper's transcribe(); also part of the transcript cache key."""
+        options = decoding_options or DECODING_PROFILES[DEFAULT_DECODING_PROFILE]
+        transcribe_kwargs = {**options, "vad_parameters": dict(options["vad_parameters"])}
+
+        if language:
+            transcribe_kwargs["language"] = language
+
+        return transcribe_kwargs
+
+    def _get_batched_pipeline(self):
+        if self._batched_pipeline is None:
+            from faster_whisper import BatchedInferencePipeline
+
+            self._batched_pipeline = BatchedInferencePipeline(model=self.model)
+        return self._batched_pipeline
+
+    def _recognize(
+        self,
+        audio: Union[str, np.ndarray],
+        initial_prompt: Optional[str] = None,
+        timings: Optional[TranscriptTimings] = None,
+    ) -> str:
+        options = self.decoding_options or DECODING_PROFILES[DEFAULT_DECODING_PROFILE]
+        if options["vad_parameters"] != DEFAULT_VAD_PARAMETERS:
+            # Tuned VAD settings (such as accurate's lower threshold) only take effect if Silero sees all the audio
+            return self._recognize_audio(audio, initial_prompt, timings)
+        # Packed audio is already speech only, so Silero VAD would just detect it a second time
+        return _recognize_packed(self._recognize_audio, audio, initial_prompt, timings, vad_filter=False)
+
+    def _recognize_audio(
+        self,
+        audio: Union[str, np.ndarray],
+        initial_prompt: Optional[str] = None,
+        timings: Optional[TranscriptTimings] = None,
+        vad_filter: bool = True,
+    ) -> str:
+        """Run the model on a file path or a 16 kHz mono float32 array and return the joined text.
+
+        Segment (and, if enabled, word) timestamps are recorded into `timings` when given.
+        vad_filter=False skips the profile's VAD, except in the batched pipeline, which cuts its batches with it.
+        """
+        transcribe_kwargs = self._transcribe_kwargs()
+        if initial_prompt:
+            transcribe_kwargs["initial_prompt"] = initial_prompt
+
+        audio_duration = self._get_audio_duration(audio)
+        if audio_duration is not None and audio_duration >= self.batch_threshold:
+            # Long recordings: decode several VAD segments per forward pass to keep all cores busy
+            segments, _ = self._get_batched_pipeline().transcribe(
+                audio, batch_size=self.BATCH_SIZE, **transcribe_kwargs
+            )
+        else:
+            if not vad_filter:
+                transcribe_kwargs["vad_filter"] = False
+            segments, _ = self.model.transcribe(audio, **transcribe_kwargs)
+        transcription_parts = []
+        for segment in segments:
+            text = segment.text.strip()
+            if text:
+                transcription_parts.append(text)
+                if timings is not None:
+                    timings.add_segment(segment.start, segment.end, text)
+                    for word in segment.words or []:
+                        timings.add_word(word.start, word.end, word.word.strip())
+        return " ".join(transcription_parts)
+
+    def transcribe(self, audio_source: Union[Path, str, np.ndarray], show_progress: bool = True) -> str:
+        audio = str(audio_source) if isinstance(audio_source, (Path, str)) else audio_source
+        self.timings = TranscriptTimings()
         try:
             start_time = time.time()
 
@@ -306,13 +324,9 @@ class WhisperTranscriber:
                 def transcribe_worker():
                     """Worker function to perform transcription in background."""
                     try:
-                        segments, _ = self.model.transcribe(str(audio_source), **transcribe_kwargs)
-                        transcription_parts = []
-                        for segment in segments:
-                            text = segment.text.strip()
-                            if text:
-                                transcription_parts.append(text)
-                        progress_queue.put(("result", transcription_parts))
+                        text = self._recognize(audio, timings=self.timings)
+                        # Timed here rather than by the display loop, which only wakes once a second
+                        progress_queue.put(("result", (text, time.time() - start_time)))
                     except Exception as e:
                         progress_queue.put(("error", e))
                     finally:
@@ -328,7 +342,7 @@ class WhisperTranscriber:
                     elapsed = time.time() - start_time
                     time_str = format_duration(elapsed)
                     console.print(f"🔄 [bold blue]Transcribing ... {time_str}[/bold blue]", end="\r")
-                    time.sleep(1)
+                    transcription_complete.wait(1)
 
                 # Print a new line
                 console.print("")
@@ -336,20 +350,13 @@ class WhisperTranscriber:
                 result_type, result_data = progress_queue.get()
                 if result_type == "error":
                     raise result_data
-                transcription_parts = result_data
+                full_transcription, elapsed_total = result_data
             else:
-                segments, _ = self.model.transcribe(str(audio_source), **transcribe_kwargs)
-                transcription_parts = []
-                for segment in segments:
-                    text = segment.text.strip()
-                    if text:
-                        transcription_parts.append(text)
-
-            full_transcription = " ".join(transcription_parts)
+                full_transcription = self._recognize(audio, timings=self.timings)
+
             if not full_transcription:
                 raise ValueError("No speech detected in audio")
 
-            elapsed_total = time.time() - start_time
             return full_transcription, elapsed_total if show_progress else None
         except Exception as e:
             raise RuntimeError(f"Transcription failed: {e}")
@@ -375,12 +382,17 @@ class ParakeetTranscriber:
     DEFAULT_MODEL = "nemo-parakeet-tdt-0.6b-v3"
     # Models that support multiple languages (v3+); others are English-only
     MULTILINGUAL_MODELS = {"nemo-parakeet-tdt-0.6b-v3"}
+    # Longer audio is split at pauses into chunks of at most this length and recognized
+    # BATCH_SIZE chunks at a time, so memory use does not grow with recording length
+    MAX_CHUNK_SECONDS = 20.0
+    BATCH_SIZE = 8
 
     def __init__(self, model_name: Optional[str] = None, language: Optional[str] = None, device: Optional[str] = None):
         self.model_name = self._get_model_name(model_name)
         self.language = language or os.environ.get("HNS_LANG")
         self.device = self._resolve_device(device)
         self.model = self._load_model()
+        self.timings = None
 
     def _get_model_name(self, model_name: Optional[str]) -> str:
         model = model_name or os.environ.get("HNS_MODEL", self.DEFAULT_MODEL)
@@ -409,21 +421,112 @@ class ParakeetTranscriber:
     def _load_model(self):
         try:
             import onnx_asr
+
             providers = (
                 ["CUDAExecutionProvider", "CPUExecutionProvider"] if self.device == "cuda" else ["CPUExecutionProvider"]
             )
-            return onnx_asr.load_model(self.model_name, providers=providers)
+            # Token timestamps come from the same decoding pass, so they cost nothing extra
+            return onnx_asr.load_model(self.model_name, providers=providers).with_timestamps()
         except Exception as e:
             raise RuntimeError(f"Failed to load Parakeet model '{self.model_name}': {e}")
 
-    def _get_audio_duration(self, audio_file_path: Union[Path, str]) -> Optional[float]:
-        try:
-            with wave.open(str(audio_file_path), "rb") as f:
-                return f.getnframes() / float(f.getframerate())
-        except Exception:
-            return None
-
-    def transcribe(self, audio_source: Union[Path, str], show_progress: bool = True) -> tuple:
+    def _get_audio_duration(self, audio_file_path: Union[Path, str, np.ndarray]) -> Optional[float]:
+        if not isinstance(audio_file_path, (Path, str)):
+            return len(audio_file_path) / MODEL_SAMPLE_RATE
+        return _get_audio_file_duration(audio_file_path)
+
+    def _recognize(
+        self,
+        audio: Union[str, np.ndarray],
+        initial_prompt: Optional[str] = None,
+        timings: Optional[TranscriptTimings] = None,
+    ) -> str:
+        return _recognize_packed(self._recognize_audio, audio, initial_prompt, timings)
+
+    def _recognize_audio(
+        self,
+        audio: Union[str, np.ndarray],
+        initial_prompt: Optional[str] = None,
+        timings: Optional[TranscriptTimings] = None,
+    ) -> str:
+        """Run the model on a file path or a 16 kHz mono float32 array and return the text.
+
+        Parakeet has no prompting, so initial_prompt is accepted for interface parity and ignored.
+        Segment and word timestamps are recorded into `timings` when given.
+        """
+        audio_duration = self._get_audio_duration(audio)
+        if audio_duration is not None and audio_duration > self.MAX_CHUNK_SECONDS:
+            return self._recognize_chunked(audio, timings)
+
+        if isinstance(audio, (Path, str)) and not _is_wav(audio):
+            # onnx-asr only reads WAV files, so compressed recordings are decoded here
+            import numpy as np
+
+            audio = np.concatenate(list(_iter_decoded_blocks(audio)))
+
+        result = self.model.recognize(audio)
+        if isinstance(result, list):
+            result = " ".join(text for text in map(self._result_text, result) if text)
+        text = self._result_text(result).strip()
+        if timings is not None and text:
+            self._add_timings(timings, result, text, 0.0, audio_duration)
+        return text
+
+    @staticmethod
+    def _result_text(result) -> str:
+        # The model is loaded with timestamps, so results are TimestampedResult objects rather than strings
+        text = result if isinstance(result, str) else getattr(result, "text", "")
+        return text if isinstance(text, str) else ""
+
+    @staticmethod
+    def _add_timings(timings: TranscriptTimings, result, text: str, start: float, end: Optional[float]):
+        tokens, timestamps = getattr(result, "tokens", None), getattr(result, "timestamps", None)
+        if end is None:
+            end = start + (timestamps[-1] if timestamps else 0.0)
+        timings.add_segment(start, end, text)
+        if tokens and timestamps:
+            timings.add_tokens(tokens, [start + t for t in timestamps], end)
+
+    def _recognize_chunked(self, audio: Union[str, np.ndarray], timings: Optional[TranscriptTimings] = None) -> str:
+        if isinstance(audio, (Path, str)) and _is_wav(audio):
+            with wave.open(str(audio), "rb") as f:
+                sample_rate = f.getframerate()
+            blocks = _iter_wav_blocks(audio)
+        elif isinstance(audio, (Path, str)):
+            sample_rate = MODEL_SAMPLE_RATE
+            blocks = _iter_decoded_blocks(audio)
+        else:
+            sample_rate = MODEL_SAMPLE_RATE
+            blocks = (audio[i : i + sample_rate] for i in range(0, len(audio), sample_rate))
+
+        texts = []
+        batch = []
+        spans = []  # (start, end) of each chunk in the batch, in seconds
+        position = 0
+
+        def recognize_batch():
+            for result, (start, end) in zip(self.model.recognize(batch, sample_rate=sample_rate), spans):
+                text = self._result_text(result).strip()
+                if text:
+                    texts.append(text)
+                    if timings is not None:
+                        self._add_timings(timings, result, text, start, end)
+
+        for chunk in _split_at_pauses(blocks, sample_rate, self.MAX_CHUNK_SECONDS):
+            batch.append(chunk)
+            spans.append((position / sample_rate, (position + len(chunk)) / sample_rate))
+            position += len(chunk)
+            if len(batch) == self.BATCH_SIZE:
+                recognize_batch()
+                batch, spans = [], []
+        if batch:
+            recognize_batch()
+
+        return " ".join(texts)
+
+    def transcribe(self, audio_source: Union[Path, str, np.ndarray], show_progress: bool = True) -> tuple:
+        audio = str(audio_source) if isinstance(audio_source, (Path, str)) else audio_source
+        self.timings = TranscriptTimings()
         try:
             start_time = time.time()
 
@@ -435,8 +538,8 @@ class ParakeetTranscriber:
 
                 def worker():
                     try:
-                        result = self.model.recognize(str(audio_source))
-                        result_queue.put(("result", result))
+                        text = self._recognize(audio, timings=self.timings)
+                        result_queue.put(("result", (text, time.time() - start_time)))
                     except Exception as e:
                         result_queue.put(("error", e))
                     finally:
@@ -447,23 +550,20 @@ class ParakeetTranscriber:
                 while not done.is_set():
                     elapsed = time.time() - start_time
                     console.print(f"🔄 [bold blue]Transcribing ... {format_duration(elapsed)}[/bold blue]", end="\r")
-                    time.sleep(1)
+                    done.wait(1)
                 console.print("")
                 kind, data = result_queue.get()
                 if kind == "error":
                     raise data
-                text = data
+                text, elapsed = data
             else:
-                text = self.model.recognize(str(audio_source))
-
-            if isinstance(text, list):
-                text = " ".join(t for t in text if t)
-            text = text.strip() if isinstance(text, str) else ""
+                text = self._recognize(audio, timings=self.timings)
+                elapsed = time.time() - start_time
 
             if not text:
                 raise ValueError("No speech detected in audio")
 
-            return text, time.time() - start_time
+            return text, elapsed
         except Exception as e:
             raise RuntimeError(f"Transcription failed: {e}")
 
@@ -481,11 +581,628 @@ class ParakeetTranscriber:
         console.print("           [dim]pip install 'hns[parakeet]'[/dim]        (CPU)")
 
 
+class StreamingTranscription:
+    """Transcribe closed speech segments in the background while recording is still running.
+
+    When recording stops only the tail segment is left to decode, so the wait after Enter no
+    longer grows with the length of the dictation.
+    """
+
+    def __init__(self, transcriber, sample_rate: int = 16000):
+        # May be a Future while the model is still loading; segments queue up until it is ready
+        self.transcriber = transcriber
+        self.segmenter = SpeechSegmenter(sample_rate)
+        self.timings = TranscriptTimings()
+        self._blocks = queue.Queue()
+        self._parts = []
+        self._error = None
+        self._worker = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._worker.start()
+
+    def feed(self, samples: np.ndarray):
+        """Queue a captured block. Called from the recorder's writer thread, so it must not block."""
+        self._blocks.put(samples)
+
+    def _decode(self, segment: np.ndarray):
+        # Prompt with the previous segment so Whisper keeps context across segment boundaries
+        if isinstance(self.transcriber, Future):
+            self.transcriber = self.transcriber.result()
+        previous_text = self._parts[-1] if self._parts else None
+        self.timings.offset = self.segmenter.segment_starts.pop(0)
+        text = self.transcriber._recognize(segment, initial_prompt=previous_text, timings=self.timings)
+        if text:
+            self._parts.append(text)
+
+    def _run(self):
+        while (block := self._blocks.get()) is not None:
+            if self._error is not None:
+                continue
+            try:
+                for segment in self.segmenter.feed(block):
+                    self._decode(segment)
+            except Exception as e:
+                self._error = e
+
+        if self._error is None:
+            try:
+                tail = self.segmenter.flush()
+                if tail is not None:
+                    self._decode(tail)
+            except Exception as e:
+                self._error = e
+
+    def finish(self) -> tuple[str, float]:
+        """Stop feeding, decode whatever is left and return (text, seconds spent after recording stopped)."""
+        start_time = time.time()
+        self._blocks.put(None)
+        console.print("🔄 [bold blue]Transcribing final segment ...[/bold blue]", end="\r")
+        self._worker.join()
+        console.print("")
+
+        try:
+            if self._error is not None:
+                raise self._error
+            text = " ".join(self._parts)
+            if not text:
+                raise ValueError("No speech detected in audio")
+        except Exception as e:
+            raise RuntimeError(f"Transcription failed: {e}")
+        return text, time.time() - start_time
+
+
+class SessionTranscription:
+    """Transcribe the segment files of a long recording session in the background, one by one.
+
+    Each segment's text is appended to transcript.txt next to the segments as soon as it is decoded,
+    so a crash loses at most the segment being recorded, and stopping only waits for the last one.
+    """
+
+    TRANSCRIPT_NAME = "transcript.txt"
+    DEFAULT_SEGMENT_MINUTES = 5.0
+    # A session untouched this long is abandoned even if its pid has been reused by another process
+    ABANDONED_SECONDS = 3600
+
+    def __init__(self, transcriber):
+        # May be a Future while the model is still loading; segments queue up until it is ready
+        self.transcriber = transcriber
+        self.timings = TranscriptTimings()
+        self._segments = queue.Queue()
+        self._parts = []
+        self._error = None
+        self._worker = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._worker.start()
+
+    def add_segment(self, path: Path, start: float):
+        """Queue a closed segment file. Called from the recorder's writer thread, so it must not block."""
+        self._segments.put((path, start))
+
+    def _decode(self, path: Path, start: float):
+        if isinstance(self.transcriber, Future):
+            self.transcriber = self.transcriber.result()
+        previous_text = self._parts[-1] if self._parts else None
+        self.timings.offset = start
+        text = self.transcriber._recognize(str(path), initial_prompt=previous_text, timings=self.timings)
+        if text:
+            self._parts.append(text)
+            with (path.parent / self.TRANSCRIPT_NAME).open("a") as f:
+                f.write(f"{text}\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _run(self):
+        while (segment := self._segments.get()) is not None:
+            if self._error is not None:
+                continue
+            try:
+                self._decode(*segment)
+            except Exception as e:
+                self._error = e
+
+    @classmethod
+    def recover(cls, jobs: JobQueue, save_dir: Path, audio_format: str) -> int:
+        """Save sessions whose hns process died, with the text transcribed so far. Returns how many.
+
+        The segments are joined into one WAV and queued as a durable save job, like a finished session,
+        and the session directory is removed once the job holds the audio.
+        """
+        sessions_dir = get_cache_dir() / "sessions"
+        if not sessions_dir.exists():
+            return 0
+        recovered = 0
+        for session_dir in sorted(path for path in sessions_dir.iterdir() if path.is_dir()):
+            try:
+                pid = int((session_dir / AudioRecorder.SESSION_OWNER_NAME).read_text())
+                last_write = max(path.stat().st_mtime for path in session_dir.iterdir())
+            except (OSError, ValueError):
+                continue
+            if not _process_exited(pid) and time.time() - last_write < cls.ABANDONED_SECONDS:
+                continue
+            try:
+                joined_path, audio_duration = cls._join_segments(session_dir)
+                transcript_path = session_dir / cls.TRANSCRIPT_NAME
+                text = transcript_path.read_text().replace("\n", " ").strip() if transcript_path.exists() else ""
+                if audio_duration:
+                    recorded_at = datetime.fromtimestamp(session_dir.stat().st_mtime - audio_duration)
+                    job = {
+                        "text": text,
+                        "model": None,
+                        "language": None,
+                        "audio_duration": audio_duration,
+                        "transcription_time": None,
+                        "save_dir": str(save_dir),
+                        "recorded_at": recorded_at.isoformat(),
+                        "audio_format": audio_format,
+                        "extra_metadata": {"recovered_session": True},
+                    }
+                    jobs.submit_durable("save", job, joined_path)
+                    recovered += 1
+            except (OSError, wave.Error, EOFError) as e:
+                console.print(f"⚠️ [bold yellow]Could not recover session {session_dir.name}: {e}[/bold yellow]")
+                continue
+            shutil.rmtree(session_dir, ignore_errors=True)
+        return recovered
+
+    @staticmethod
+    def _join_segments(session_dir: Path) -> tuple[Path, float]:
+        """Join a session's segments into recovered.wav; returns its path and duration in seconds.
+
+        The segment being written when the process died has no final header, so every segment's PCM
+        data is read from the end of its (fixed-size) header up to the end of the file.
+        """
+        joined_path = session_dir / "recovered.wav"
+        # A segment opened just before the crash may not even have its header yet
+        segment_paths = [
+            path for path in sorted(session_dir.glob("segment_*.wav")) if path.stat().st_size > WAV_HEADER_BYTES
+        ]
+        if not segment_paths:
+            return joined_path, 0.0
+        with wave.open(str(segment_paths[0]), "rb") as segment:
+            params = segment.getparams()
+        frame_size = params.nchannels * params.sampwidth
+        frames = 0
+        with wave.open(str(joined_path), "wb") as joined:
+            joined.setnchannels(params.nchannels)
+            joined.setsampwidth(params.sampwidth)
+            joined.setframerate(params.framerate)
+            for path in segment_paths:
+                with path.open("rb") as f:
+                    f.seek(WAV_HEADER_BYTES)
+                    while data := f.read(AudioRecorder.JOIN_BLOCK_FRAMES * frame_size):
+                        data = data[: len(data) // frame_size * frame_size]
+                        joined.writeframes(data)
+                        frames += len(data) // frame_size
+        return joined_path, frames / params.framerate
+
+    def finish(self) -> tuple[str, float]:
+        """Wait for the queued segments and return (text, seconds spent after recording stopped)."""
+        start_time = time.time()
+        self._segments.put(None)
+        console.print("🔄 [bold blue]Transcribing final segment ...[/bold blue]", end="\r")
+        self._worker.join()
+        console.print("")
+
+        try:
+            if self._error is not None:
+                raise self._error
+            text = " ".join(self._parts)
+            if not text:
+                raise ValueError("No speech detected in audio")
+        except Exception as e:
+            raise RuntimeError(f"Transcription failed: {e}")
+        return text, time.time() - start_time
+
+
 def copy_to_clipboard(text: str):
+    import pyperclip
+
     pyperclip.copy(text)
     console.print("✅ [bold green]Copied to clipboard![/bold green]")
 
 
+def _release_stdout():
+    """Send EOF to a pipe reading our stdout (`hns | llm`) while background jobs are still running."""
+    try:
+        sys.stdout.flush()
+        if os.isatty(sys.stdout.fileno()):
+            return
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        os.close(devnull)
+    except (AttributeError, OSError, ValueError):
+        pass  # Not a real file descriptor (e.g. captured in tests), nothing to release
+
+
+class ModelSelector:
+    """Pick the most accurate model expected to transcribe a recording within a latency budget (`--model auto`).
+
+    Speeds start as estimates: a one-time matrix-multiply probe of this machine, relative to the
+    reference machine the COSTS tables were measured on. Every real transcription records the
+    model's measured speed, which then takes over from the estimate. Both live in model_benchmark.json.
+    """
+
+    FILENAME = "model_benchmark.json"
+    DEFAULT_LATENCY_SECONDS = 5.0
+    DEFAULT_AUDIO_SECONDS = 30.0  # assumed recording length when there is no previous recording
+    PROBE_SIZE = 512
+    PROBE_SECONDS = 0.3
+    REFERENCE_GFLOPS = 200.0  # probe result on the reference machine (an 8-core laptop CPU)
+    CUDA_SPEEDUP = 10.0
+    # Seconds of decoding per second of audio on the reference machine, least accurate model first
+    WHISPER_COSTS = {"tiny": 0.03, "base": 0.06, "small": 0.18, "large-v3-turbo": 0.4, "large-v3": 1.0}
+    WHISPER_ENGLISH_COSTS = {
+        "tiny.en": 0.03,
+        "base.en": 0.06,
+        "small.en": 0.18,
+        "distil-large-v3.5": 0.3,
+        "large-v3": 1.0,
+    }
+    PARAKEET_COSTS = {"nemo-parakeet-tdt-0.6b-v3": 0.025}
+    PARAKEET_ENGLISH_COSTS = {
+        "nemo-parakeet-ctc-0.6b": 0.02,
+        "nemo-parakeet-tdt-0.6b-v3": 0.025,
+        "nemo-parakeet-tdt-1.1b": 0.05,
+    }
+    # Weight of the newest measurement in a model's running speed
+    MEASUREMENT_WEIGHT = 0.5
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.path = (cache_dir or get_cache_dir()) / self.FILENAME
+        try:
+            self.data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            self.data = {}
+        if self.data.get("cpu_count") != os.cpu_count():
+            # New hardware (or first run): earlier numbers no longer describe this machine
+            self.data = {"cpu_count": os.cpu_count(), "gflops": self.probe(), "speeds": {}}
+            self._save()
+
+    @classmethod
+    def probe(cls) -> float:
+        """Measure sustained float32 matrix-multiply throughput in GFLOPS."""
+        import numpy as np
+
+        a = np.random.default_rng(0).standard_normal((cls.PROBE_SIZE, cls.PROBE_SIZE)).astype(np.float32)
+        a @ a  # warm up the BLAS threads
+        count, start = 0, time.perf_counter()
+        while (elapsed := time.perf_counter() - start) < cls.PROBE_SECONDS:
+            a @ a
+            count += 1
+        return 2 * cls.PROBE_SIZE**3 * count / elapsed / 1e9
+
+    def _save(self):
+        try:
+            _write_text_atomic(self.path, json.dumps(self.data, indent=2))
+        except OSError:
+            pass
+
+    @staticmethod
+    def _key(backend: str, model: str, device: str) -> str:
+        return f"{backend}/{model}/{device}"
+
+    @classmethod
+    def candidates(cls, backend: str, language: Optional[str]) -> dict:
+        if backend == "parakeet":
+            return cls.PARAKEET_ENGLISH_COSTS if language == "en" else cls.PARAKEET_COSTS
+        return cls.WHISPER_ENGLISH_COSTS if language == "en" else cls.WHISPER_COSTS
+
+    def seconds_per_audio_second(self, backend: str, model: str, device: str, cuda: bool = False) -> float:
+        measured = self.data["speeds"].get(self._key(backend, model, device))
+        if measured is not None:
+            return measured
+        speed = self.candidates(backend, "en").get(model) or self.candidates(backend, None)[model]
+        speed *= self.REFERENCE_GFLOPS / max(self.data["gflops"], 1e-3)
+        return speed / self.CUDA_SPEEDUP if cuda else speed
+
+    def select(
+        self,
+        backend: str,
+        language: Optional[str],
+        device: str,
+        audio_duration: float,
+        latency_seconds: float = DEFAULT_LATENCY_SECONDS,
+        cuda: bool = False,
+    ) -> str:
+        """Return the most accurate model expected to finish within latency_seconds, or the fastest one."""
+        models = list(self.candidates(backend, language))
+        for model in reversed(models):
+            if audio_duration * self.seconds_per_audio_second(backend, model, device, cuda) <= latency_seconds:
+                return model
+        return models[0]
+
+    def record(self, backend: str, model: str, device: str, audio_duration: float, transcription_time: float):
+        """Fold a real transcription's speed into the model's running figure."""
+        if not audio_duration or transcription_time is None:
+            return
+        key = self._key(backend, model, device)
+        measured = transcription_time / audio_duration
+        previous = self.data["speeds"].get(key, measured)
+        self.data["speeds"][key] = previous + self.MEASUREMENT_WEIGHT * (measured - previous)
+        self._save()
+
+
+def _cuda_available(backend: str, device: str) -> bool:
+    if device != "auto":
+        return device == "cuda"
+    try:
+        if backend == "parakeet":
+            import onnxruntime as ort
+
+            return "CUDAExecutionProvider" in ort.get_available_providers()
+        import ctranslate2
+
+        return "float16" in ctranslate2.get_supported_compute_types("cuda")
+    except Exception:
+        return False
+
+
+def _select_auto_model(
+    cfg: dict, backend: str, language: Optional[str], device: str, audio_duration: Optional[float] = None
+) -> tuple[ModelSelector, str]:
+    """Resolve `--model auto` for a recording of audio_duration seconds.
+
+    A live recording's length is not known before it starts, and a daemon serves recordings yet to
+    be made, so both go by the previous recording's length. That way `hns` and `hns serve` pick the same model.
+    """
+    if audio_duration is None:
+        previous_path = get_cache_dir() / "last_recording.wav"
+        previous_duration = _get_audio_file_duration(previous_path) if previous_path.exists() else None
+        audio_duration = previous_duration or ModelSelector.DEFAULT_AUDIO_SECONDS
+    selector = ModelSelector()
+    latency_seconds = float(cfg.get("auto_latency_seconds", ModelSelector.DEFAULT_LATENCY_SECONDS))
+    cuda = _cuda_available(backend, device)
+    return selector, selector.select(backend, language, device, audio_duration, latency_seconds, cuda)
+
+
+def _resolve_transcriber_settings(
+    cfg: dict, backend: Optional[str], model: Optional[str], language: Optional[str]
+) -> tuple[str, str, Optional[str]]:
+    """Resolve backend, model and language from CLI options, environment variables and config."""
+    resolved_backend = backend or os.environ.get("HNS_BACKEND") or cfg.get("backend") or "whisper"
+    resolved_language = language or os.environ.get("HNS_LANG") or cfg.get("language") or None
+
+    if resolved_backend == "parakeet":
+        valid_models = [*ParakeetTranscriber.VALID_MODELS, "auto"]
+        cfg_model = cfg.get("model") if cfg.get("model") in valid_models else None
+        resolved_model = model or os.environ.get("HNS_MODEL") or cfg_model or ParakeetTranscriber.DEFAULT_MODEL
+    else:
+        resolved_model = model or os.environ.get("HNS_WHISPER_MODEL") or cfg.get("model") or "base"
+
+    return resolved_backend, resolved_model, resolved_language
+
+
+def _select_decoding_profile(cfg: dict, backend: str, profile: Optional[str]) -> tuple[Optional[str], Optional[dict]]:
+    """Resolve the decoding profile for `backend`; Parakeet has no decoding settings to choose between."""
+    if backend == "whisper":
+        return _resolve_decoding_profile(cfg, profile)
+    if profile:
+        console.print("⚠️ [bold yellow]--profile only applies to the Whisper backend, ignoring it[/bold yellow]")
+    return None, None
+
+
+def _create_transcriber(
+    backend: str,
+    model: str,
+    language: Optional[str],
+    device: Optional[str],
+    decoding_options: Optional[dict] = None,
+):
+    if backend == "parakeet":
+        return ParakeetTranscriber(model_name=model, language=language, device=device)
+    cfg = load_config()
+    return WhisperTranscriber(
+        model_name=model,
+        language=language,
+        device=device,
+        batch_threshold=cfg.get("batch_threshold"),
+        word_timestamps=bool(cfg.get("word_timestamps", False)),
+        decoding_options=decoding_options,
+    )
+
+
+def _load_transcriber_in_background(
+    backend: str,
+    model: str,
+    language: Optional[str],
+    device: Optional[str],
+    decoding_options: Optional[dict] = None,
+) -> Future:
+    """Start loading the transcriber on a daemon thread so recording can begin right away.
+
+    A daemon thread (rather than an executor) keeps Ctrl+C during recording from waiting on the load.
+    """
+    future = Future()
+
+    def load():
+        try:
+            future.set_result(_create_transcriber(backend, model, language, device, decoding_options=decoding_options))
+        except Exception as e:
+            future.set_exception(e)
+
+    threading.Thread(target=load, daemon=True).start()
+    return future
+
+
+def _await_transcriber(transcriber_future: Future):
+    if not transcriber_future.done():
+        console.print("⏳ [bold blue]Waiting for the model to finish loading ...[/bold blue]", end="\r")
+    transcriber = transcriber_future.result()
+    console.print(" " * 50, end="\r")
+    return transcriber
+
+
+DEFAULT_DRAFT_MODEL = "base"
+
+
+def _draft_backend(model: str) -> str:
+    """Draft models are named like any other; Parakeet's names tell them apart from Whisper's."""
+    return "parakeet" if model in ParakeetTranscriber.VALID_MODELS else "whisper"
+
+
+class DraftTranscription:
+    """Transcribes with the small draft model while the main model decodes, and shows and copies the draft.
+
+    Once the main transcript is out, a draft that has not been shown yet is dropped, so a slow draft can
+    never replace the main transcript on the clipboard.
+    """
+
+    def __init__(self, transcriber_future: Future, model: str):
+        self.transcriber_future = transcriber_future
+        self.model = model
+        self._lock = threading.Lock()
+        self._superseded = False
+        self._result = Future()
+
+    def start(self, audio_source):
+        threading.Thread(target=self._run, args=(audio_source,), daemon=True).start()
+
+    def _run(self, audio_source):
+        from rich.markup import escape
+
+        try:
+            transcriber = self.transcriber_future.result()
+            start_time = time.time()
+            text, _ = transcriber.transcribe(audio_source, show_progress=False)
+            elapsed = time.time() - start_time
+        except Exception as e:
+            with self._lock:
+                if not self._superseded:
+                    console.print(f"⚠️ [bold yellow]Draft transcription failed: {escape(str(e))}[/bold yellow]")
+                self._result.set_result(None)
+            return
+        with self._lock:
+            if self._superseded:
+                self._result.set_result(None)
+                return
+            console.print(f"📝 [bold]Draft:[/bold] {escape(text)}")
+            try:
+                copy_to_clipboard(text)
+            except Exception as e:
+                console.print(f"⚠️ [bold yellow]Failed to copy draft to clipboard: {e}[/bold yellow]")
+            self._result.set_result({"text": text, "model": self.model, "transcription_time_seconds": elapsed})
+
+    def wait(self) -> Optional[dict]:
+        """Wait for the draft and return it for the metadata, or None if it failed."""
+        return self._result.result()
+
+    def supersede(self) -> Optional[dict]:
+        """Drop the draft unless it has already been shown; returns the shown draft, if any."""
+        with self._lock:
+            self._superseded = True
+            return self._result.result() if self._result.done() else None
+
+
+def _decoding_options(
+    backend: str, language: Optional[str], decoding_options: Optional[dict] = None, cfg: Optional[dict] = None
+) -> dict:
+    """Settings besides the audio and model that change the transcript, for the transcript cache key."""
+    if backend == "parakeet":
+        return {
+            "max_chunk_seconds": ParakeetTranscriber.MAX_CHUNK_SECONDS,
+            "batch_size": ParakeetTranscriber.BATCH_SIZE,
+        }
+    cfg = load_config() if cfg is None else cfg
+    return {
+        **WhisperTranscriber.transcribe_options(language, decoding_options),
+        # Batched decoding segments the audio differently, and word timestamps add to the cached timings
+        "batch_threshold": WhisperTranscriber._get_batch_threshold(cfg.get("batch_threshold")),
+        "word_timestamps": bool(cfg.get("word_timestamps", False)),
+    }
+
+
+AUDIO_EXTENSIONS = set(AUDIO_FORMATS.values())
+
+# Per-process state of `hns transcribe` workers, set up by _init_batch_worker. The model is
+# loaded on the first cache miss, so re-runs over unchanged files never load it at all.
+_batch_settings = None
+_batch_cache = None
+_batch_transcriber = None
+
+
+def _collect_audio_files(paths: tuple[Path, ...]) -> list[Path]:
+    """Expand files and directories (recursively) into a sorted, de-duplicated list of audio files."""
+    files = set()
+    for path in paths:
+        if path.is_dir():
+            files.update(p for p in path.rglob("*") if p.is_file() and p.suffix.lower() in AUDIO_EXTENSIONS)
+        else:
+            files.add(path)
+    return sorted(p.resolve() for p in files)
+
+
+def _default_batch_workers() -> int:
+    # CTranslate2 and onnxruntime already use ~4 threads per model on CPU
+    return max(1, (os.cpu_count() or 1) // 4)
+
+
+def _init_batch_worker(
+    backend: str,
+    model: str,
+    language: Optional[str],
+    device: Optional[str],
+    cache_mb: Optional[float] = None,
+    decoding_options: Optional[dict] = None,
+):
+    global _batch_settings, _batch_cache, _batch_transcriber
+    cache_options = _decoding_options(backend, language, decoding_options)
+    _batch_settings = (backend, model, language, device, decoding_options, cache_options)
+    _batch_cache = TranscriptCache(max_mb=cache_mb) if cache_mb != 0 else None
+    _batch_transcriber = None
+
+
+def _transcribe_batch_file(audio_file_path: Path) -> dict:
+    global _batch_transcriber
+    backend, model, language, device, profile_options, cache_options = _batch_settings
+    result = {"path": str(audio_file_path), "audio_duration_seconds": None}
+    start_time = time.time()
+
+    cache_key = None
+    if _batch_cache is not None:
+        try:
+            cache_key = TranscriptCache.make_key(audio_file_path, backend, model, language, cache_options)
+        except OSError as e:
+            result["error"] = str(e)
+            result["transcription_time_seconds"] = time.time() - start_time
+            return result
+
+        cached = _batch_cache.get(cache_key)
+        if cached is not None:
+            result.update(text=cached["text"], audio_duration_seconds=cached["audio_duration"], cached=True)
+            result["transcription_time_seconds"] = time.time() - start_time
+            return result
+
+    if _batch_transcriber is None:
+        # Deliberately not caught: a model that cannot load should stop the batch, not fail every file
+        _batch_transcriber = _create_transcriber(backend, model, language, device, decoding_options=profile_options)
+
+    try:
+        result["audio_duration_seconds"] = _batch_transcriber._get_audio_duration(audio_file_path)
+        result["text"], _ = _batch_transcriber.transcribe(audio_file_path, show_progress=False)
+        if cache_key is not None:
+            _batch_cache.put(cache_key, {"text": result["text"], "audio_duration": result["audio_duration_seconds"]})
+    except (RuntimeError, ValueError) as e:
+        result["error"] = str(e)
+    result["transcription_time_seconds"] = time.time() - start_time
+    return result
+
+
+def _run_batch(files: list[Path], settings: tuple, workers: int):
+    """Yield one result per file, in input order, from `workers` processes each holding its own model."""
+    if workers == 1:
+        # No point paying for process start-up and pickling with a single worker
+        _init_batch_worker(*settings)
+        yield from map(_transcribe_batch_file, files)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker, initargs=settings) as executor:
+        yield from executor.map(_transcribe_batch_file, files)
+
+
 @click.group(
     invoke_without_command=True,
     epilog="""
@@ -497,24 +1214,80 @@ Examples:
   hns --backend parakeet --model nemo-parakeet-tdt-1.1b  Use specific Parakeet model
   hns --language en                      Force English transcription
   hns --last                             Re-transcribe the last recorded audio
+  hns --stream                           Transcribe while you speak for a short wait after Enter
+  hns --vad-stop                         Hands-free: stop recording after 2s of silence
+  hns --session                          Long meeting: transcribe 5-minute segments while recording
+  hns --model large-v3 --draft           Copy a quick base-model draft, then the large-v3 result
+  hns --model auto                       Use the most accurate model that finishes in about 5s
+  hns --profile fast                     Greedy decoding, 2-3x faster on clean dictation
   hns --model medium --language fr       Transcribe in French (Whisper)
   hns --device cuda                      Force GPU transcription
   hns --device cpu                       Force CPU transcription
   hns --list-models                      List models for current backend
   hns --backend parakeet --list-models   List available Parakeet models
+  hns serve                              Keep the model loaded for faster hns runs
+  hns transcribe ~/audio --workers 4     Batch-transcribe files and folders to JSON lines
+  hns search standup notes               Search saved transcripts
+  hns export library.parquet             Export all transcripts for pandas or DuckDB
+  hns archive --older-than 90d           Pack old recordings into monthly tar files
+  hns ask "what did we decide on pricing"  Find passages by meaning (after hns index --embeddings)
   hns config --show                      Show current configuration
   hns config --model small               Set default model
   hns config --backend parakeet          Set Parakeet as default backend
   hns config --save-dir ~/notes          Set recordings save directory
+  hns config --audio-format opus         Save recordings as compact Opus files
 """,
 )
 @click.pass_context
 @click.option("--sample-rate", default=16000, help="Sample rate for audio recording")
 @click.option("--channels", default=1, help="Number of audio channels")
 @click.option("--list-models", is_flag=True, help="List available models for selected backend and exit")
-@click.option("--model", help="Model to use. Defaults depend on backend (see --list-models)")
+@click.option(
+    "--model",
+    help="Model to use, or 'auto' to pick the most accurate one this machine transcribes within "
+    "auto_latency_seconds. Defaults depend on backend (see --list-models)",
+)
 @click.option("--language", help="Force language detection (e.g., en, es, fr). Can also use HNS_LANG env var")
 @click.option("--last", is_flag=True, help="Transcribe the last recorded audio file")
+@click.option("--stream", is_flag=True, help="Transcribe finished phrases while still recording")
+@click.option(
+    "--vad-stop",
+    "vad_stop",
+    type=click.FloatRange(min=0),
+    is_flag=False,
+    flag_value=0.0,
+    default=None,
+    metavar="[SECONDS]",
+    help="Hands-free: start keeping audio when speech begins and stop after SECONDS of silence "
+    f"(default: vad_stop_seconds in config, or {VoiceActivityGate.DEFAULT_STOP_SECONDS:g})",
+)
+@click.option(
+    "--session",
+    "session_minutes",
+    type=click.FloatRange(min=0),
+    is_flag=False,
+    flag_value=0.0,
+    default=None,
+    metavar="[MINUTES]",
+    help="Long sessions: record into segments of about MINUTES, cut at pauses, and transcribe each one in the "
+    f"background (default: session_segment_minutes in config, or {SessionTranscription.DEFAULT_SEGMENT_MINUTES:g})",
+)
+@click.option(
+    "--draft",
+    "draft_model",
+    is_flag=False,
+    flag_value="",
+    default=None,
+    metavar="[MODEL]",
+    help="Copy a quick draft from a small model first, then replace it with the main model's transcript "
+    f"(default draft model: draft_model in config, or {DEFAULT_DRAFT_MODEL})",
+)
+@click.option("--no-cache", is_flag=True, help="Do not reuse a cached transcript of the same audio and settings")
+@click.option(
+    "--profile",
+    help="Whisper decoding profile: fast, balanced, accurate, or a [profiles.NAME] table from config.toml "
+    "(default: profile in config, or balanced)",
+)
 @click.option(
     "--device",
     type=click.Choice(["auto", "cpu", "cuda"]),
@@ -535,6 +1308,12 @@ def main(
     model: Optional[str],
     language: Optional[str],
     last: bool,
+    stream: bool,
+    vad_stop: Optional[float],
+    session_minutes: Optional[float],
+    draft_model: Optional[str],
+    no_cache: bool,
+    profile: Optional[str],
     device: str,
     backend: Optional[str],
 ):
@@ -544,7 +1323,7 @@ def main(
         return
 
     cfg = load_config()
-    resolved_backend = backend or os.environ.get("HNS_BACKEND") or cfg.get("backend") or "whisper"
+    resolved_backend, resolved_model, resolved_language = _resolve_transcriber_settings(cfg, backend, model, language)
 
     if list_models:
         if resolved_backend == "parakeet":
@@ -553,63 +1332,276 @@ def main(
             WhisperTranscriber.list_models()
         return
 
+    jobs = JobQueue()
     try:
-        resolved_language = language or os.environ.get("HNS_LANG") or cfg.get("language") or None
-        raw_save_dir = cfg.get("save_dir")
-        save_dir = Path(raw_save_dir).expanduser() if raw_save_dir else get_default_save_dir()
+        save_dir = get_save_dir(cfg)
+        # Finish persisting recordings from a run that was killed before its jobs completed
+        if jobs.recover():
+            console.print("🔄 [bold blue]Saving recordings left over from a previous run ...[/bold blue]")
+        recovered_sessions = SessionTranscription.recover(jobs, save_dir, get_audio_format(cfg))
+        if recovered_sessions:
+            console.print(
+                f"🔄 [bold blue]Saving {recovered_sessions} interrupted session(s) with the text "
+                "transcribed before they stopped ...[/bold blue]"
+            )
 
-        if resolved_backend == "parakeet":
-            cfg_model = cfg.get("model") if cfg.get("model") in ParakeetTranscriber.VALID_MODELS else None
-            resolved_model = model or os.environ.get("HNS_MODEL") or cfg_model or ParakeetTranscriber.DEFAULT_MODEL
-            transcriber = ParakeetTranscriber(model_name=resolved_model, language=resolved_language, device=device)
-        else:
-            resolved_model = model or os.environ.get("HNS_WHISPER_MODEL") or cfg.get("model") or "base"
-            transcriber = WhisperTranscriber(model_name=resolved_model, language=resolved_language, device=device)
+        if stream and sample_rate != 16000:
+            console.print(
+                "⚠️ [bold yellow]--stream requires --sample-rate 16000, transcribing after recording[/bold yellow]"
+            )
+            stream = False
+        if session_minutes is not None and last:
+            session_minutes = None
+        if session_minutes == 0:
+            session_minutes = float(cfg.get("session_segment_minutes", SessionTranscription.DEFAULT_SEGMENT_MINUTES))
+        if stream and session_minutes is not None:
+            console.print(
+                "⚠️ [bold yellow]--session already transcribes while recording, ignoring --stream[/bold yellow]"
+            )
+            stream = False
+        stream = stream and not last
+        decoding_profile, profile_options = _select_decoding_profile(cfg, resolved_backend, profile)
+
+        model_selector = None
+        if resolved_model == "auto":
+            # The model loads while recording, so it is chosen once, before the new recording's length is known
+            model_selector, resolved_model = _select_auto_model(cfg, resolved_backend, resolved_language, device)
+            daemon_status = _daemon_status()
+            if daemon_status and daemon_status.get("auto") and daemon_status.get("backend") == resolved_backend:
+                # A daemon started with auto already holds its choice, which beats loading another model
+                resolved_model = daemon_status["model"]
+
+        if draft_model == "":
+            draft_model = cfg.get("draft_model", DEFAULT_DRAFT_MODEL)
+        if draft_model and (stream or session_minutes is not None):
+            console.print("⚠️ [bold yellow]--draft has no effect while transcribing during recording[/bold yellow]")
+            draft_model = None
+        if draft_model == resolved_model:
+            console.print(
+                f"⚠️ [bold yellow]--draft model is the same as the main model ({draft_model}), "
+                "transcribing once[/bold yellow]"
+            )
+            draft_model = None
+        if vad_stop == 0:
+            vad_stop = float(cfg.get("vad_stop_seconds", VoiceActivityGate.DEFAULT_STOP_SECONDS))
 
-        recorded_at = datetime.now()
+        cache_mb = 0 if no_cache else cfg.get("transcript_cache_mb")
+        transcript_cache = TranscriptCache(max_mb=cache_mb) if cache_mb != 0 else None
+        decoding_options = _decoding_options(resolved_backend, resolved_language, profile_options, cfg)
+        cached = None
+        lookup_start = time.time()
 
         if last:
-            recorder = AudioRecorder(sample_rate, channels)
-            audio_file_path = recorder._get_audio_file_path()
+            audio_file_path = AudioRecorder(sample_rate, channels)._get_audio_file_path()
             if not audio_file_path.exists():
                 console.print(
                     "❌ [bold red]No previous recording found. Record audio first by running 'hns' without --last flag.[/bold red]"
                 )
                 sys.exit(1)
-        else:
-            recorder = AudioRecorder(sample_rate, channels)
-            audio_file_path = recorder.record()
+            # Checked before loading anything, so a repeated --last returns without touching the model
+            if transcript_cache is not None:
+                cache_key = transcript_cache.make_key(
+                    audio_file_path, resolved_backend, resolved_model, resolved_language, decoding_options
+                )
+                cached = transcript_cache.get(cache_key)
+
+        # A running `hns serve` daemon already has the model loaded, so skip loading it here.
+        # Streaming and sessions decode segments in-process during recording, so they always need a local model.
+        use_daemon = (
+            cached is None
+            and not stream
+            and session_minutes is None
+            and _daemon_serves(resolved_backend, resolved_model, decoding_profile)
+        )
+        # Load the model while the user is speaking instead of before recording starts
+        transcriber_future = None
+        if cached is None and not use_daemon:
+            transcriber_future = _load_transcriber_in_background(
+                resolved_backend, resolved_model, resolved_language, device, decoding_options=profile_options
+            )
 
-        audio_duration = transcriber._get_audio_duration(audio_file_path)
-        transcription, transcription_time = transcriber.transcribe(audio_file_path, show_progress=True)
+        # The draft model is small, so it loads alongside the main one (or the daemon) while recording.
+        # A Whisper draft always decodes greedily: it only has to arrive before the main transcript.
+        draft_future = None
+        if cached is None and draft_model:
+            draft_profile = "fast" if _draft_backend(draft_model) == "whisper" else None
+            draft_future = _load_transcriber_in_background(
+                _draft_backend(draft_model),
+                draft_model,
+                resolved_language,
+                device,
+                decoding_options=_resolve_decoding_profile(cfg, draft_profile)[1] if draft_profile else None,
+            )
 
-        try:
-            copy_to_clipboard(transcription)
-        except Exception as e:
-            console.print(f"⚠️ [bold yellow]Failed to copy to clipboard: {e}[/bold yellow]")
+        recorded_at = datetime.now()
+        audio_source = None
+
+        # With --last, audio_file_path was resolved before the cache lookup above
+        if stream:
+            streaming = StreamingTranscription(transcriber_future, sample_rate)
+            recorder = AudioRecorder(sample_rate, channels, on_audio=streaming.feed, vad_stop_seconds=vad_stop)
+            streaming.start()
+            audio_file_path = recorder.record()
+        elif session_minutes is not None:
+            session = SessionTranscription(transcriber_future)
+            recorder = AudioRecorder(
+                sample_rate,
+                channels,
+                vad_stop_seconds=vad_stop,
+                segment_seconds=session_minutes * 60,
+                on_segment=session.add_segment,
+            )
+            session.start()
+            audio_file_path = recorder.record()
+        elif not last:
+            recorder = AudioRecorder(sample_rate, channels, vad_stop_seconds=vad_stop)
+            audio_file_path = recorder.record()
+            # The models take 16 kHz arrays directly; other rates go through the WAV so they get resampled
+            if sample_rate == MODEL_SAMPLE_RATE:
+                audio_source = recorder.samples
+
+        if audio_source is None:
+            audio_source = audio_file_path
+
+        if model_selector is not None:
+            console.print(f"🧠 [dim]Auto-selected model: {resolved_model}[/dim]")
+
+        # The draft decodes alongside the main model rather than before it, so it never delays the main transcript
+        draft_transcription = None
+        if draft_future is not None:
+            draft_transcription = DraftTranscription(draft_future, draft_model)
+            draft_transcription.start(audio_source)
+        # Speeds are measured for the default profile only, so fast or accurate runs do not skew --model auto
+        record_speed = (
+            cached is None
+            and not stream
+            and session_minutes is None
+            and decoding_profile in (None, DEFAULT_DECODING_PROFILE)
+        )
 
         try:
-            save_recording(
-                audio_file_path,
-                transcription,
-                resolved_model,
-                resolved_language,
-                audio_duration,
-                transcription_time,
-                save_dir,
-                recorded_at,
+            daemon_result = None
+            if use_daemon:
+                daemon_result = _transcribe_with_daemon(
+                    audio_source, resolved_backend, resolved_model, resolved_language, decoding_profile
+                )
+
+            if cached is not None:
+                console.print("⚡ [bold green]Using cached transcript[/bold green]")
+                transcription = cached["text"]
+                audio_duration = cached.get("audio_duration")
+                timings = TranscriptTimings.from_dict(cached["timings"]) if cached.get("timings") else None
+                transcription_time = time.time() - lookup_start
+            elif stream:
+                transcription, transcription_time = streaming.finish()
+                audio_duration = streaming.transcriber._get_audio_duration(audio_file_path)
+                timings = streaming.timings
+            elif session_minutes is not None:
+                transcription, transcription_time = session.finish()
+                audio_duration = session.transcriber._get_audio_duration(audio_file_path)
+                timings = session.timings
+            elif daemon_result is not None:
+                transcription, transcription_time, audio_duration, timings = daemon_result
+            else:
+                if transcriber_future is None:
+                    transcriber = _create_transcriber(
+                        resolved_backend, resolved_model, resolved_language, device, decoding_options=profile_options
+                    )
+                else:
+                    transcriber = _await_transcriber(transcriber_future)
+                audio_duration = transcriber._get_audio_duration(audio_source)
+                transcription, transcription_time = transcriber.transcribe(audio_source, show_progress=True)
+                timings = transcriber.timings
+            draft = draft_transcription.supersede() if draft_transcription is not None else None
+        except RuntimeError as e:
+            draft = draft_transcription.wait() if draft_transcription is not None else None
+            if draft is None:
+                raise
+            from rich.markup import escape
+
+            # The draft is already on the clipboard; keep it rather than losing the recording's transcript
+            console.print(f"⚠️ [bold yellow]{escape(str(e))}, keeping the draft[/bold yellow]")
+            transcription, transcription_time, timings = draft["text"], draft["transcription_time_seconds"], None
+            audio_duration = _get_audio_file_duration(audio_file_path)
+            resolved_model = draft_model
+            decoding_profile = draft_profile
+            draft = None
+            record_speed = False
+            transcript_cache = None  # the text does not belong to the settings the cache key describes
+
+        # Emit the text before any clipboard or disk work so pipes like `hns | llm` start right away
+        stdout_console.print(transcription)
+        _release_stdout()
+
+        def copy_job():
+            try:
+                copy_to_clipboard(transcription)
+            except Exception as e:
+                console.print(f"⚠️ [bold yellow]Failed to copy to clipboard: {e}[/bold yellow]")
+
+        jobs.submit(copy_job)
+
+        # Measured speeds make later --model auto choices exact; start collecting once auto has been used
+        if record_speed and (model_selector is not None or (get_cache_dir() / ModelSelector.FILENAME).exists()):
+            jobs.submit(
+                lambda: ModelSelector().record(
+                    resolved_backend, resolved_model, device, audio_duration, transcription_time
+                )
             )
+        if draft is not None:
+            console.print(f"✅ [bold green]Replaced the draft with the {resolved_model} transcript[/bold green]")
+
+        extra_metadata = {}
+        if decoding_profile is not None:
+            extra_metadata["decoding_profile"] = decoding_profile
+        if draft is not None:
+            extra_metadata["draft"] = draft
+        try:
+            save_job = {
+                "text": transcription,
+                "model": resolved_model,
+                "language": resolved_language,
+                "audio_duration": audio_duration,
+                "transcription_time": transcription_time,
+                "save_dir": str(save_dir),
+                "recorded_at": recorded_at.isoformat(),
+                "audio_format": get_audio_format(cfg),
+                "timings": timings.to_dict() if timings is not None else None,
+                "extra_metadata": extra_metadata or None,
+            }
+            jobs.submit_durable("save", save_job, audio_file_path)
         except Exception as e:
             console.print(f"⚠️ [bold yellow]Failed to save recording: {e}[/bold yellow]")
+        if session_minutes is not None:
+            # The transcript is out and the joined audio is queued for saving, so the segments can go
+            shutil.rmtree(recorder.session_dir, ignore_errors=True)
 
-        stdout_console.print(transcription)
+        # Streamed and session transcripts are decoded piecewise, so they are not what the key's full decode gives
+        if cached is None and transcript_cache is not None and not stream and session_minutes is None:
+
+            def cache_job():
+                cache_key = transcript_cache.make_key(
+                    audio_file_path, resolved_backend, resolved_model, resolved_language, decoding_options
+                )
+                entry = {"text": transcription, "audio_duration": audio_duration}
+                if timings is not None:
+                    entry["timings"] = timings.to_dict()
+                transcript_cache.put(cache_key, entry)
+
+            jobs.submit(cache_job)
 
     except (RuntimeError, ValueError) as e:
+        from rich.markup import escape
+
         console.print(f"❌ [bold red]{escape(str(e))}[/bold red]")
         sys.exit(1)
     except Exception as e:
+        from rich.markup import escape
+
         console.print(f"❌ [bold red]Unexpected error: {escape(str(e))}[/bold red]")
         sys.exit(1)
+    finally:
+        jobs.flush()
 
 
 def _show_config():
@@ -617,6 +1609,7 @@ def _show_config():
     env_model = os.environ.get("HNS_WHISPER_MODEL") or os.environ.get("HNS_MODEL")
     env_lang = os.environ.get("HNS_LANG")
     env_backend = os.environ.get("HNS_BACKEND")
+    env_profile = os.environ.get("HNS_PROFILE")
 
     config_file = Path.home() / ".config" / "hns" / "config.toml"
     console.print("[bold cyan]Current Configuration[/bold cyan]")
@@ -640,17 +1633,31 @@ def _show_config():
     else:
         resolved_model = env_model or cfg.get("model") or default_model
     resolved_language = env_lang or cfg.get("language") or None
-    raw_save_dir = cfg.get("save_dir")
-    resolved_save_dir = Path(raw_save_dir).expanduser() if raw_save_dir else get_default_save_dir()
+    resolved_save_dir = get_save_dir(cfg)
 
     console.print("\n[bold cyan]Effective configuration:[/bold cyan]")
     console.print(f"  Backend: {resolved_backend}")
     console.print(f"  Model: {resolved_model}")
     console.print(f"  Language: {resolved_language or '(auto-detect)'}")
     console.print(f"  Save directory: {resolved_save_dir}")
+    console.print(f"  Audio format: {get_audio_format(cfg)}")
+    if resolved_backend == "whisper":
+        try:
+            console.print(f"  Decoding profile: {_resolve_decoding_profile(cfg, None)[0]}")
+        except ValueError as e:
+            from rich.markup import escape
+
+            console.print(f"  Decoding profile: [bold red]{escape(str(e))}[/bold red]")
 
     active_env = {
-        k: v for k, v in {"HNS_BACKEND": env_backend, "HNS_MODEL": env_model, "HNS_LANG": env_lang}.items() if v
+        k: v
+        for k, v in {
+            "HNS_BACKEND": env_backend,
+            "HNS_MODEL": env_model,
+            "HNS_LANG": env_lang,
+            "HNS_PROFILE": env_profile,
+        }.items()
+        if v
     }
     if active_env:
         console.print("\n[bold cyan]Active environment variables:[/bold cyan]")
@@ -662,7 +1669,34 @@ def _show_config():
         console.print(config_file.read_text())
 
 
-def _write_config(backend: Optional[str], model: Optional[str], language: Optional[str], save_dir: Optional[str]):
+def _toml_value(value) -> str:
+    if isinstance(value, bool):
+        return str(value).lower()
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, list):
+        return "[" + ", ".join(_toml_value(item) for item in value) + "]"
+    return json.dumps(str(value))
+
+
+def _toml_table_lines(table: dict, prefix: str) -> list[str]:
+    """Lines for [prefix] and its sub-tables, such as [profiles.meeting] and [profiles.meeting.vad_parameters]."""
+    lines = [f"[{prefix}]"]
+    lines += [f"{key} = {_toml_value(value)}" for key, value in table.items() if not isinstance(value, dict)]
+    for key, value in table.items():
+        if isinstance(value, dict):
+            lines += ["", *_toml_table_lines(value, f"{prefix}.{key}")]
+    return lines
+
+
+def _write_config(
+    backend: Optional[str],
+    model: Optional[str],
+    language: Optional[str],
+    save_dir: Optional[str],
+    audio_format: Optional[str] = None,
+    profile: Optional[str] = None,
+):
     config_file = Path.home() / ".config" / "hns" / "config.toml"
     config_file.parent.mkdir(parents=True, exist_ok=True)
 
@@ -675,6 +1709,10 @@ def _write_config(backend: Optional[str], model: Optional[str], language: Option
         cfg["language"] = language
     if save_dir is not None:
         cfg["save_dir"] = save_dir
+    if audio_format is not None:
+        cfg["audio_format"] = audio_format
+    if profile is not None:
+        cfg["profile"] = profile
 
     toml_lines = []
     if "backend" in cfg:
@@ -686,6 +1724,16 @@ def _write_config(backend: Optional[str], model: Optional[str], language: Option
         toml_lines.append(f"language = {lang_val}")
     if "save_dir" in cfg:
         toml_lines.append(f'save_dir = "{cfg["save_dir"]}"')
+    # Keep keys that can only be set by editing the file (e.g. batch_threshold and [profiles.NAME] tables).
+    # Tables go last, since every key after a [table] header belongs to that table.
+    for key, value in cfg.items():
+        if key in ("backend", "model", "language", "save_dir") or isinstance(value, dict):
+            continue
+        if isinstance(value, (bool, int, float, str, list)):
+            toml_lines.append(f"{key} = {_toml_value(value)}")
+    for key, value in cfg.items():
+        if isinstance(value, dict):
+            toml_lines += ["", *_toml_table_lines(value, key)]
 
     config_file.write_text("\n".join(toml_lines) + "\n" if toml_lines else "")
     console.print(f"✅ [bold green]Config saved to {config_file}[/bold green]")
@@ -697,15 +1745,484 @@ def _write_config(backend: Optional[str], model: Optional[str], language: Option
 @click.option("--model", help="Set the default model (depends on backend)")
 @click.option("--language", help="Set the default language code")
 @click.option("--save-dir", help="Set the directory for saving recordings")
+@click.option(
+    "--audio-format", type=click.Choice(list(AUDIO_FORMATS)), help="Set the storage format for saved recordings"
+)
+@click.option("--profile", help="Set the default Whisper decoding profile (fast, balanced, accurate, or a custom one)")
 @click.option("--show", is_flag=True, help="Show current configuration")
 def config_cmd(
-    backend: Optional[str], model: Optional[str], language: Optional[str], save_dir: Optional[str], show: bool
+    backend: Optional[str],
+    model: Optional[str],
+    language: Optional[str],
+    save_dir: Optional[str],
+    audio_format: Optional[str],
+    profile: Optional[str],
+    show: bool,
 ):
     """Manage hns configuration."""
-    if show or (not backend and not model and not language and not save_dir):
+    if show or (not backend and not model and not language and not save_dir and not audio_format and not profile):
         _show_config()
     else:
-        _write_config(backend, model, language, save_dir)
+        if profile is not None:
+            try:
+                _resolve_decoding_profile(load_config(), profile)
+            except ValueError as e:
+                from rich.markup import escape
+
+                console.print(f"❌ [bold red]{escape(str(e))}[/bold red]")
+                sys.exit(1)
+        _write_config(backend, model, language, save_dir, audio_format, profile)
+
+
+@main.command("serve")
+@click.option("--backend", type=click.Choice(["whisper", "parakeet"]), help="Transcription backend to keep loaded")
+@click.option("--model", help="Model to keep loaded. Defaults depend on backend (see --list-models)")
+@click.option("--language", help="Default language for requests that do not specify one")
+@click.option(
+    "--device",
+    type=click.Choice(["auto", "cpu", "cuda"]),
+    default="auto",
+    help="Device for transcription (default: auto-detect)",
+)
+@click.option(
+    "--profile",
+    help="Whisper decoding profile: fast, balanced, accurate, or a [profiles.NAME] table from config.toml "
+    "(default: profile in config, or balanced)",
+)
+def serve_cmd(
+    backend: Optional[str], model: Optional[str], language: Optional[str], device: str, profile: Optional[str]
+):
+    """Keep a transcription model loaded and serve hns over a local socket."""
+    if not hasattr(socket, "AF_UNIX"):
+        console.print("❌ [bold red]hns serve requires Unix domain socket support on this platform[/bold red]")
+        sys.exit(1)
+
+    cfg = load_config()
+    resolved_backend, resolved_model, resolved_language = _resolve_transcriber_settings(cfg, backend, model, language)
+
+    socket_path = _get_daemon_socket_path()
+    if _daemon_status() is not None:
+        console.print(f"❌ [bold red]hns serve is already running on {socket_path}[/bold red]")
+        sys.exit(1)
+    # Left behind by a daemon that did not shut down cleanly
+    socket_path.unlink(missing_ok=True)
+
+    auto = resolved_model == "auto"
+    try:
+        decoding_profile, profile_options = _select_decoding_profile(cfg, resolved_backend, profile)
+        if auto:
+            _, resolved_model = _select_auto_model(cfg, resolved_backend, resolved_language, device)
+        transcriber = _create_transcriber(
+            resolved_backend, resolved_model, resolved_language, device, decoding_options=profile_options
+        )
+    except (RuntimeError, ValueError) as e:
+        from rich.markup import escape
+
+        console.print(f"❌ [bold red]{escape(str(e))}[/bold red]")
+        sys.exit(1)
+
+    server = TranscriptionDaemon(socket_path, transcriber, resolved_backend, profile=decoding_profile, auto=auto)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    console.print(
+        f"🚀 [bold green]Serving {resolved_backend} model '{transcriber.model_name}' on {socket_path}[/bold green]"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        console.print("\n⏹️ [bold yellow]hns serve stopped[/bold yellow]")
+    finally:
+        server.server_close()
+        socket_path.unlink(missing_ok=True)
+
+
+@main.command("transcribe")
+@click.argument("paths", nargs=-1, required=True, type=click.Path(exists=True, path_type=Path))
+@click.option("--backend", type=click.Choice(["whisper", "parakeet"]), help="Transcription backend")
+@click.option("--model", help="Model to use. Defaults depend on backend (see --list-models)")
+@click.option("--language", help="Force language (e.g., en, es, fr). Can also use HNS_LANG env var")
+@click.option(
+    "--device",
+    type=click.Choice(["auto", "cpu", "cuda"]),
+    default="auto",
+    help="Device for transcription (default: auto-detect)",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=_default_batch_workers,
+    show_default="CPU count / 4",
+    help="Number of worker processes, each with its own loaded model",
+)
+@click.option("--no-cache", is_flag=True, help="Ignore cached transcripts and transcribe every file again")
+@click.option(
+    "--profile",
+    help="Whisper decoding profile: fast, balanced, accurate, or a [profiles.NAME] table from config.toml "
+    "(default: profile in config, or balanced)",
+)
+def transcribe_cmd(
+    paths: tuple[Path, ...],
+    backend: Optional[str],
+    model: Optional[str],
+    language: Optional[str],
+    device: str,
+    workers: int,
+    no_cache: bool,
+    profile: Optional[str],
+):
+    """Transcribe audio files and directories, writing one JSON line per file to stdout."""
+    files = _collect_audio_files(paths)
+    if not files:
+        console.print("❌ [bold red]No audio files found[/bold red]")
+        sys.exit(1)
+
+    cfg = load_config()
+    cache_mb = 0 if no_cache else cfg.get("transcript_cache_mb")
+    resolved_backend, resolved_model, resolved_language = _resolve_transcriber_settings(cfg, backend, model, language)
+    try:
+        _, profile_options = _select_decoding_profile(cfg, resolved_backend, profile)
+    except ValueError as e:
+        from rich.markup import escape
+
+        console.print(f"❌ [bold red]{escape(str(e))}[/bold red]")
+        sys.exit(1)
+    if resolved_model == "auto":
+        # Every worker keeps one model for the whole batch, so choose it for a typical file
+        durations = sorted(_get_audio_file_duration(path) or 0.0 for path in files[:: max(1, len(files) // 100)])
+        _, resolved_model = _select_auto_model(
+            cfg, resolved_backend, resolved_language, device, durations[len(durations) // 2]
+        )
+        console.print(f"🧠 [dim]Auto-selected model: {resolved_model}[/dim]")
+    settings = (resolved_backend, resolved_model, resolved_language, device, cache_mb, profile_options)
+    workers = min(workers, len(files))
+    console.print(f"🔄 [bold blue]Transcribing {len(files)} file(s) with {workers} worker(s) ...[/bold blue]")
+
+    start_time = time.time()
+    audio_seconds = 0.0
+    failures = 0
+    try:
+        for done, result in enumerate(_run_batch(files, settings, workers), start=1):
+            click.echo(json.dumps(result, ensure_ascii=False))
+            audio_seconds += result["audio_duration_seconds"] or 0.0
+            if "error" in result:
+                failures += 1
+                console.print(f"⚠️ [bold yellow]{result['path']}: {result['error']}[/bold yellow]")
+            console.print(f"🔄 [bold blue]Transcribed {done}/{len(files)} ...[/bold blue]", end="\r")
+    except KeyboardInterrupt:
+        console.print("\n⏹️ [bold yellow]Batch transcription cancelled[/bold yellow]")
+        sys.exit(130)
+    except Exception as e:
+        # A model that fails to load in a worker process surfaces here as a broken pool
+        from rich.markup import escape
+
+        console.print(f"\n❌ [bold red]Batch transcription failed: {escape(str(e))}[/bold red]")
+        sys.exit(1)
+
+    wall_seconds = time.time() - start_time
+    console.print(
+        f"✅ [bold green]Transcribed {format_duration(audio_seconds)} of audio in {format_duration(wall_seconds)}: "
+        f"{audio_seconds / max(wall_seconds, 1e-9):.1f} audio-hours per wall-clock hour[/bold green]"
+    )
+    if failures:
+        console.print(f"⚠️ [bold yellow]{failures} file(s) failed[/bold yellow]")
+        sys.exit(1)
+
+
+@main.command("export")
+@click.argument("output", type=click.Path(dir_okay=False, allow_dash=True, path_type=Path))
+@click.option(
+    "--format",
+    "export_format",
+    type=click.Choice(["parquet", "arrow", "jsonl"]),
+    help="Output format (default: from the file extension, JSON Lines for stdout)",
+)
+@click.option("--workers", type=click.IntRange(min=1), default=8, show_default=True, help="Threads reading metadata")
+def export_cmd(output: Path, export_format: Optional[str], workers: int):
+    """Export the metadata of every saved recording to one Parquet, Arrow or JSON Lines file.
+
+    Use - as OUTPUT to write to stdout.
+    """
+    from rich.markup import escape
+
+    to_stdout = str(output) == "-"
+    if export_format is None:
+        export_format = "jsonl" if to_stdout else EXPORT_FORMATS.get(output.suffix.lower())
+    if export_format is None:
+        console.print(
+            f"❌ [bold red]Cannot tell the format from '{escape(output.name)}'; pass --format parquet, arrow or jsonl"
+            "[/bold red]"
+        )
+        sys.exit(1)
+
+    save_dir = get_save_dir(load_config())
+    start_time = time.time()
+    partial_path = output.with_name(f"{output.name}.partial")
+    try:
+        if to_stdout:
+            rows = _export_library(save_dir, sys.stdout.buffer, export_format, workers)
+            sys.stdout.flush()
+        else:
+            # A half-written file never replaces an earlier export
+            with partial_path.open("wb") as f:
+                rows = _export_library(save_dir, f, export_format, workers)
+            partial_path.replace(output)
+    except (OSError, RuntimeError) as e:
+        if not to_stdout:
+            partial_path.unlink(missing_ok=True)
+        console.print(f"❌ [bold red]Export failed: {escape(str(e))}[/bold red]")
+        sys.exit(1)
+
+    destination = "stdout" if to_stdout else escape(str(output))
+    console.print(
+        f"✅ [bold green]Exported {rows} recording(s) to {destination} ({export_format}) "
+        f"in {time.time() - start_time:.2f}s[/bold green]"
+    )
+
+
+def _parse_age(ctx, param, value: str):
+    from datetime import timedelta
+
+    match = re.fullmatch(r"(\d+)\s*([dw]?)", value.strip().lower())
+    if not match:
+        raise click.BadParameter("use a number of days or weeks, e.g. 90d or 12w")
+    count = int(match.group(1))
+    return timedelta(weeks=count) if match.group(2) == "w" else timedelta(days=count)
+
+
+def _recording_folders_older_than(save_dir: Path, cutoff: datetime) -> list[Path]:
+    folders = []
+    for folder in save_dir.iterdir():
+        try:
+            # Folder names start with the recording date, so no JSON has to be read
+            recorded_on = datetime.strptime(folder.name[:10], "%Y_%m_%d")
+        except ValueError:
+            continue
+        if recorded_on < cutoff and folder.is_dir():
+            folders.append(folder)
+    return sorted(folders)
+
+
+@main.command("archive")
+@click.option(
+    "--older-than",
+    default="90d",
+    show_default=True,
+    callback=_parse_age,
+    help="Archive recordings older than this many days (90d) or weeks (12w)",
+)
+@click.option("--restore", multiple=True, metavar="FOLDER", help="Unpack an archived recording folder again")
+@click.option("--dry-run", is_flag=True, help="Show what would be archived without changing anything")
+def archive_cmd(older_than, restore: tuple[str, ...], dry_run: bool):
+    """Pack old recordings into one tar file per month, in the archive folder of the save directory.
+
+    Archived recordings stay searchable and exportable; single files are read from the packs by seeking.
+    """
+    from rich.markup import escape
+
+    save_dir = get_save_dir(load_config())
+    archive = RecordingArchive(save_dir)
+    if restore:
+        for folder_name in restore:
+            folder_name = Path(folder_name).name
+            restored = archive.restore(folder_name)
+            if not restored:
+                console.print(f"❌ [bold red]{escape(folder_name)} is not in the archive[/bold red]")
+                sys.exit(1)
+            console.print(
+                f"✅ [bold green]Restored {restored} file(s) to {escape(str(save_dir / folder_name))}[/bold green]"
+            )
+        return
+
+    if not save_dir.exists():
+        console.print(f"ℹ️ [bold cyan]Nothing to archive in {escape(str(save_dir))}[/bold cyan]")
+        return
+    folders = _recording_folders_older_than(save_dir, datetime.now() - older_than)
+    kept = [folder for folder in folders if not RecordingArchive.can_archive(folder)]
+    for folder in kept:
+        console.print(
+            f"⚠️ [bold yellow]Not archiving {escape(folder.name)}: it contains subfolders or links[/bold yellow]"
+        )
+    folders = [folder for folder in folders if folder not in kept]
+    months = sorted({RecordingArchive.pack_name(folder.name) for folder in folders})
+    if dry_run or not folders:
+        console.print(
+            f"ℹ️ [bold cyan]{len(folders)} recording(s) to archive into {len(months)} monthly pack(s)[/bold cyan]"
+        )
+        for month in months:
+            count = sum(RecordingArchive.pack_name(folder.name) == month for folder in folders)
+            console.print(f"  • [dim]{month}.tar: {count} recording(s)[/dim]")
+        return
+
+    start_time = time.time()
+    archive.add(folders)
+    console.print(
+        f"📦 [bold green]Archived {len(folders)} recording(s) into {len(months)} monthly pack(s) in "
+        f"{time.time() - start_time:.2f}s[/bold green]"
+    )
+
+
+def _open_recording_index(save_dir: Path) -> RecordingIndex:
+    """Open the library index, backfilling it from the JSON files until a full sync has run once."""
+    index = RecordingIndex(save_dir)
+    if not index.backfilled:
+        console.print(f"🔄 [bold blue]Building search index for {save_dir} ...[/bold blue]")
+        index.sync()
+    return index
+
+
+@main.command("index")
+@click.option(
+    "--embeddings", is_flag=True, help="Also embed transcripts for semantic search (pip install 'hns[semantic]')"
+)
+def index_cmd(embeddings: bool):
+    """Bring the search index up to date with the recordings folder."""
+    from rich.markup import escape
+
+    cfg = load_config()
+    save_dir = get_save_dir(cfg)
+    start_time = time.time()
+    with RecordingIndex(save_dir) as index:
+        indexed, removed = index.sync()
+        total = index.conn.execute("SELECT COUNT(*) FROM recordings").fetchone()[0]
+        console.print(
+            f"✅ [bold green]Indexed {indexed} and removed {removed} recording(s) in {time.time() - start_time:.2f}s "
+            f"({total} total)[/bold green]"
+        )
+
+        vectors = EmbeddingIndex(index)
+        if not embeddings and not vectors.model_name:
+            return
+        # Once enabled, the index keeps its model until `--embeddings` is run with a different one configured
+        model_name = (cfg.get("embedding_model") or TranscriptEmbedder.DEFAULT_MODEL) if embeddings else None
+        model_name = model_name or vectors.model_name
+        start_time = time.time()
+        console.print(f"🔄 [bold blue]Loading embedding model {model_name}...[/bold blue]")
+        try:
+            embedder = TranscriptEmbedder(model_name)
+        except RuntimeError as e:
+            console.print(f"❌ [bold red]{escape(str(e))}[/bold red]")
+            sys.exit(1)
+        if vectors.model_name != model_name:
+            vectors.reset(model_name)
+        embedded = vectors.embed_missing(embedder)
+        vectors.compact()
+        passages = index.conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+    console.print(
+        f"✅ [bold green]Embedded {embedded} recording(s) in {time.time() - start_time:.2f}s "
+        f"({passages} passages)[/bold green]"
+    )
+
+
+def _find_segment_start(json_path: Path, query: tuple[str, ...]) -> Optional[float]:
+    """Where the query was said in a recording, from its timings sidecar if it has one."""
+    timings = _load_timings_sidecar(json_path)
+    if timings is None:
+        return None
+    return timings.find(term.strip('"*()') for word in query for term in word.split())
+
+
+def _format_hit_header(hit: dict) -> str:
+    from rich.markup import escape
+
+    recorded_at = (hit["recorded_at"] or "")[:16].replace("T", " ")
+    at = (
+        f" [bold green]@ {format_duration(hit['segment_start'])}[/bold green]"
+        if hit["segment_start"] is not None
+        else ""
+    )
+    score = f" [dim]{hit['score']:.2f}[/dim]" if "score" in hit else ""
+    archived = "" if Path(hit["json_path"]).exists() else " [dim](archived)[/dim]"
+    return f"[bold cyan]{recorded_at}[/bold cyan]{at}{score} [dim]{escape(hit['json_path'])}[/dim]{archived}"
+
+
+def _semantic_search(query: str, limit: int, model: Optional[str], language: Optional[str], as_json: bool):
+    from rich.markup import escape
+
+    save_dir = get_save_dir(load_config())
+    with _open_recording_index(save_dir) as index:
+        vectors = EmbeddingIndex(index)
+        if not vectors.model_name:
+            console.print("❌ [bold red]Semantic search is not set up yet. Run: hns index --embeddings[/bold red]")
+            sys.exit(1)
+        try:
+            embedder = TranscriptEmbedder(vectors.model_name)
+            # Recordings saved since the last search are embedded now that the model is loaded
+            embedded = vectors.embed_missing(embedder)
+        except RuntimeError as e:
+            console.print(f"❌ [bold red]{escape(str(e))}[/bold red]")
+            sys.exit(1)
+        if embedded:
+            console.print(f"🧠 [dim]Embedded {embedded} new recording(s)[/dim]")
+        start_time = time.time()
+        hits = vectors.search(embedder.embed_query(query), limit=limit, model=model, language=language)
+        elapsed_ms = (time.time() - start_time) * 1000
+
+    for hit in hits:
+        if as_json:
+            click.echo(json.dumps(hit, ensure_ascii=False))
+            continue
+        stdout_console.print(_format_hit_header(hit))
+        stdout_console.print(f"  {escape(hit['text'])}\n")
+
+    console.print(f"🔍 [bold blue]{len(hits)} passage(s) in {elapsed_ms:.0f} ms[/bold blue]")
+    if not hits:
+        sys.exit(1)
+
+
+@main.command("search")
+@click.argument("query", nargs=-1, required=True)
+@click.option("--limit", default=10, show_default=True, help="Maximum number of results")
+@click.option("--model", help="Only show recordings transcribed with this model")
+@click.option("--language", help="Only show recordings in this language")
+@click.option("--semantic", is_flag=True, help="Match by meaning instead of words (needs hns index --embeddings)")
+@click.option("--json", "as_json", is_flag=True, help="Write one JSON line per result instead of snippets")
+def search_cmd(
+    query: tuple[str, ...], limit: int, model: Optional[str], language: Optional[str], semantic: bool, as_json: bool
+):
+    """Full-text search over saved transcripts, best matches first."""
+    from rich.markup import escape
+
+    if semantic:
+        _semantic_search(" ".join(query), limit, model, language, as_json)
+        return
+
+    save_dir = get_save_dir(load_config())
+    start_time = time.time()
+    try:
+        with _open_recording_index(save_dir) as index:
+            hits = index.search(" ".join(query), limit=limit, model=model, language=language)
+    except ValueError as e:
+        console.print(f"❌ [bold red]{escape(str(e))}[/bold red]")
+        sys.exit(1)
+    elapsed_ms = (time.time() - start_time) * 1000
+
+    for hit in hits:
+        snippet = hit.pop("snippet")
+        hit["segment_start"] = _find_segment_start(Path(hit["json_path"]), query)
+        if as_json:
+            click.echo(json.dumps(hit, ensure_ascii=False))
+            continue
+        highlighted = (
+            escape(snippet)
+            .replace(RecordingIndex.MATCH_START, "[bold yellow]")
+            .replace(RecordingIndex.MATCH_END, "[/bold yellow]")
+        )
+        stdout_console.print(_format_hit_header(hit))
+        stdout_console.print(f"  {highlighted}\n")
+
+    console.print(f"🔍 [bold blue]{len(hits)} result(s) in {elapsed_ms:.0f} ms[/bold blue]")
+    if not hits:
+        sys.exit(1)
+
+
+@main.command("ask")
+@click.argument("question", nargs=-1, required=True)
+@click.option("--limit", default=5, show_default=True, help="Number of passages to return")
+@click.option("--model", help="Only use recordings transcribed with this model")
+@click.option("--language", help="Only use recordings in this language")
+@click.option("--json", "as_json", is_flag=True, help="Write one JSON line per passage")
+def ask_cmd(question: tuple[str, ...], limit: int, model: Optional[str], language: Optional[str], as_json: bool):
+    """Find the passages of your saved transcripts that best answer a question."""
+    _semantic_search(" ".join(question), limit, model, language, as_json)
 
 
 if __name__ == "__main__":
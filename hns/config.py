@@ -0,0 +1,63 @@
+"""Locations and settings read from ~/.config/hns/config.toml."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+from hns.audio import AUDIO_FORMATS
+from hns.console import console
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
+
+
+def get_default_save_dir() -> Path:
+    if sys.platform == "win32":
+        return Path.home() / "AppData" / "Roaming" / "hns" / "Recordings"
+    elif sys.platform == "darwin":
+        return Path.home() / "Library" / "Application Support" / "hns" / "recordings"
+    else:
+        return Path.home() / ".local" / "share" / "hns" / "recordings"
+
+
+def get_cache_dir() -> Path:
+    if sys.platform == "win32":
+        cache_dir = Path.home() / "AppData" / "Local" / "hns" / "Cache"
+    elif sys.platform == "darwin":
+        cache_dir = Path.home() / "Library" / "Caches" / "hns"
+    else:
+        cache_dir = Path.home() / ".cache" / "hns"
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+def get_save_dir(cfg: dict) -> Path:
+    raw_save_dir = cfg.get("save_dir")
+    return Path(raw_save_dir).expanduser() if raw_save_dir else get_default_save_dir()
+
+
+def get_audio_format(cfg: dict) -> str:
+    audio_format = cfg.get("audio_format") or "wav"
+    if audio_format not in AUDIO_FORMATS:
+        console.print(
+            f"⚠️ [bold yellow]Invalid audio_format '{audio_format}', saving WAV instead "
+            f"(choose from {', '.join(AUDIO_FORMATS)})[/bold yellow]"
+        )
+        return "wav"
+    return audio_format
+
+
+def load_config() -> dict:
+    config_path = Path.home() / ".config" / "hns" / "config.toml"
+    if not config_path.exists():
+        return {}
+    try:
+        with config_path.open("rb") as f:
+            return tomllib.load(f)
+    except Exception as e:
+        console.print(f"⚠️ [bold yellow]Could not parse config file {config_path}: {e}[/bold yellow]")
+        return {}
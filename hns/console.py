@@ -0,0 +1,35 @@
+"""Console output shared by every hns command."""
+
+from __future__ import annotations
+
+
+class _LazyConsole:
+    """Stand-in for a rich Console that imports rich and creates the console on first use."""
+
+    def __init__(self, **kwargs):
+        self._kwargs = kwargs
+        self._console = None
+
+    def __getattr__(self, name):
+        if self._console is None:
+            from rich.console import Console
+
+            self._console = Console(**self._kwargs)
+        return getattr(self._console, name)
+
+
+console = _LazyConsole(stderr=True)
+stdout_console = _LazyConsole()
+
+
+def format_duration(seconds: float) -> str:
+    """Format duration in seconds to HH:MM:SS or MM:SS format."""
+    total_seconds = int(seconds)
+    hours = total_seconds // 3600
+    minutes = (total_seconds % 3600) // 60
+    secs = total_seconds % 60
+
+    if hours > 0:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    else:
+        return f"{minutes:02d}:{secs:02d}"
@@ -0,0 +1,170 @@
+"""`hns serve`: keeps a model loaded and transcribes for other hns processes over a Unix socket."""
+
+from __future__ import annotations
+
+import json
+import socket
+import socketserver
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Union
+
+from hns.config import get_cache_dir
+from hns.console import console, format_duration
+from hns.timings import TranscriptTimings
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+DAEMON_CONNECT_TIMEOUT = 1.0
+
+
+def _get_daemon_socket_path() -> Path:
+    return get_cache_dir() / "hns.sock"
+
+
+def _send_daemon_request(request: dict, timeout: Optional[float] = None, payload: bytes = b"") -> Optional[dict]:
+    """Send a single JSON request line, followed by an optional binary payload, to a running `hns serve` daemon.
+
+    Returns None when no daemon is reachable, so callers can fall back to in-process transcription.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+
+    socket_path = _get_daemon_socket_path()
+    if not socket_path.exists():
+        return None
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(DAEMON_CONNECT_TIMEOUT)
+            sock.connect(str(socket_path))
+            sock.settimeout(timeout)
+            sock.sendall((json.dumps(request) + "\n").encode())
+            if payload:
+                sock.sendall(payload)
+            with sock.makefile("rb") as reader:
+                line = reader.readline()
+    except OSError:
+        return None
+
+    if not line:
+        return None
+    return json.loads(line)
+
+
+def _daemon_status() -> Optional[dict]:
+    """The running daemon's backend, model and decoding profile, or None when no daemon is running."""
+    return _send_daemon_request({"command": "status"}, timeout=DAEMON_CONNECT_TIMEOUT)
+
+
+def _daemon_serves(backend: str, model: str, profile: Optional[str] = None) -> bool:
+    """Check whether a running daemon has the requested backend, model and decoding profile loaded."""
+    status = _daemon_status()
+    return (
+        status is not None
+        and status.get("backend") == backend
+        and status.get("model") == model
+        and status.get("profile") == profile
+    )
+
+
+def _transcribe_with_daemon(
+    audio_source: Union[Path, np.ndarray],
+    backend: str,
+    model: str,
+    language: Optional[str],
+    profile: Optional[str] = None,
+) -> Optional[tuple[str, float, Optional[float], Optional[TranscriptTimings]]]:
+    """Transcribe through the daemon, returning (text, transcription_time, audio_duration, timings).
+
+    In-memory samples are sent as raw float32 after the request line, so the daemon does not
+    have to decode the WAV again. Returns None if the daemon went away or no longer serves the
+    requested model.
+    """
+    request = {"command": "transcribe", "backend": backend, "model": model, "language": language}
+    if profile is not None:
+        request["profile"] = profile
+    payload = b""
+    if isinstance(audio_source, (Path, str)):
+        request["audio_path"] = str(audio_source)
+    else:
+        payload = audio_source.astype("<f4", copy=False).tobytes()
+        request["audio_frames"] = len(audio_source)
+
+    console.print("🔄 [bold blue]Transcribing with hns serve ...[/bold blue]", end="\r")
+    response = _send_daemon_request(request, payload=payload)
+    console.print("")
+
+    if response is None or response.get("mismatch"):
+        return None
+    if "error" in response:
+        raise RuntimeError(response["error"])
+    timings = TranscriptTimings.from_dict(response["timings"]) if response.get("timings") else None
+    return response["text"], response["transcription_time"], response.get("audio_duration"), timings
+
+
+class _DaemonRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+            samples = None
+            if "audio_frames" in request:
+                import numpy as np
+
+                frame_bytes = self.rfile.read(request["audio_frames"] * 4)
+                samples = np.frombuffer(frame_bytes, dtype="<f4").astype(np.float32)
+            response = self.server.dispatch(request, samples)
+        except Exception as e:
+            response = {"error": str(e)}
+        self.wfile.write((json.dumps(response) + "\n").encode())
+
+
+class TranscriptionDaemon(socketserver.UnixStreamServer):
+    """Unix socket server that keeps one transcriber resident and handles requests one at a time."""
+
+    def __init__(self, socket_path: Path, transcriber, backend: str, profile: Optional[str] = None, auto: bool = False):
+        self.transcriber = transcriber
+        self.backend = backend
+        self.profile = profile
+        # Whether the model was chosen by --model auto, so auto clients accept it
+        self.auto = auto
+        self.default_language = transcriber.language
+        super().__init__(str(socket_path), _DaemonRequestHandler)
+        socket_path.chmod(0o600)
+
+    def dispatch(self, request: dict, samples: Optional[np.ndarray] = None) -> dict:
+        command = request.get("command")
+        status = {"backend": self.backend, "model": self.transcriber.model_name}
+        if self.profile is not None:
+            status["profile"] = self.profile
+        if self.auto:
+            status["auto"] = True
+
+        if command == "status":
+            return status
+        if command != "transcribe":
+            return {"error": f"Unknown daemon command: {command}"}
+        requested = (request.get("backend"), request.get("model"), request.get("profile"))
+        if requested != (self.backend, self.transcriber.model_name, self.profile):
+            return {"mismatch": True, **status}
+
+        audio_source = samples if samples is not None else request["audio_path"]
+        self.transcriber.language = request.get("language") or self.default_language
+        audio_duration = self.transcriber._get_audio_duration(audio_source)
+
+        start_time = time.time()
+        try:
+            text, _ = self.transcriber.transcribe(audio_source, show_progress=False)
+        except (RuntimeError, ValueError) as e:
+            return {"error": str(e)}
+        transcription_time = time.time() - start_time
+
+        console.print(
+            f"📝 [dim]Transcribed {format_duration(audio_duration or 0)} of audio in {transcription_time:.2f}s[/dim]"
+        )
+        response = {"text": text, "transcription_time": transcription_time, "audio_duration": audio_duration}
+        if isinstance(self.transcriber.timings, TranscriptTimings):
+            response["timings"] = self.transcriber.timings.to_dict()
+        return response
@@ -0,0 +1,124 @@
+"""`hns export`: the library's metadata as JSON lines, Parquet or Arrow."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional
+
+from hns.archive import RecordingArchive, _read_library_file
+
+# Columns written by `hns export`; rtf (real-time factor) is transcription time divided by audio duration
+EXPORT_COLUMNS = [
+    "json_path",
+    "recorded_at",
+    "text",
+    "model",
+    "language",
+    "audio_duration_seconds",
+    "transcription_time_seconds",
+    "rtf",
+    "audio_file",
+]
+EXPORT_FORMATS = {".parquet": "parquet", ".arrow": "arrow", ".feather": "arrow", ".jsonl": "jsonl"}
+# Rows held in memory at once; also the Parquet row group size
+EXPORT_BATCH_ROWS = 16384
+
+
+def _read_export_row(relative_path: str, save_dir: Path, archive: RecordingArchive) -> Optional[dict]:
+    try:
+        metadata = json.loads(_read_library_file(save_dir / relative_path, archive) or b"null")
+    except (OSError, ValueError):
+        return None
+    if not isinstance(metadata, dict) or not isinstance(metadata.get("text"), str):
+        return None
+
+    def number(key: str) -> Optional[float]:
+        value = metadata.get(key)
+        return float(value) if isinstance(value, (int, float)) else None
+
+    try:
+        recorded_at = datetime.fromisoformat(metadata["recorded_at"])
+    except (KeyError, TypeError, ValueError):
+        recorded_at = None
+    audio_duration = number("audio_duration_seconds")
+    transcription_time = number("transcription_time_seconds")
+    return {
+        "json_path": relative_path,
+        "recorded_at": recorded_at,
+        "text": metadata["text"],
+        "model": metadata.get("model"),
+        "language": metadata.get("language"),
+        "audio_duration_seconds": audio_duration,
+        "transcription_time_seconds": transcription_time,
+        "rtf": transcription_time / audio_duration if transcription_time is not None and audio_duration else None,
+        "audio_file": metadata.get("audio_file") or metadata.get("wav_file"),
+    }
+
+
+def _iter_export_batches(save_dir: Path, workers: int, batch_rows: int = EXPORT_BATCH_ROWS) -> Iterator[list[dict]]:
+    """Yield the library's metadata in batches of at most batch_rows rows, oldest folder first.
+
+    Files are read by a thread pool, which overlaps the file system latency that dominates on
+    large libraries; only one batch of rows is held in memory at a time. Archived recordings are
+    read from their packs.
+    """
+    import itertools
+    from concurrent.futures import ThreadPoolExecutor
+
+    archive = RecordingArchive(save_dir)
+    relative_paths = {name for name, _ in archive.members() if name.endswith(".json")}
+    relative_paths.update(path.relative_to(save_dir).as_posix() for path in save_dir.glob("*/*.json"))
+    paths = iter(sorted(relative_paths))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while batch := list(itertools.islice(paths, batch_rows)):
+            rows = executor.map(_read_export_row, batch, itertools.repeat(save_dir), itertools.repeat(archive))
+            rows = [row for row in rows if row is not None]
+            if rows:
+                yield rows
+
+
+def _export_library(save_dir: Path, output, export_format: str, workers: int) -> int:
+    """Stream the library's metadata to a binary file object; returns the number of rows written."""
+    batches = _iter_export_batches(save_dir, workers)
+    rows_written = 0
+    if export_format == "jsonl":
+        for batch in batches:
+            lines = []
+            for row in batch:
+                row["recorded_at"] = row["recorded_at"].isoformat() if row["recorded_at"] else None
+                lines.append(json.dumps(row, ensure_ascii=False) + "\n")
+            output.write("".join(lines).encode())
+            rows_written += len(batch)
+        return rows_written
+
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise RuntimeError("Parquet and Arrow export need pyarrow. Install it with: pip install 'hns[export]'")
+
+    schema = pa.schema(
+        [
+            ("json_path", pa.string()),
+            ("recorded_at", pa.timestamp("us")),
+            ("text", pa.string()),
+            ("model", pa.string()),
+            ("language", pa.string()),
+            ("audio_duration_seconds", pa.float64()),
+            ("transcription_time_seconds", pa.float64()),
+            ("rtf", pa.float64()),
+            ("audio_file", pa.string()),
+        ]
+    )
+    if export_format == "parquet":
+        import pyarrow.parquet as pq
+
+        writer = pq.ParquetWriter(output, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_file(output, schema)
+    with writer:
+        for batch in batches:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            rows_written += len(batch)
+    return rows_written
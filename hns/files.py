@@ -0,0 +1,40 @@
+"""Small filesystem helpers used wherever hns writes files."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import threading
+from pathlib import Path
+
+
+def _write_text_atomic(path: Path, text: str):
+    """Write via a temporary file and rename, so readers never see a half-written file."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp_path.write_text(text)
+        tmp_path.replace(path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _link_or_copy(source: Path, dest: Path):
+    """Hard-link source to dest, copying only when they are on different filesystems (or links are unsupported)."""
+    try:
+        os.link(source, dest)
+    except OSError:
+        shutil.copy2(source, dest)
+
+
+def _create_unique_dir(parent: Path, name: str) -> Path:
+    """Create parent/name, or parent/name_2, parent/name_3, ... if it is already taken."""
+    parent.mkdir(parents=True, exist_ok=True)
+    suffix = 1
+    while True:
+        candidate = parent / (name if suffix == 1 else f"{name}_{suffix}")
+        try:
+            candidate.mkdir()
+            return candidate
+        except FileExistsError:
+            suffix += 1
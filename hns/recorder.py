@@ -0,0 +1,359 @@
+"""Microphone capture."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+import threading
+import time
+import wave
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Optional
+
+from hns.audio import AudioRingBuffer, PolyphaseResampler, SpeechSegmenter, VoiceActivityGate
+from hns.config import get_cache_dir
+from hns.console import console, format_duration
+from hns.files import _create_unique_dir
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class AudioRecorder:
+    RING_BUFFER_SECONDS = 10
+    WRITER_INTERVAL_SECONDS = 0.05
+    # With --vad-stop and nothing that could press Enter, give up if no speech starts within this long
+    NO_SPEECH_TIMEOUT_SECONDS = 120
+    # Session segments are cut at the first pause this long once they reach their target length,
+    # or unconditionally once they run this far past it
+    SEGMENT_PAUSE_SECONDS = 0.3
+    SEGMENT_MAX_OVERRUN_SECONDS = 30.0
+    JOIN_BLOCK_FRAMES = 1 << 20
+    # Written into each session directory, so a later run can tell a crashed session from a running one
+    SESSION_OWNER_NAME = "owner.pid"
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        channels: int = 1,
+        on_audio: Optional[Callable[[np.ndarray], None]] = None,
+        vad_stop_seconds: Optional[float] = None,
+        segment_seconds: Optional[float] = None,
+        on_segment: Optional[Callable[[Path, float], None]] = None,
+    ):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.on_audio = on_audio
+        # Hands-free mode: keep audio from the first speech and stop after this much silence
+        self.vad_stop_seconds = vad_stop_seconds
+        self.gate = None
+        self._gate_closed = threading.Event()
+        # Long sessions: capture into a series of segment files in session_dir instead of one WAV, and pass
+        # each closed segment with its start time (seconds) to on_segment. Nothing is kept in memory.
+        self.segment_seconds = segment_seconds
+        self.on_segment = on_segment
+        self.session_dir = None
+        self.segment_paths = []
+        self._segment_start = 0
+        self._quiet_frames = 0
+        self.audio_file_path = self._get_audio_file_path()
+        self.wave_file = None
+        self.recording_frames = 0
+        self.samples = None
+        self._captured_blocks = []
+        self.ring_buffer = None
+        # The device is opened at its native rate and resampled to sample_rate in the writer stage
+        self.capture_rate = sample_rate
+        self.resampler = None
+        self.input_overflows = 0
+        self._writer_thread = None
+        self._writer_stop = threading.Event()
+
+    def _audio_callback(self, indata, frames, time, status):
+        # Runs on PortAudio's real-time thread: no I/O, no allocation, just copy into the ring buffer
+        if status and status.input_overflow:
+            self.input_overflows += 1
+        if self.ring_buffer is not None:
+            self.ring_buffer.write(indata)
+
+    def _drain_ring_buffer(self):
+        block = self.ring_buffer.read()
+        if self.resampler is not None:
+            block = self.resampler.process(block)
+        if self.gate is not None:
+            block = self.gate.process(block)
+            if self.gate.stopped:
+                self._gate_closed.set()
+        self._write_block(block)
+
+    def _write_block(self, block: np.ndarray):
+        import numpy as np
+
+        if not len(block):
+            return
+        audio_int16 = (block * 32767).astype(np.int16)
+        self.wave_file.writeframes(audio_int16.tobytes())
+        self.recording_frames += len(block)
+
+        mono = block.mean(axis=1) if self.channels > 1 else block[:, 0]
+        if self.segment_seconds:
+            self._maybe_rotate_segment(mono)
+        else:
+            self._captured_blocks.append(mono)
+        if self.on_audio:
+            self.on_audio(mono)
+
+    def _maybe_rotate_segment(self, mono: np.ndarray):
+        import numpy as np
+
+        if np.sqrt(np.mean(mono**2)) < SpeechSegmenter.SPEECH_THRESHOLD:
+            self._quiet_frames += len(mono)
+        else:
+            self._quiet_frames = 0
+        length = (self.recording_frames - self._segment_start) / self.sample_rate
+        if length >= self.segment_seconds and (
+            self._quiet_frames >= self.SEGMENT_PAUSE_SECONDS * self.sample_rate
+            or length >= self.segment_seconds + self.SEGMENT_MAX_OVERRUN_SECONDS
+        ):
+            self.wave_file.close()
+            self._hand_off_segment()
+            self._open_segment()
+
+    def _open_segment(self):
+        self._segment_start = self.recording_frames
+        self._quiet_frames = 0
+        self.segment_paths.append(self.session_dir / f"segment_{len(self.segment_paths) + 1:04d}.wav")
+        self.wave_file = self._open_wave(self.segment_paths[-1])
+
+    def _hand_off_segment(self):
+        if self.on_segment:
+            self.on_segment(self.segment_paths[-1], self._segment_start / self.sample_rate)
+
+    def _writer_loop(self):
+        while not self._writer_stop.wait(self.WRITER_INTERVAL_SECONDS):
+            self._drain_ring_buffer()
+        self._drain_ring_buffer()
+        if self.gate is not None:
+            tail = self.gate.finish()
+            if tail is not None:
+                self._write_block(tail)
+
+    def _start_writer(self):
+        self._writer_stop.clear()
+        self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer_thread.start()
+
+    def _stop_writer(self):
+        if self._writer_thread is not None:
+            self._writer_stop.set()
+            self._writer_thread.join()
+            self._writer_thread = None
+
+    def _report_xruns(self):
+        dropped_frames = self.ring_buffer.dropped_frames if self.ring_buffer is not None else 0
+        if self.input_overflows or dropped_frames:
+            console.print(
+                f"⚠️ [bold yellow]Audio input overflowed {self.input_overflows} time(s), "
+                f"{dropped_frames} frame(s) dropped[/bold yellow]"
+            )
+
+    def record(self) -> Path:
+        import numpy as np
+        import sounddevice as sd
+
+        device = self._validate_audio_device()
+        native_rate = int(device.get("default_samplerate") or self.sample_rate)
+
+        # Forcing 16 kHz onto the device makes ALSA/PulseAudio resample (slowly or badly) or fail outright, so
+        # capture at the native rate and resample here; fall back to the requested rate if the device refuses
+        for capture_rate in dict.fromkeys((native_rate, self.sample_rate)):
+            self._prepare_capture(capture_rate)
+            try:
+                stream = sd.InputStream(
+                    samplerate=capture_rate, channels=self.channels, callback=self._audio_callback, dtype=np.float32
+                )
+                break
+            except Exception as e:
+                self._close_wave_file(keep=False)
+                error = e
+        else:
+            raise RuntimeError(f"Failed to initialize audio stream: {error}")
+
+        self._start_writer()
+
+        # Setup timer for live recording display
+        start_time = time.time()
+        recording_stopped = threading.Event()
+
+        try:
+            with stream:
+
+                def update_timer():
+                    """Update the display with elapsed time."""
+                    nonlocal start_time
+                    while not recording_stopped.is_set():
+                        if self.gate is not None and not self.gate.started:
+                            console.print("🎤 [bold blue]Listening ...... start speaking[/bold blue]", end="\r")
+                            start_time = time.time()
+                        else:
+                            elapsed = time.time() - start_time
+                            time_str = format_duration(elapsed)
+                            hint = (
+                                f"Stops after {self.vad_stop_seconds:g}s of silence"
+                                if self.gate is not None
+                                else "Press Enter to stop"
+                            )
+                            # Overwrite the same line
+                            console.print(f"🎤 [bold blue]Recording ...... {time_str} {hint}[/bold blue]", end="\r")
+                        time.sleep(0.2 if self.gate is not None else 1)
+
+                # Start timer thread
+                timer_thread = threading.Thread(target=update_timer)
+                timer_thread.daemon = True
+                timer_thread.start()
+
+                if self.gate is None:
+                    # Wait for user input
+                    input()
+                else:
+                    self._wait_for_gate()
+
+                # Stop timer and wait for thread to finish
+                recording_stopped.set()
+                timer_thread.join(timeout=2)  # Wait up to 2 seconds for thread to finish
+
+                # Clear the recording line completely
+                console.print(" " * 50, end="\r")  # Clear line with spaces
+
+        except KeyboardInterrupt:
+            recording_stopped.set()
+            console.print("\n⏹️ [bold yellow]Recording cancelled[/bold yellow]")
+            self._stop_writer()
+            self._close_wave_file(keep=False)
+            sys.exit(0)
+        finally:
+            recording_stopped.set()
+            self._stop_writer()
+            self._close_wave_file()
+
+        self._report_xruns()
+
+        if self.recording_frames == 0:
+            raise ValueError("No audio recorded")
+
+        # Keep the capture in memory so it can go straight to the model without re-reading the WAV
+        if self._captured_blocks:
+            self.samples = np.concatenate(self._captured_blocks)
+        self._captured_blocks = []
+
+        return self.audio_file_path
+
+    def _wait_for_gate(self):
+        """Block until the voice gate closes, or until Enter (or Ctrl+D) is pressed on an interactive terminal.
+
+        Without a terminal nothing else can stop the recording, so it also stops if no speech starts
+        within NO_SPEECH_TIMEOUT_SECONDS.
+        """
+        if sys.stdin is not None and sys.stdin.isatty():
+
+            def wait_for_enter():
+                try:
+                    input()
+                except EOFError:
+                    pass
+                self._gate_closed.set()
+
+            # Left blocked on stdin if the gate closes first; it is a daemon thread, so that is harmless
+            threading.Thread(target=wait_for_enter, daemon=True).start()
+            self._gate_closed.wait()
+            return
+
+        deadline = time.time() + self.NO_SPEECH_TIMEOUT_SECONDS
+        while not self._gate_closed.wait(0.2):
+            if not self.gate.started and time.time() > deadline:
+                console.print(
+                    f"\n⚠️ [bold yellow]No speech heard in {self.NO_SPEECH_TIMEOUT_SECONDS:g}s, stopping[/bold yellow]"
+                )
+                return
+
+    def _validate_audio_device(self):
+        try:
+            import sounddevice as sd
+
+            default_input = sd.query_devices(kind="input")
+            if default_input is None:
+                raise RuntimeError("No audio input device found")
+        except Exception as e:
+            raise RuntimeError(f"Failed to access audio devices: {e}")
+        return default_input
+
+    def _get_audio_file_path(self) -> Path:
+        return get_cache_dir() / "last_recording.wav"
+
+    def _prepare_capture(self, capture_rate: Optional[int] = None):
+        self._prepare_wave_file()
+        self.capture_rate = capture_rate or self.sample_rate
+        self.resampler = (
+            PolyphaseResampler(self.capture_rate, self.sample_rate, self.channels)
+            if self.capture_rate != self.sample_rate
+            else None
+        )
+        self.ring_buffer = AudioRingBuffer(int(self.capture_rate * self.RING_BUFFER_SECONDS), self.channels)
+        self.input_overflows = 0
+        self.samples = None
+        self._captured_blocks = []
+        self.gate = VoiceActivityGate(self.sample_rate, self.vad_stop_seconds) if self.vad_stop_seconds else None
+        self._gate_closed.clear()
+
+    def _open_wave(self, path: Path) -> wave.Wave_write:
+        wave_file = wave.open(str(path), "wb")
+        wave_file.setnchannels(self.channels)
+        wave_file.setsampwidth(2)  # 16-bit audio
+        wave_file.setframerate(self.sample_rate)
+        return wave_file
+
+    def _prepare_wave_file(self):
+        self.recording_frames = 0
+        # Capture into a temporary file that replaces the last recording only once complete. The old file
+        # is never truncated in place, so hard links to it (pending save jobs, the library) stay intact.
+        self._partial_path = self.audio_file_path.with_name(f".{self.audio_file_path.name}.{os.getpid()}.partial")
+        if self.segment_seconds:
+            self.session_dir = _create_unique_dir(
+                get_cache_dir() / "sessions", datetime.now().strftime("%Y_%m_%d_%H_%M_%S")
+            )
+            (self.session_dir / self.SESSION_OWNER_NAME).write_text(str(os.getpid()))
+            self.segment_paths = []
+            self._open_segment()
+        else:
+            self.wave_file = self._open_wave(self._partial_path)
+
+    def _close_wave_file(self, keep: bool = True):
+        """Close the capture file and move it into place, or discard it if the recording was cancelled."""
+        if self.wave_file:
+            self.wave_file.close()
+            self.wave_file = None
+            if self.segment_seconds:
+                self._close_session(keep)
+            elif keep and self.recording_frames > 0:
+                self._partial_path.replace(self.audio_file_path)
+            else:
+                self._partial_path.unlink(missing_ok=True)
+
+    def _close_session(self, keep: bool):
+        if not keep or self.recording_frames == 0:
+            shutil.rmtree(self.session_dir, ignore_errors=True)
+            return
+        if self.recording_frames > self._segment_start:
+            self._hand_off_segment()
+        else:
+            self.segment_paths.pop().unlink()
+        # The segments stay in session_dir until the caller has the transcript; the joined copy becomes
+        # the last recording, so --last and saving work as for any other capture
+        with self._open_wave(self._partial_path) as joined:
+            for path in self.segment_paths:
+                with wave.open(str(path), "rb") as segment:
+                    while frames := segment.readframes(self.JOIN_BLOCK_FRAMES):
+                        joined.writeframes(frames)
+        self._partial_path.replace(self.audio_file_path)
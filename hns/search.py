@@ -0,0 +1,471 @@
+"""Full-text and semantic search over the saved recordings."""
+
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from hns.archive import RecordingArchive, _read_library_file
+from hns.timings import TranscriptTimings
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class RecordingIndex:
+    """SQLite index of the recordings library, with an FTS5 table over the transcript text.
+
+    The JSON files stay the source of truth: `save_recording` adds each new one, and `sync`
+    picks up files that were added, edited or deleted by hand.
+    """
+
+    FILENAME = "index.sqlite3"
+    SCHEMA_VERSION = 3
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS recordings (
+            id INTEGER PRIMARY KEY,
+            json_path TEXT NOT NULL UNIQUE,
+            json_mtime REAL,
+            text TEXT NOT NULL,
+            model TEXT,
+            language TEXT,
+            recorded_at TEXT,
+            audio_duration_seconds REAL,
+            transcription_time_seconds REAL
+        );
+        CREATE INDEX IF NOT EXISTS recordings_recorded_at ON recordings(recorded_at);
+        CREATE VIRTUAL TABLE IF NOT EXISTS recordings_fts USING fts5(
+            text, content='recordings', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+        );
+        CREATE TRIGGER IF NOT EXISTS recordings_ai AFTER INSERT ON recordings BEGIN
+            INSERT INTO recordings_fts(rowid, text) VALUES (new.id, new.text);
+        END;
+        CREATE TRIGGER IF NOT EXISTS recordings_ad AFTER DELETE ON recordings BEGIN
+            INSERT INTO recordings_fts(recordings_fts, rowid, text) VALUES ('delete', old.id, old.text);
+        END;
+        CREATE TRIGGER IF NOT EXISTS recordings_au AFTER UPDATE OF text ON recordings BEGIN
+            INSERT INTO recordings_fts(recordings_fts, rowid, text) VALUES ('delete', old.id, old.text);
+            INSERT INTO recordings_fts(rowid, text) VALUES (new.id, new.text);
+        END;
+        -- Embedded passages for semantic search; id is the row of the passage in the vector files
+        CREATE TABLE IF NOT EXISTS chunks (
+            id INTEGER PRIMARY KEY,
+            recording_id INTEGER NOT NULL,
+            start REAL,
+            text TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS chunks_recording_id ON chunks(recording_id);
+        CREATE TABLE IF NOT EXISTS embedding_meta (key TEXT PRIMARY KEY, value);
+        -- 'backfilled' is set once a full sync has read the whole library
+        CREATE TABLE IF NOT EXISTS index_meta (key TEXT PRIMARY KEY, value);
+        CREATE TRIGGER IF NOT EXISTS recordings_chunks_ad AFTER DELETE ON recordings BEGIN
+            DELETE FROM chunks WHERE recording_id = old.id;
+        END;
+        CREATE TRIGGER IF NOT EXISTS recordings_chunks_au AFTER UPDATE OF text ON recordings
+        WHEN old.text != new.text BEGIN
+            DELETE FROM chunks WHERE recording_id = old.id;
+        END;
+    """
+    # Control characters cannot occur in transcripts, so they safely mark snippet matches
+    MATCH_START = "\x02"
+    MATCH_END = "\x03"
+
+    def __init__(self, save_dir: Path):
+        import sqlite3
+
+        self.save_dir = save_dir
+        self.db_path = save_dir / self.FILENAME
+        save_dir.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, timeout=10)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != self.SCHEMA_VERSION:
+            self.conn.executescript(self.SCHEMA + f"PRAGMA user_version = {self.SCHEMA_VERSION};")
+
+    @property
+    def backfilled(self) -> bool:
+        """Whether the library has been fully synced at least once.
+
+        `save_recording` may create the index before that (after an upgrade, say), so the index
+        existing does not mean it holds the older recordings.
+        """
+        return self.conn.execute("SELECT 1 FROM index_meta WHERE key = 'backfilled'").fetchone() is not None
+
+    def __enter__(self) -> RecordingIndex:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.conn.close()
+
+    def _relative_path(self, json_path: Path) -> str:
+        # Relative paths keep the index valid when the whole library is moved
+        return json_path.relative_to(self.save_dir).as_posix()
+
+    def _upsert(self, relative_path: str, metadata: dict, mtime: float):
+        self.conn.execute(
+            """
+            INSERT INTO recordings (
+                json_path, json_mtime, text, model, language,
+                recorded_at, audio_duration_seconds, transcription_time_seconds
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(json_path) DO UPDATE SET
+                json_mtime = excluded.json_mtime,
+                text = excluded.text,
+                model = excluded.model,
+                language = excluded.language,
+                recorded_at = excluded.recorded_at,
+                audio_duration_seconds = excluded.audio_duration_seconds,
+                transcription_time_seconds = excluded.transcription_time_seconds
+            """,
+            (
+                relative_path,
+                mtime,
+                metadata["text"],
+                metadata.get("model"),
+                metadata.get("language"),
+                metadata.get("recorded_at"),
+                metadata.get("audio_duration_seconds"),
+                metadata.get("transcription_time_seconds"),
+            ),
+        )
+
+    def add(self, json_path: Path, metadata: dict):
+        with self.conn:
+            self._upsert(self._relative_path(json_path), metadata, json_path.stat().st_mtime)
+
+    def sync(self) -> tuple[int, int]:
+        """Index new or changed JSON files in the library and drop entries whose file is gone.
+
+        Returns (indexed, removed) counts. Unchanged files are skipped by comparing mtimes.
+        Recordings packed by `hns archive` are read from their pack.
+        """
+        known = dict(self.conn.execute("SELECT json_path, json_mtime FROM recordings"))
+        archive = RecordingArchive(self.save_dir)
+        files = {}  # relative path -> (mtime, reader)
+        for relative_path, mtime in archive.members():
+            if relative_path.endswith(".json"):
+                files[relative_path] = (mtime, lambda name=relative_path: archive.read(name))
+        for json_path in self.save_dir.glob("*/*.json"):
+            try:
+                files[self._relative_path(json_path)] = (json_path.stat().st_mtime, json_path.read_bytes)
+            except OSError:
+                continue
+
+        indexed = 0
+        with self.conn:
+            for relative_path, (mtime, read) in files.items():
+                if known.get(relative_path) == mtime:
+                    continue
+                try:
+                    metadata = json.loads(read())
+                except (OSError, ValueError):
+                    continue
+                if not isinstance(metadata, dict) or not isinstance(metadata.get("text"), str):
+                    continue
+                self._upsert(relative_path, metadata, mtime)
+                indexed += 1
+
+            removed = [(path,) for path in known if path not in files]
+            self.conn.executemany("DELETE FROM recordings WHERE json_path = ?", removed)
+            self.conn.execute("INSERT OR REPLACE INTO index_meta (key, value) VALUES ('backfilled', 1)")
+        return indexed, len(removed)
+
+    @staticmethod
+    def _match_expression(query: str) -> str:
+        """Turn free text into an FTS5 query: every word must match, and `word*` matches a prefix."""
+        terms = re.findall(r"\w+\*?", query)
+        if not terms:
+            raise ValueError("Search query must contain at least one word")
+        return " ".join(f'"{term.rstrip("*")}"' + ("*" if term.endswith("*") else "") for term in terms)
+
+    def search(
+        self, query: str, limit: int = 10, model: Optional[str] = None, language: Optional[str] = None
+    ) -> list[dict]:
+        """Return the best-ranked (BM25) recordings matching `query`, each with a highlighted snippet."""
+        sql = """
+            SELECT r.json_path, r.text, r.model, r.language, r.recorded_at,
+                   r.audio_duration_seconds, r.transcription_time_seconds,
+                   snippet(recordings_fts, 0, ?, ?, '…', 16)
+            FROM recordings_fts JOIN recordings r ON r.id = recordings_fts.rowid
+            WHERE recordings_fts MATCH ?
+        """
+        params: list = [self.MATCH_START, self.MATCH_END, self._match_expression(query)]
+        if model:
+            sql += " AND r.model = ?"
+            params.append(model)
+        if language:
+            sql += " AND r.language = ?"
+            params.append(language)
+        sql += " ORDER BY bm25(recordings_fts) LIMIT ?"
+        params.append(limit)
+
+        columns = [
+            "json_path",
+            "text",
+            "model",
+            "language",
+            "recorded_at",
+            "audio_duration_seconds",
+            "transcription_time_seconds",
+            "snippet",
+        ]
+        hits = []
+        for row in self.conn.execute(sql, params):
+            hit = dict(zip(columns, row))
+            hit["json_path"] = str(self.save_dir / hit["json_path"])
+            hits.append(hit)
+        return hits
+
+
+# Passages of about this many words are embedded for semantic search
+EMBEDDING_CHUNK_WORDS = 60
+
+
+def _chunk_transcript(
+    text: str, timings: Optional[TranscriptTimings] = None, max_words: int = EMBEDDING_CHUNK_WORDS
+) -> list[tuple[Optional[float], str]]:
+    """Split a transcript into (start, passage) pairs of at most max_words words.
+
+    Passages are built from whole timed segments when timings are available, so each one knows
+    where it starts in the recording, and from whole sentences otherwise.
+    """
+    if timings is not None and timings.segments:
+        pieces = [(start, segment_text) for start, _, segment_text in timings.segments]
+    else:
+        pieces = [(None, sentence) for sentence in re.split(r"(?<=[.!?])\s+", text)]
+
+    chunks = []  # [start, words]
+    for start, piece in pieces:
+        words = piece.split()
+        for i in range(0, len(words), max_words):
+            part = words[i : i + max_words]
+            if chunks and len(chunks[-1][1]) + len(part) <= max_words:
+                chunks[-1][1].extend(part)
+            else:
+                chunks.append([start, part])
+    return [(start, " ".join(words)) for start, words in chunks]
+
+
+def _load_timings_sidecar(json_path: Path) -> Optional[TranscriptTimings]:
+    import io
+
+    try:
+        data = _read_library_file(json_path.with_name(f"{json_path.stem}{TranscriptTimings.SUFFIX}"))
+        return TranscriptTimings.load(io.BytesIO(data)) if data is not None else None
+    except Exception:
+        return None
+
+
+class TranscriptEmbedder:
+    """Small local text-embedding model, run on CPU through fastembed (`pip install 'hns[semantic]'`)."""
+
+    DEFAULT_MODEL = "BAAI/bge-small-en-v1.5"
+
+    def __init__(self, model_name: Optional[str] = None):
+        self.model_name = model_name or self.DEFAULT_MODEL
+        try:
+            from fastembed import TextEmbedding
+        except ImportError:
+            raise RuntimeError("Semantic search needs fastembed. Install it with: pip install 'hns[semantic]'")
+        try:
+            self.model = TextEmbedding(self.model_name)
+        except Exception as e:
+            raise RuntimeError(f"Failed to load embedding model '{self.model_name}': {e}")
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        import numpy as np
+
+        return np.asarray(list(self.model.embed(texts)), dtype=np.float32)
+
+    def embed_query(self, text: str) -> np.ndarray:
+        import numpy as np
+
+        # Retrieval models embed questions slightly differently from the passages they should find
+        return np.asarray(next(iter(self.model.query_embed(text))), dtype=np.float32)
+
+
+class EmbeddingIndex:
+    """int8 vector index of transcript passages, kept next to the full-text index.
+
+    Each passage vector is normalized and stored as int8 codes plus one float32 scale, appended
+    to `embeddings.<generation>.i8` and `.f32`. The passages themselves are rows of the `chunks`
+    table in index.sqlite3, whose id is the row in the vector files. A query is one matrix-vector
+    product over all rows, so 100k passages (37 MB at 384 dimensions) are scored in a few tens of
+    milliseconds. Rows of deleted recordings stay in the files until `compact()` rewrites them.
+    """
+
+    # Rows are converted to float32 a block at a time, which keeps the temporary copy in cache
+    BLOCK_ROWS = 16384
+    BATCH_SIZE = 256
+
+    def __init__(self, index: RecordingIndex):
+        self.index = index
+        self.conn = index.conn
+
+    def _get_meta(self, key: str):
+        row = self.conn.execute("SELECT value FROM embedding_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value):
+        self.conn.execute("INSERT OR REPLACE INTO embedding_meta (key, value) VALUES (?, ?)", (key, value))
+
+    @property
+    def model_name(self) -> Optional[str]:
+        """Embedding model the index was built with, or None if semantic search was never enabled."""
+        return self._get_meta("model")
+
+    def _paths(self, generation: int) -> tuple[Path, Path]:
+        base = self.index.save_dir / f"embeddings.{generation}"
+        return base.with_suffix(".i8"), base.with_suffix(".f32")
+
+    def _remove_other_generations(self, generation: int):
+        keep = set(self._paths(generation))
+        for path in self.index.save_dir.glob("embeddings.*"):
+            if path not in keep:
+                path.unlink(missing_ok=True)
+
+    def reset(self, model_name: str):
+        """Start an empty index for `model_name`; vectors of different models cannot be compared."""
+        generation = int(self._get_meta("generation") or 0) + 1
+        with self.conn:
+            self.conn.execute("DELETE FROM chunks")
+            self.conn.execute("DELETE FROM embedding_meta")
+            for key, value in (("model", model_name), ("generation", generation), ("rows", 0), ("dim", None)):
+                self._set_meta(key, value)
+        self._remove_other_generations(generation)
+
+    @staticmethod
+    def quantize(vectors: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Normalize vectors and encode each as int8 codes times a per-row float32 scale."""
+        import numpy as np
+
+        vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        scales = np.maximum(np.abs(vectors).max(axis=1) / 127, 1e-12).astype(np.float32)
+        codes = np.round(vectors / scales[:, None]).astype(np.int8)
+        return codes, scales
+
+    def add(self, chunks: list[tuple[int, Optional[float], str]], vectors: np.ndarray):
+        """Append passages, given as (recording_id, start, text), and their embedding vectors."""
+        codes, scales = self.quantize(vectors)
+        with self.conn:
+            # Taking the write lock first serializes appends from concurrent hns processes
+            self.conn.execute("BEGIN IMMEDIATE")
+            rows, dim = int(self._get_meta("rows") or 0), self._get_meta("dim")
+            if dim is not None and dim != codes.shape[1]:
+                raise ValueError(f"Embedding size changed from {dim} to {codes.shape[1]}; rebuild the index")
+            vectors_path, scales_path = self._paths(int(self._get_meta("generation")))
+            # Rows past the committed count are leftovers of an interrupted append
+            for path, data, row_bytes in ((vectors_path, codes, codes.shape[1]), (scales_path, scales, 4)):
+                with path.open("a+b") as f:
+                    f.truncate(rows * row_bytes)
+                    f.write(data.tobytes())
+            self.conn.executemany(
+                "INSERT INTO chunks (id, recording_id, start, text) VALUES (?, ?, ?, ?)",
+                [(rows + i, recording_id, start, text) for i, (recording_id, start, text) in enumerate(chunks)],
+            )
+            self._set_meta("rows", rows + len(chunks))
+            self._set_meta("dim", codes.shape[1])
+
+    def embed_missing(self, embedder: TranscriptEmbedder) -> int:
+        """Embed every indexed recording that has no passages yet; returns the number embedded."""
+        missing = self.conn.execute(
+            "SELECT id, json_path, text FROM recordings WHERE text != '' "
+            "AND id NOT IN (SELECT recording_id FROM chunks)"
+        ).fetchall()
+        pending = []
+        for recording_id, json_path, text in missing:
+            timings = _load_timings_sidecar(self.index.save_dir / json_path)
+            pending.extend((recording_id, start, passage) for start, passage in _chunk_transcript(text, timings))
+            if len(pending) >= self.BATCH_SIZE:
+                self.add(pending, embedder.embed([passage for _, _, passage in pending]))
+                pending = []
+        if pending:
+            self.add(pending, embedder.embed([passage for _, _, passage in pending]))
+        return len(missing)
+
+    def _load(self) -> tuple[np.ndarray, np.ndarray]:
+        import numpy as np
+
+        rows, dim = int(self._get_meta("rows") or 0), self._get_meta("dim")
+        if not rows:
+            return np.empty((0, 0), dtype=np.int8), np.empty(0, dtype=np.float32)
+        vectors_path, scales_path = self._paths(int(self._get_meta("generation")))
+        codes = np.fromfile(vectors_path, dtype=np.int8, count=rows * dim).reshape(rows, dim)
+        return codes, np.fromfile(scales_path, dtype=np.float32, count=rows)
+
+    def compact(self) -> int:
+        """Rewrite the vector files without the rows of deleted passages; returns the rows dropped."""
+        import numpy as np
+
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            live = [row for (row,) in self.conn.execute("SELECT id FROM chunks ORDER BY id")]
+            codes, scales = self._load()
+            if len(live) == len(codes):
+                return 0
+            # The new generation's files are only used once the renumbered rows are committed
+            generation = int(self._get_meta("generation")) + 1
+            keep = np.asarray(live, dtype=np.int64)
+            for path, data in zip(self._paths(generation), (codes[keep], scales[keep])):
+                data.tofile(path)
+            # Ascending order never renumbers a row onto one that has not moved yet
+            self.conn.executemany("UPDATE chunks SET id = ? WHERE id = ?", list(enumerate(live)))
+            self._set_meta("rows", len(live))
+            self._set_meta("generation", generation)
+        self._remove_other_generations(generation)
+        return len(codes) - len(live)
+
+    def search(
+        self, query_vector: np.ndarray, limit: int = 10, model: Optional[str] = None, language: Optional[str] = None
+    ) -> list[dict]:
+        """Return the passages most similar (cosine) to `query_vector`, best first."""
+        import numpy as np
+
+        codes, scales = self._load()
+        if not len(codes):
+            return []
+        query = (query_vector / max(float(np.linalg.norm(query_vector)), 1e-12)).astype(np.float32)
+        scores = np.empty(len(codes), dtype=np.float32)
+        for start in range(0, len(codes), self.BLOCK_ROWS):
+            block = codes[start : start + self.BLOCK_ROWS]
+            scores[start : start + len(block)] = block.astype(np.float32) @ query
+        scores *= scales
+
+        sql = """
+            SELECT c.id, c.text, c.start, r.json_path, r.model, r.language, r.recorded_at
+            FROM chunks c JOIN recordings r ON r.id = c.recording_id
+            WHERE c.id IN ({})
+        """
+        filters, params = "", []
+        if model:
+            filters += " AND r.model = ?"
+            params.append(model)
+        if language:
+            filters += " AND r.language = ?"
+            params.append(language)
+
+        # Rows of deleted passages or filtered-out recordings are dropped after ranking, so widen the
+        # candidate set until enough real hits are found
+        candidates = min(limit * 4, len(scores))
+        while True:
+            top = np.argpartition(-scores, candidates - 1)[:candidates]
+            rows = {}
+            for start in range(0, len(top), 500):  # SQLite limits the number of bound parameters
+                batch = top[start : start + 500].tolist()
+                query_sql = sql.format(",".join("?" * len(batch))) + filters
+                for row in self.conn.execute(query_sql, batch + params):
+                    rows[row[0]] = row
+            if len(rows) >= limit or candidates == len(scores):
+                break
+            candidates = min(candidates * 4, len(scores))
+
+        columns = ["text", "segment_start", "json_path", "model", "language", "recorded_at"]
+        hits = []
+        for row_id in sorted(rows, key=lambda row_id: -scores[row_id])[:limit]:
+            hit = dict(zip(columns, rows[row_id][1:]))
+            hit["json_path"] = str(self.index.save_dir / hit["json_path"])
+            hit["score"] = round(float(scores[row_id]), 4)
+            hits.append(hit)
+        return hits
@@ -0,0 +1,289 @@
+"""Saving recordings, the durable job queue that saves them, and the transcript cache."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+from hns.audio import AUDIO_FORMATS, _encode_audio
+from hns.config import get_cache_dir
+from hns.console import console
+from hns.files import _create_unique_dir, _link_or_copy, _write_text_atomic
+from hns.search import RecordingIndex
+from hns.timings import TranscriptTimings
+
+
+def save_recording(
+    wav_source: Path,
+    text: str,
+    model_name: str,
+    language: Optional[str],
+    audio_duration: Optional[float],
+    transcription_time: Optional[float],
+    save_dir: Path,
+    recorded_at: datetime,
+    audio_format: str = "wav",
+    timings: Optional[TranscriptTimings] = None,
+    extra_metadata: Optional[dict] = None,
+) -> None:
+    words = re.sub(r"[^a-z0-9 ]", "", text.lower()).split()
+    slug = "_".join(words[:5]) if words else "no_speech"
+    # Same-day recordings that start with the same words get _2, _3, ... instead of overwriting each other
+    recording_dir = _create_unique_dir(save_dir, recorded_at.strftime("%Y_%m_%d") + f"_{slug}")
+    folder_name = recording_dir.name
+
+    audio_dest = recording_dir / f"{folder_name}{AUDIO_FORMATS[audio_format]}"
+    json_dest = recording_dir / f"{folder_name}.json"
+
+    if audio_format != "wav":
+        try:
+            _encode_audio(wav_source, audio_dest, audio_format)
+        except Exception as e:
+            audio_dest.unlink(missing_ok=True)
+            console.print(
+                f"⚠️ [bold yellow]Failed to encode {audio_format} audio, saving WAV instead: {e}[/bold yellow]"
+            )
+            audio_format = "wav"
+            audio_dest = recording_dir / f"{folder_name}.wav"
+
+    if audio_format == "wav":
+        try:
+            _link_or_copy(wav_source, audio_dest)
+        except Exception as e:
+            console.print(f"⚠️ [bold yellow]Failed to save WAV recording: {e}[/bold yellow]")
+
+    try:
+        metadata = {
+            "text": text,
+            "model": model_name,
+            "language": language,
+            "recorded_at": recorded_at.isoformat(),
+            "audio_duration_seconds": audio_duration,
+            "transcription_time_seconds": transcription_time,
+            "audio_file": audio_dest.name,
+            **(extra_metadata or {}),
+        }
+        if audio_format == "wav":
+            metadata["wav_file"] = audio_dest.name  # Kept for tools written before compressed formats
+        if timings is not None and timings.segments:
+            timings_dest = recording_dir / f"{folder_name}{TranscriptTimings.SUFFIX}"
+            try:
+                timings.save(timings_dest)
+                metadata["timings_file"] = timings_dest.name
+            except Exception as e:
+                console.print(f"⚠️ [bold yellow]Failed to save timestamps: {e}[/bold yellow]")
+        _write_text_atomic(json_dest, json.dumps(metadata, indent=2))
+    except Exception as e:
+        console.print(f"⚠️ [bold yellow]Failed to save transcript JSON: {e}[/bold yellow]")
+        return
+
+    # Embedding for semantic search waits for the next `hns ask`, which loads the embedding model anyway
+    try:
+        with RecordingIndex(save_dir) as index:
+            index.add(json_dest, metadata)
+    except Exception as e:
+        console.print(f"⚠️ [bold yellow]Failed to update search index: {e}[/bold yellow]")
+
+
+def _run_save_job(job: dict, audio_path: Path):
+    timings = TranscriptTimings.from_dict(job["timings"]) if job.get("timings") else None
+    save_recording(
+        audio_path,
+        job["text"],
+        job["model"],
+        job["language"],
+        job["audio_duration"],
+        job["transcription_time"],
+        Path(job["save_dir"]),
+        datetime.fromisoformat(job["recorded_at"]),
+        job["audio_format"],
+        timings=timings,
+        extra_metadata=job.get("extra_metadata"),
+    )
+
+
+def _process_exited(pid: int) -> bool:
+    """Whether the process with this pid is known to have exited."""
+    if pid == os.getpid() or sys.platform == "win32":
+        return False  # os.kill(pid, 0) would terminate the process on Windows
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        pass
+    return False
+
+
+class JobQueue:
+    """Background worker for the I/O that follows a transcription, so it never delays stdout.
+
+    Durable jobs are written to the cache directory, together with a hard link (or copy) of their
+    audio, before they are queued. A job file is claimed by renaming it to include our PID and is
+    deleted once it has run, so jobs left behind by a killed process are picked up by `recover()`
+    on the next start. In-memory jobs (clipboard, transcript cache) are simply lost on a crash.
+    """
+
+    HANDLERS = {"save": _run_save_job}
+    # Claims older than this are treated as abandoned even if the PID has been reused
+    CLAIM_TIMEOUT_SECONDS = 600
+
+    def __init__(self, jobs_dir: Optional[Path] = None):
+        self.jobs_dir = jobs_dir or get_cache_dir() / "jobs"
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def _ensure_worker(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._worker, daemon=True)
+            self._thread.start()
+
+    def submit(self, func: Callable, *args):
+        """Run func(*args) in the background. Exceptions are reported as warnings."""
+        self._ensure_worker()
+        self._queue.put((func, args))
+
+    def submit_durable(self, kind: str, job: dict, audio_file_path: Path):
+        """Persist a job and its audio to disk, then queue it."""
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        job_id = f"{time.time_ns()}_{os.getpid()}"
+        audio_path = self.jobs_dir / f"{job_id}{audio_file_path.suffix}"
+        _link_or_copy(audio_file_path, audio_path)
+        job_path = self.jobs_dir / f"{job_id}.json"
+        _write_text_atomic(job_path, json.dumps({"kind": kind, "audio": audio_path.name, **job}))
+        self.submit(self._run_durable, job_path)
+
+    def recover(self) -> int:
+        """Queue jobs that an earlier hns process persisted but never finished. Returns how many."""
+        if not self.jobs_dir.exists():
+            return 0
+        pending = list(self.jobs_dir.glob("*.json"))
+        claimed = list(self.jobs_dir.glob("*.claimed"))
+        pending.extend(path for path in claimed if self._claim_abandoned(path))
+
+        # Audio whose job file was never written (killed between the two steps) would otherwise pile up
+        job_ids = {path.name.split(".")[0] for path in pending + claimed}
+        for path in self.jobs_dir.iterdir():
+            if path.suffix not in (".json", ".claimed") and path.name.split(".")[0] not in job_ids:
+                try:
+                    if time.time() - path.stat().st_mtime > self.CLAIM_TIMEOUT_SECONDS:
+                        path.unlink()
+                except OSError:
+                    pass
+
+        for job_path in sorted(pending):
+            self.submit(self._run_durable, job_path)
+        return len(pending)
+
+    def _claim_abandoned(self, claimed_path: Path) -> bool:
+        try:
+            pid = int(claimed_path.suffixes[-2].lstrip("."))
+            if time.time() - claimed_path.stat().st_mtime > self.CLAIM_TIMEOUT_SECONDS:
+                return True
+        except (IndexError, ValueError, OSError):
+            return False
+        return _process_exited(pid)
+
+    def _run_durable(self, job_path: Path):
+        job_id = job_path.name.split(".")[0]
+        claimed_path = self.jobs_dir / f"{job_id}.{os.getpid()}.claimed"
+        try:
+            job_path.replace(claimed_path)
+        except FileNotFoundError:
+            return  # Another hns process claimed it first
+
+        job = json.loads(claimed_path.read_text())
+        audio_path = self.jobs_dir / job["audio"]
+        try:
+            self.HANDLERS[job["kind"]](job, audio_path)
+        finally:
+            # A job that fails is reported and dropped rather than retried on every start
+            audio_path.unlink(missing_ok=True)
+            claimed_path.unlink(missing_ok=True)
+
+    def _worker(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            func, args = item
+            try:
+                func(*args)
+            except Exception as e:
+                console.print(f"⚠️ [bold yellow]Background job failed: {e}[/bold yellow]")
+
+    def flush(self):
+        """Wait for every queued job to finish."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+
+class TranscriptCache:
+    """Content-addressed cache of transcripts, bounded in size with least-recently-used eviction.
+
+    Entries are small JSON files named by a hash of the audio bytes and every setting that affects
+    the output. A hit refreshes the file's mtime, which is what eviction orders by.
+    """
+
+    DEFAULT_MAX_MB = 50
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_mb: Optional[float] = None):
+        self.cache_dir = (cache_dir or get_cache_dir()) / "transcripts"
+        self.max_bytes = int((max_mb if max_mb is not None else self.DEFAULT_MAX_MB) * 1024 * 1024)
+
+    @staticmethod
+    def make_key(
+        audio_file_path: Path, backend: str, model: str, language: Optional[str], decoding_options: dict
+    ) -> str:
+        digest = hashlib.sha256()
+        settings = {"backend": backend, "model": model, "language": language, "decoding": decoding_options}
+        digest.update(json.dumps(settings, sort_keys=True).encode())
+        with audio_file_path.open("rb") as f:
+            while chunk := f.read(1024 * 1024):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        entry_path = self.cache_dir / f"{key}.json"
+        try:
+            entry = json.loads(entry_path.read_text())
+            os.utime(entry_path)
+            return entry
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, entry: dict):
+        """Store an entry and evict old ones. The cache is best-effort, so I/O errors are ignored."""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            _write_text_atomic(self.cache_dir / f"{key}.json", json.dumps(entry))
+            self._evict()
+        except OSError:
+            pass
+
+    def _evict(self):
+        entries = []
+        for entry_path in self.cache_dir.glob("*.json"):
+            try:
+                stat = entry_path.stat()
+            except FileNotFoundError:
+                continue  # Evicted concurrently by another hns process
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, entry_path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            entry_path.unlink(missing_ok=True)
+            total_bytes -= size
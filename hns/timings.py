@@ -0,0 +1,90 @@
+"""Segment and word start times of a transcript."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import BinaryIO, Iterable, Optional, Union
+
+
+class TranscriptTimings:
+    """Segment and word timestamps of a transcript, in seconds from the start of the recording.
+
+    Saved next to the transcript JSON as a compressed NumPy archive with one array per column
+    (segment_start, segment_end, segment_text and the same for words), so finding where a phrase
+    was said means loading a few small arrays instead of parsing JSON.
+    """
+
+    SUFFIX = ".timings.npz"
+
+    def __init__(self, segments: Optional[list] = None, words: Optional[list] = None):
+        self.segments = segments if segments is not None else []  # (start, end, text)
+        self.words = words if words is not None else []  # (start, end, word)
+        # Added to every timestamp recorded, for audio that is decoded piece by piece
+        self.offset = 0.0
+
+    def add_segment(self, start: float, end: float, text: str):
+        self.segments.append((self.offset + float(start), self.offset + float(end), text))
+
+    def add_word(self, start: float, end: float, word: str):
+        self.words.append((self.offset + float(start), self.offset + float(end), word))
+
+    def add_tokens(self, tokens: list[str], timestamps: list[float], end: float):
+        """Group timed subword tokens into words. A token starting with a space begins a new word."""
+        words = []
+        for token, start in zip(tokens, timestamps):
+            if not words or token[:1].isspace():
+                words.append([start, token.strip()])
+            else:
+                words[-1][1] += token
+        for i, (start, word) in enumerate(words):
+            if word:
+                self.add_word(start, words[i + 1][0] if i + 1 < len(words) else max(end, start), word)
+
+    def to_dict(self) -> dict:
+        return {"segments": [list(s) for s in self.segments], "words": [list(w) for w in self.words]}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> TranscriptTimings:
+        return cls([tuple(s) for s in data.get("segments", [])], [tuple(w) for w in data.get("words", [])])
+
+    def save(self, path: Path):
+        import numpy as np
+
+        columns = {}
+        for name, rows in (("segment", self.segments), ("word", self.words)):
+            starts, ends, texts = zip(*rows) if rows else ((), (), ())
+            columns[f"{name}_start"] = np.asarray(starts, dtype=np.float32)
+            columns[f"{name}_end"] = np.asarray(ends, dtype=np.float32)
+            columns[f"{name}_text"] = np.asarray(texts, dtype=str)
+
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            with tmp_path.open("wb") as f:
+                np.savez_compressed(f, **columns)
+            tmp_path.replace(path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    @classmethod
+    def load(cls, path: Union[Path, BinaryIO]) -> TranscriptTimings:
+        import numpy as np
+
+        with np.load(path) as data:
+            return cls(
+                *(
+                    list(
+                        zip(data[f"{name}_start"].tolist(), data[f"{name}_end"].tolist(), data[f"{name}_text"].tolist())
+                    )
+                    for name in ("segment", "word")
+                )
+            )
+
+    def find(self, terms: Iterable[str]) -> Optional[float]:
+        """Start of the first segment containing any of the terms (case-insensitive), or None."""
+        terms = [term.casefold() for term in terms if term]
+        for start, _, text in self.segments:
+            if any(term in text.casefold() for term in terms):
+                return start
+        return None
@@ -1,10 +1,63 @@
+import wave
+from datetime import datetime
 from pathlib import Path
+from typing import Optional
 
+import numpy as np
 import pytest
 
+from hns.config import get_default_save_dir
+from hns.storage import save_recording
+
+SAMPLE_RATE = 16000
+
 
 @pytest.fixture
 def mock_home(tmp_path, monkeypatch):
     """Redirect Path.home() to a temporary directory for config isolation."""
     monkeypatch.setattr(Path, "home", lambda: tmp_path)
     return tmp_path
+
+
+def tone(
+    seconds: float, channels: Optional[int] = None, amplitude: float = 0.3, sample_rate: int = SAMPLE_RATE
+) -> np.ndarray:
+    """A 220 Hz tone, loud enough to count as speech. Shaped (frames, channels) when channels is given."""
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    audio = (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+    return audio if channels is None else audio.reshape(-1, 1).repeat(channels, axis=1)
+
+
+def silence(seconds: float, channels: Optional[int] = None) -> np.ndarray:
+    shape = int(seconds * SAMPLE_RATE) if channels is None else (int(seconds * SAMPLE_RATE), channels)
+    return np.zeros(shape, dtype=np.float32)
+
+
+def write_wav(path, audio: np.ndarray, sample_rate: int = SAMPLE_RATE) -> Path:
+    """Write mono float audio as a 16-bit WAV."""
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes((audio * 32767).astype(np.int16).tobytes())
+    return path
+
+
+@pytest.fixture
+def save_dir(mock_home):
+    return get_default_save_dir()
+
+
+def save_transcript(
+    save_dir,
+    text,
+    recorded_at=datetime(2026, 2, 22, 10, 30),
+    model="base",
+    language="en",
+    timings=None,
+):
+    """Save a recording with placeholder audio, as `hns` does after a transcription."""
+    wav = Path.home() / "source.wav"
+    wav.unlink(missing_ok=True)  # saved audio is hard-linked, so each recording needs its own file
+    wav.write_bytes(b"RIFF" + text.encode())
+    save_recording(wav, text, model, language, 3.0, 1.0, save_dir, recorded_at, timings=timings)
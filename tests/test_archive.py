@@ -0,0 +1,131 @@
+import json
+import tarfile
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from hns.archive import RecordingArchive
+from hns.cli import main
+from hns.config import get_default_save_dir
+from hns.search import RecordingIndex
+from hns.storage import save_recording
+from hns.timings import TranscriptTimings
+from tests.conftest import save_transcript
+
+
+@pytest.fixture
+def save_dir(save_dir):
+    timings = TranscriptTimings([(0.0, 2.0, "Intro."), (65.0, 70.0, "The invoice is late.")])
+    save_transcript(save_dir, "Intro. The invoice is late.", datetime(2025, 1, 5, 9, 0), timings=timings)
+    save_transcript(save_dir, "January planning notes.", datetime(2025, 1, 20, 9, 0))
+    save_transcript(save_dir, "February retro.", datetime(2025, 2, 3, 9, 0))
+    save_transcript(save_dir, "Fresh idea from today.", datetime.now())
+    return save_dir
+
+
+class TestArchive:
+    def test_old_recordings_are_packed_per_month(self, save_dir):
+        originals = {p.relative_to(save_dir).as_posix(): p.read_bytes() for p in save_dir.glob("2025_*/*")}
+        result = CliRunner().invoke(main, ["archive", "--older-than", "90d"])
+        assert result.exit_code == 0
+        assert "Archived 3 recording(s) into 2 monthly pack(s)" in result.stderr
+
+        assert sorted(p.name for p in (save_dir / "archive").glob("*.tar")) == ["2025_01.tar", "2025_02.tar"]
+        assert not list(save_dir.glob("2025_*"))
+        assert len(list(save_dir.glob("*/*.json"))) == 1
+        with tarfile.open(save_dir / "archive" / "2025_01.tar") as tar:
+            assert len(tar.getnames()) == 5  # wav + json for both, plus one timings sidecar
+
+        archive = RecordingArchive(save_dir)
+        for name, data in originals.items():
+            assert archive.read(name) == data
+
+    def test_dry_run_changes_nothing(self, save_dir):
+        result = CliRunner().invoke(main, ["archive", "--dry-run"])
+        assert result.exit_code == 0
+        assert "3 recording(s) to archive into 2 monthly pack(s)" in result.stderr
+        assert not (save_dir / "archive").exists()
+        assert len(list(save_dir.glob("*/*.json"))) == 4
+
+    def test_appending_to_a_pack_keeps_earlier_members(self, save_dir):
+        archive = RecordingArchive(save_dir)
+        archive.add([next(save_dir.glob("2025_01_05_*"))])
+        with (save_dir / "archive" / "2025_01.tar").open("ab") as f:
+            f.write(b"\0" * 700 + b"left by an interrupted run")
+        archive = RecordingArchive(save_dir)
+        archive.add([next(save_dir.glob("2025_01_20_*"))])
+
+        names = [name for name, _ in archive.members()]
+        assert len(names) == 5
+        with tarfile.open(save_dir / "archive" / "2025_01.tar") as tar:
+            assert sorted(tar.getnames()) == sorted(names)
+        metadata = json.loads(
+            archive.read(next(name for name in names if name.startswith("2025_01_05_") and name.endswith(".json")))
+        )
+        assert metadata["text"] == "Intro. The invoice is late."
+
+    def test_hard_linked_audio_is_stored_in_full(self, mock_home):
+        save_dir = get_default_save_dir()
+        wav = Path.home() / "last_recording.wav"
+        wav.write_bytes(b"RIFF same audio")
+        for text in ("First take.", "Second take."):  # hns --last saves the same audio twice
+            save_recording(wav, text, "base", "en", 3.0, 1.0, save_dir, datetime(2025, 3, 1, 9, 0))
+        RecordingArchive(save_dir).add(sorted(save_dir.glob("2025_*")))
+
+        archive = RecordingArchive(save_dir)
+        wavs = [name for name, _ in archive.members() if name.endswith(".wav")]
+        assert len(wavs) == 2
+        assert all(archive.read(name) == b"RIFF same audio" for name in wavs)
+
+    def test_archived_recordings_stay_searchable_and_exportable(self, save_dir):
+        CliRunner().invoke(main, ["archive"])
+        with RecordingIndex(save_dir) as index:
+            assert index.sync() == (0, 0)
+
+        result = CliRunner().invoke(main, ["search", "invoice"])
+        assert result.exit_code == 0
+        assert "@ 01:05" in result.stdout
+        assert "(archived)" in result.stdout
+
+        (save_dir / RecordingIndex.FILENAME).unlink()
+        result = CliRunner().invoke(main, ["search", "retro"])
+        assert result.exit_code == 0
+
+        rows = [json.loads(line) for line in CliRunner().invoke(main, ["export", "-"]).stdout.splitlines()]
+        assert len(rows) == 4
+
+    def test_restore_unpacks_one_folder(self, save_dir):
+        folder = next(save_dir.glob("2025_02_*"))
+        mtimes = {p.name: p.stat().st_mtime for p in folder.iterdir()}
+        CliRunner().invoke(main, ["archive"])
+
+        result = CliRunner().invoke(main, ["archive", "--restore", folder.name])
+        assert result.exit_code == 0
+        assert {p.name: p.stat().st_mtime for p in folder.iterdir()} == mtimes
+        assert not any(name.startswith(folder.name) for name, _ in RecordingArchive(save_dir).members())
+        with RecordingIndex(save_dir) as index:
+            assert index.sync() == (0, 0)
+
+        result = CliRunner().invoke(main, ["archive", "--restore", folder.name])
+        assert result.exit_code == 1
+
+    def test_folders_with_subfolders_or_links_are_kept(self, save_dir):
+        folder = next(save_dir.glob("2025_01_20_*"))
+        (folder / "notes").mkdir()
+        (folder / "notes" / "draft.txt").write_text("keep me")
+        (folder / "shortcut.wav").symlink_to(next(folder.glob("*.wav")))
+
+        result = CliRunner().invoke(main, ["archive"])
+        assert result.exit_code == 0
+        assert f"Not archiving {folder.name}" in result.stderr
+        assert "Archived 2 recording(s)" in result.stderr
+        assert (folder / "notes" / "draft.txt").read_text() == "keep me"
+        assert (folder / "shortcut.wav").is_symlink()
+        assert not any(name.startswith(folder.name) for name, _ in RecordingArchive(save_dir).members())
+
+    def test_invalid_age_is_rejected(self, save_dir):
+        result = CliRunner().invoke(main, ["archive", "--older-than", "three months"])
+        assert result.exit_code == 2
+        assert not (save_dir / "archive").exists()
@@ -0,0 +1,100 @@
+import json
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from hns.audio import _encode_audio, _get_audio_file_duration, _iter_decoded_blocks
+from hns.cli import ParakeetTranscriber, _collect_audio_files
+from hns.storage import save_recording
+from tests.conftest import SAMPLE_RATE, tone, write_wav
+
+
+class TestEncodeAudio:
+    def test_flac_is_lossless(self, tmp_path):
+        audio = tone(2.0)
+        write_wav(tmp_path / "in.wav", audio)
+        _encode_audio(tmp_path / "in.wav", tmp_path / "out.flac", "flac")
+        decoded = np.concatenate(list(_iter_decoded_blocks(tmp_path / "out.flac")))
+        np.testing.assert_allclose(decoded, (audio * 32767).astype(np.int16) / 32768, atol=1e-6)
+
+    @pytest.mark.parametrize("sample_rate", [16000, 44100])
+    def test_opus_is_compact_and_keeps_duration(self, tmp_path, sample_rate):
+        write_wav(tmp_path / "in.wav", tone(10.0, sample_rate=sample_rate), sample_rate)
+        _encode_audio(tmp_path / "in.wav", tmp_path / "out.opus", "opus")
+        assert (tmp_path / "out.opus").stat().st_size < (tmp_path / "in.wav").stat().st_size / 5
+        assert _get_audio_file_duration(tmp_path / "out.opus") == pytest.approx(10.0, abs=0.05)
+        decoded = np.concatenate(list(_iter_decoded_blocks(tmp_path / "out.opus")))
+        assert len(decoded) == pytest.approx(10.0 * SAMPLE_RATE, abs=0.05 * SAMPLE_RATE)
+
+
+class TestAudioFileDuration:
+    def test_wav_and_flac(self, tmp_path):
+        write_wav(tmp_path / "in.wav", tone(3.0))
+        _encode_audio(tmp_path / "in.wav", tmp_path / "out.flac", "flac")
+        assert _get_audio_file_duration(tmp_path / "in.wav") == 3.0
+        assert _get_audio_file_duration(tmp_path / "out.flac") == pytest.approx(3.0)
+
+    def test_unreadable_file_returns_none(self, tmp_path):
+        (tmp_path / "bad.flac").write_bytes(b"not audio")
+        assert _get_audio_file_duration(tmp_path / "bad.flac") is None
+        assert _get_audio_file_duration(tmp_path / "missing.opus") is None
+
+
+class TestSaveRecordingFormats:
+    def test_saves_compressed_audio(self, tmp_path):
+        write_wav(tmp_path / "in.wav", tone(2.0))
+        save_dir = tmp_path / "recs"
+        save_recording(tmp_path / "in.wav", "Hello there.", "base", "en", 2.0, 0.5, save_dir, datetime.now(), "opus")
+        folder = next(save_dir.glob("*_hello_there"))
+        metadata = json.loads(next(folder.glob("*.json")).read_text())
+        assert metadata["audio_file"].endswith(".opus")
+        assert "wav_file" not in metadata
+        assert (folder / metadata["audio_file"]).exists()
+        assert not list(folder.glob("*.wav"))
+
+    def test_wav_keeps_legacy_key(self, tmp_path):
+        write_wav(tmp_path / "in.wav", tone(2.0))
+        save_dir = tmp_path / "recs"
+        save_recording(tmp_path / "in.wav", "Hello there.", "base", "en", 2.0, 0.5, save_dir, datetime.now())
+        metadata = json.loads(next(save_dir.glob("*/*.json")).read_text())
+        assert metadata["wav_file"] == metadata["audio_file"]
+        assert metadata["audio_file"].endswith(".wav")
+
+    def test_encoding_failure_falls_back_to_wav(self, tmp_path):
+        write_wav(tmp_path / "in.wav", tone(2.0))
+        save_dir = tmp_path / "recs"
+        with patch("hns.storage._encode_audio", side_effect=RuntimeError("no encoder")):
+            save_recording(tmp_path / "in.wav", "Hello.", "base", "en", 2.0, 0.5, save_dir, datetime.now(), "flac")
+        metadata = json.loads(next(save_dir.glob("*/*.json")).read_text())
+        assert metadata["audio_file"].endswith(".wav")
+        assert not list(save_dir.glob("*/*.flac"))
+
+
+class TestReadingCompressedAudio:
+    def test_batch_collects_compressed_files(self, tmp_path):
+        for name in ("a.wav", "b.flac", "c.opus", "d.mp3"):
+            (tmp_path / name).touch()
+        assert [f.name for f in _collect_audio_files((tmp_path,))] == ["a.wav", "b.flac", "c.opus"]
+
+    def test_parakeet_decodes_compressed_files(self, tmp_path):
+        write_wav(tmp_path / "in.wav", tone(2.0))
+        _encode_audio(tmp_path / "in.wav", tmp_path / "out.flac", "flac")
+        transcriber = ParakeetTranscriber.__new__(ParakeetTranscriber)
+        transcriber.model = MagicMock()
+        transcriber.model.recognize.return_value = "hello"
+        assert transcriber._recognize(str(tmp_path / "out.flac")) == "hello"
+        audio = transcriber.model.recognize.call_args.args[0]
+        assert isinstance(audio, np.ndarray)
+        assert len(audio) == 2 * SAMPLE_RATE
+
+    def test_parakeet_chunks_long_compressed_files(self, tmp_path):
+        write_wav(tmp_path / "in.wav", tone(45.0))
+        _encode_audio(tmp_path / "in.wav", tmp_path / "out.flac", "flac")
+        transcriber = ParakeetTranscriber.__new__(ParakeetTranscriber)
+        transcriber.model = MagicMock()
+        transcriber.model.recognize.side_effect = lambda batch, sample_rate: ["part"] * len(batch)
+        assert transcriber._recognize(str(tmp_path / "out.flac")).startswith("part part part")
+        batch = transcriber.model.recognize.call_args.args[0]
+        assert sum(len(chunk) for chunk in batch) == 45 * SAMPLE_RATE
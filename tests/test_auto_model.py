@@ -0,0 +1,126 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from click.testing import CliRunner
+
+from hns.cli import ModelSelector, main
+from hns.config import get_cache_dir
+from hns.recorder import AudioRecorder
+from tests.conftest import silence, write_wav
+
+
+@pytest.fixture
+def selector(tmp_path):
+    with patch.object(ModelSelector, "probe", return_value=ModelSelector.REFERENCE_GFLOPS):
+        yield ModelSelector(tmp_path)
+
+
+class TestModelSelector:
+    def test_probe_measures_throughput(self):
+        assert ModelSelector.probe() > 0
+
+    def test_largest_model_within_budget(self, selector):
+        assert selector.select("whisper", None, "cpu", 30.0, latency_seconds=5.0) == "base"
+        assert selector.select("whisper", None, "cpu", 30.0, latency_seconds=15.0) == "large-v3-turbo"
+        assert selector.select("whisper", None, "cpu", 4.0, latency_seconds=5.0) == "large-v3"
+        assert selector.select("whisper", "en", "cpu", 30.0, latency_seconds=10.0) == "distil-large-v3.5"
+
+    def test_faster_machines_get_larger_models(self, selector):
+        selector.data["gflops"] = 4 * ModelSelector.REFERENCE_GFLOPS
+        assert selector.select("whisper", None, "cpu", 30.0, latency_seconds=5.0) == "large-v3-turbo"
+        assert selector.select("whisper", None, "auto", 30.0, latency_seconds=5.0, cuda=True) == "large-v3"
+
+    def test_fastest_model_when_nothing_fits(self, selector):
+        assert selector.select("whisper", None, "cpu", 3600.0, latency_seconds=5.0) == "tiny"
+        assert selector.select("parakeet", "en", "cpu", 3600.0) == "nemo-parakeet-ctc-0.6b"
+        assert selector.select("parakeet", "fr", "cpu", 10.0) == "nemo-parakeet-tdt-0.6b-v3"
+
+    def test_measured_speed_replaces_the_estimate(self, selector, tmp_path):
+        selector.record("whisper", "large-v3", "cpu", 60.0, 6.0)
+        assert selector.select("whisper", None, "cpu", 30.0, latency_seconds=5.0) == "large-v3"
+        selector.record("whisper", "large-v3", "cpu", 60.0, 18.0)
+        assert ModelSelector(tmp_path).data["speeds"]["whisper/large-v3/cpu"] == pytest.approx(0.2)
+
+    def test_new_hardware_is_probed_again(self, selector, tmp_path):
+        selector.record("whisper", "base", "cpu", 10.0, 1.0)
+        with (
+            patch("hns.cli.os.cpu_count", return_value=128),
+            patch.object(ModelSelector, "probe", return_value=1000.0) as probe,
+        ):
+            again = ModelSelector(tmp_path)
+        probe.assert_called_once()
+        assert again.data["speeds"] == {}
+        assert again.data["gflops"] == 1000.0
+
+
+@pytest.fixture
+def auto_env(mock_home, monkeypatch):
+    for name in ("HNS_BACKEND", "HNS_WHISPER_MODEL", "HNS_LANG"):
+        monkeypatch.delenv(name, raising=False)
+    transcriber = MagicMock()
+    transcriber.transcribe.return_value = ("text", 1.0)
+    transcriber._get_audio_duration.return_value = 2.0
+    transcriber.timings = None
+    transcriber.model_name = "large-v3"
+    with (
+        patch.object(ModelSelector, "probe", return_value=ModelSelector.REFERENCE_GFLOPS),
+        patch("hns.cli._cuda_available", return_value=False),
+        patch("hns.cli._create_transcriber", return_value=transcriber) as create,
+    ):
+        yield create
+
+
+class TestAutoModelOption:
+    def test_last_recording_uses_the_selected_model_and_records_its_speed(self, mock_home, monkeypatch):
+        for name in ("HNS_BACKEND", "HNS_WHISPER_MODEL", "HNS_LANG"):
+            monkeypatch.delenv(name, raising=False)
+        write_wav(AudioRecorder(16000, 1)._get_audio_file_path(), silence(2))
+        transcriber = MagicMock()
+        transcriber.transcribe.return_value = ("text", 1.0)
+        transcriber._get_audio_duration.return_value = 2.0
+        transcriber.timings = None
+
+        with (
+            patch.object(ModelSelector, "probe", return_value=ModelSelector.REFERENCE_GFLOPS),
+            patch("hns.cli._cuda_available", return_value=False),
+            patch("hns.cli._create_transcriber", return_value=transcriber) as create,
+            patch("hns.cli._daemon_serves", return_value=False),
+            patch("hns.cli.copy_to_clipboard"),
+            patch("hns.storage.save_recording"),
+        ):
+            result = CliRunner().invoke(main, ["--last", "--no-cache", "--model", "auto"])
+
+        assert result.exit_code == 0
+        assert create.call_args.args[:2] == ("whisper", "large-v3")
+        assert "Auto-selected model: large-v3" in result.stderr
+        speeds = json.loads((get_cache_dir() / ModelSelector.FILENAME).read_text())["speeds"]
+        assert speeds == {"whisper/large-v3/auto": 0.5}
+
+    def test_auto_daemon_model_is_used(self, auto_env):
+        write_wav(AudioRecorder(16000, 1)._get_audio_file_path(), silence(2))
+        status = {"backend": "whisper", "model": "small", "profile": "balanced", "auto": True}
+        with (
+            patch("hns.daemon._send_daemon_request", return_value=status),
+            patch("hns.cli._transcribe_with_daemon", return_value=("text", 0.5, 2.0, None)) as transcribe,
+            patch("hns.cli.copy_to_clipboard"),
+            patch("hns.storage.save_recording"),
+        ):
+            result = CliRunner().invoke(main, ["--last", "--no-cache", "--model", "auto"])
+        assert result.exit_code == 0
+        assert transcribe.call_args.args[1:3] == ("whisper", "small")
+        auto_env.assert_not_called()
+
+    def test_batch_resolves_auto_for_a_typical_file(self, auto_env, mock_home):
+        for name in ("a.wav", "b.wav", "c.wav"):
+            write_wav(mock_home / name, silence(4))
+        result = CliRunner().invoke(main, ["transcribe", str(mock_home), "--model", "auto", "--workers", "1"])
+        assert result.exit_code == 0
+        assert auto_env.call_args.args[:2] == ("whisper", "large-v3")
+
+    def test_serve_resolves_auto(self, auto_env):
+        with patch("hns.cli.TranscriptionDaemon") as daemon:
+            result = CliRunner().invoke(main, ["serve", "--model", "auto"])
+        assert result.exit_code == 0
+        assert auto_env.call_args.args[:2] == ("whisper", "base")
+        assert daemon.call_args.kwargs["auto"] is True
@@ -0,0 +1,73 @@
+import json
+from unittest.mock import MagicMock, patch
+
+from click.testing import CliRunner
+
+from hns.cli import _collect_audio_files, _init_batch_worker, _transcribe_batch_file, main
+
+
+def _fake_transcriber(text="hello world", duration=2.0):
+    transcriber = MagicMock()
+    transcriber._get_audio_duration.return_value = duration
+    transcriber.transcribe.return_value = (text, None)
+    return transcriber
+
+
+class TestCollectAudioFiles:
+    def test_directories_are_searched_recursively(self, tmp_path):
+        (tmp_path / "a").mkdir()
+        (tmp_path / "a" / "one.wav").touch()
+        (tmp_path / "two.WAV").touch()
+        (tmp_path / "notes.txt").touch()
+        files = _collect_audio_files((tmp_path,))
+        assert [f.name for f in files] == ["one.wav", "two.WAV"]
+
+    def test_explicit_files_are_kept_and_deduplicated(self, tmp_path):
+        audio = tmp_path / "one.wav"
+        audio.touch()
+        assert _collect_audio_files((audio, tmp_path)) == [audio.resolve()]
+
+
+class TestTranscribeBatchFile:
+    def test_success(self, tmp_path):
+        _init_batch_worker("whisper", "base", None, "cpu", cache_mb=0)
+        with patch("hns.cli._create_transcriber", return_value=_fake_transcriber()):
+            result = _transcribe_batch_file(tmp_path / "one.wav")
+        assert result["text"] == "hello world"
+        assert result["audio_duration_seconds"] == 2.0
+        assert "error" not in result
+
+    def test_failure_is_recorded_not_raised(self, tmp_path):
+        transcriber = _fake_transcriber()
+        transcriber.transcribe.side_effect = RuntimeError("Transcription failed: No speech detected in audio")
+        _init_batch_worker("whisper", "base", None, "cpu", cache_mb=0)
+        with patch("hns.cli._create_transcriber", return_value=transcriber):
+            result = _transcribe_batch_file(tmp_path / "one.wav")
+        assert "No speech detected" in result["error"]
+        assert "text" not in result
+
+
+class TestTranscribeCommand:
+    def test_writes_json_lines_in_input_order(self, mock_home):
+        for name in ("b.wav", "a.wav"):
+            (mock_home / name).touch()
+        runner = CliRunner()
+        with patch("hns.cli._create_transcriber", return_value=_fake_transcriber()):
+            result = runner.invoke(main, ["transcribe", str(mock_home), "--workers", "1"])
+        assert result.exit_code == 0
+        lines = [json.loads(line) for line in result.stdout.splitlines() if line.startswith("{")]
+        assert [line["path"] for line in lines] == [str(mock_home / "a.wav"), str(mock_home / "b.wav")]
+        assert "audio-hours per wall-clock hour" in result.stderr
+
+    def test_no_audio_files_exits_with_error(self, mock_home):
+        (mock_home / "notes.txt").touch()
+        result = CliRunner().invoke(main, ["transcribe", str(mock_home)])
+        assert result.exit_code == 1
+
+    def test_failed_file_sets_exit_code(self, mock_home):
+        (mock_home / "a.wav").touch()
+        transcriber = _fake_transcriber()
+        transcriber.transcribe.side_effect = ValueError("bad audio")
+        with patch("hns.cli._create_transcriber", return_value=transcriber):
+            result = CliRunner().invoke(main, ["transcribe", str(mock_home / "a.wav"), "--workers", "1"])
+        assert result.exit_code == 1
@@ -0,0 +1,154 @@
+import os
+from unittest.mock import MagicMock, patch
+
+from click.testing import CliRunner
+
+from hns.cli import _decoding_options, _init_batch_worker, _transcribe_batch_file, main
+from hns.recorder import AudioRecorder
+from hns.storage import TranscriptCache
+
+
+def _write_audio(path, content=b"RIFF fake audio"):
+    path.write_bytes(content)
+    return path
+
+
+class TestTranscriptCache:
+    def test_round_trip(self, tmp_path):
+        cache = TranscriptCache(tmp_path)
+        cache.put("abc", {"text": "hello", "audio_duration": 1.5})
+        assert cache.get("abc") == {"text": "hello", "audio_duration": 1.5}
+
+    def test_missing_key_returns_none(self, tmp_path):
+        assert TranscriptCache(tmp_path).get("missing") is None
+
+    def test_key_depends_on_audio_and_settings(self, tmp_path):
+        audio = _write_audio(tmp_path / "a.wav")
+        other = _write_audio(tmp_path / "b.wav", b"RIFF other audio")
+        key = TranscriptCache.make_key(audio, "whisper", "base", None, {"beam_size": 5})
+        assert key == TranscriptCache.make_key(audio, "whisper", "base", None, {"beam_size": 5})
+        assert key != TranscriptCache.make_key(other, "whisper", "base", None, {"beam_size": 5})
+        assert key != TranscriptCache.make_key(audio, "whisper", "small", None, {"beam_size": 5})
+        assert key != TranscriptCache.make_key(audio, "whisper", "base", "en", {"beam_size": 5})
+        assert key != TranscriptCache.make_key(audio, "whisper", "base", None, {"beam_size": 1})
+
+    def test_whisper_options_that_change_the_output_are_in_the_key(self, monkeypatch):
+        monkeypatch.delenv("HNS_BATCH_THRESHOLD", raising=False)
+        default = _decoding_options("whisper", None, cfg={})
+        assert default != _decoding_options("whisper", None, cfg={"word_timestamps": True})
+        assert default != _decoding_options("whisper", None, cfg={"batch_threshold": 60})
+
+    def test_least_recently_used_entries_are_evicted(self, tmp_path):
+        cache = TranscriptCache(tmp_path, max_mb=0.001)  # ~1 KB
+        cache.put("old", {"text": "a" * 400})
+        cache.put("used", {"text": "b" * 400})
+        os.utime(cache.cache_dir / "old.json", (0, 0))
+        os.utime(cache.cache_dir / "used.json", (0, 0))
+        cache.get("used")  # refreshes its mtime, so "old" is now the least recently used
+        cache.put("new", {"text": "c" * 400})
+        assert cache.get("old") is None
+        assert cache.get("used") is not None
+        assert cache.get("new") is not None
+
+
+class TestBatchCache:
+    def test_rerun_is_served_from_cache(self, mock_home):
+        audio = _write_audio(mock_home / "one.wav")
+        transcriber = MagicMock()
+        transcriber._get_audio_duration.return_value = 2.0
+        transcriber.transcribe.return_value = ("hello world", None)
+
+        _init_batch_worker("whisper", "base", None, "cpu")
+        with patch("hns.cli._create_transcriber", return_value=transcriber):
+            first = _transcribe_batch_file(audio)
+
+        _init_batch_worker("whisper", "base", None, "cpu")
+        with patch("hns.cli._create_transcriber") as create:
+            second = _transcribe_batch_file(audio)
+        create.assert_not_called()
+        assert second["text"] == first["text"] == "hello world"
+        assert second["cached"] is True
+        assert "cached" not in first
+
+    def test_cache_can_be_disabled(self, mock_home):
+        audio = _write_audio(mock_home / "one.wav")
+        transcriber = MagicMock()
+        transcriber._get_audio_duration.return_value = 2.0
+        transcriber.transcribe.return_value = ("hello world", None)
+        with patch("hns.cli._create_transcriber", return_value=transcriber):
+            for _ in range(2):
+                _init_batch_worker("whisper", "base", None, "cpu", cache_mb=0)
+                _transcribe_batch_file(audio)
+        assert transcriber.transcribe.call_count == 2
+
+
+class TestLastCache:
+    def test_cached_last_skips_model_loading(self, mock_home, monkeypatch):
+        monkeypatch.delenv("HNS_BACKEND", raising=False)
+        monkeypatch.delenv("HNS_WHISPER_MODEL", raising=False)
+        monkeypatch.delenv("HNS_LANG", raising=False)
+        audio = _write_audio(AudioRecorder(16000, 1)._get_audio_file_path())
+        cache = TranscriptCache()
+        key = TranscriptCache.make_key(audio, "whisper", "base", None, _decoding_options("whisper", None))
+        cache.put(key, {"text": "from the cache", "audio_duration": 3.0})
+
+        with (
+            patch("hns.cli._load_transcriber_in_background") as load,
+            patch("hns.cli._create_transcriber") as create,
+            patch("hns.cli._daemon_serves") as daemon_serves,
+            patch("hns.cli.copy_to_clipboard"),
+            patch("hns.storage.save_recording") as save,
+        ):
+            result = CliRunner().invoke(main, ["--last"])
+
+        assert result.exit_code == 0
+        assert "from the cache" in result.stdout
+        load.assert_not_called()
+        create.assert_not_called()
+        daemon_serves.assert_not_called()
+        assert save.call_args.args[1] == "from the cache"
+
+    def test_no_cache_flag_transcribes_again(self, mock_home, monkeypatch):
+        monkeypatch.delenv("HNS_BACKEND", raising=False)
+        monkeypatch.delenv("HNS_WHISPER_MODEL", raising=False)
+        monkeypatch.delenv("HNS_LANG", raising=False)
+        audio = _write_audio(AudioRecorder(16000, 1)._get_audio_file_path())
+        key = TranscriptCache.make_key(audio, "whisper", "base", None, _decoding_options("whisper", None))
+        TranscriptCache().put(key, {"text": "from the cache", "audio_duration": 3.0})
+
+        with (
+            patch("hns.cli._load_transcriber_in_background") as load,
+            patch("hns.cli._await_transcriber") as await_transcriber,
+            patch("hns.cli._daemon_serves", return_value=False),
+            patch("hns.cli.copy_to_clipboard"),
+            patch("hns.storage.save_recording"),
+        ):
+            await_transcriber.return_value.transcribe.return_value = ("fresh", 0.1)
+            await_transcriber.return_value._get_audio_duration.return_value = 3.0
+            await_transcriber.return_value.timings = None
+            result = CliRunner().invoke(main, ["--last", "--no-cache"])
+
+        assert result.exit_code == 0
+        assert "fresh" in result.stdout
+        load.assert_called_once()
+
+    def test_streamed_transcript_is_not_cached(self, mock_home, monkeypatch):
+        monkeypatch.delenv("HNS_BACKEND", raising=False)
+        audio = _write_audio(AudioRecorder(16000, 1)._get_audio_file_path())
+        streaming = MagicMock()
+        streaming.finish.return_value = ("streamed text", 0.1)
+        streaming.transcriber._get_audio_duration.return_value = 3.0
+        streaming.timings = None
+
+        with (
+            patch("hns.cli._load_transcriber_in_background"),
+            patch("hns.cli.StreamingTranscription", return_value=streaming),
+            patch.object(AudioRecorder, "record", return_value=audio),
+            patch("hns.cli.copy_to_clipboard"),
+            patch("hns.storage.save_recording"),
+        ):
+            result = CliRunner().invoke(main, ["--stream"])
+
+        assert result.exit_code == 0
+        assert "streamed text" in result.stdout
+        assert not list(TranscriptCache().cache_dir.glob("*"))
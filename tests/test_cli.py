@@ -1,8 +1,12 @@
-from unittest.mock import patch
+import threading
+from concurrent.futures import Future
+from unittest.mock import MagicMock, patch
 
+import pytest
 from click.testing import CliRunner
 
-from hns.cli import ParakeetTranscriber, WhisperTranscriber, main
+from hns.cli import ParakeetTranscriber, WhisperTranscriber, _await_transcriber, _load_transcriber_in_background, main
+from hns.recorder import AudioRecorder
 
 
 class TestListModels:
@@ -65,3 +69,117 @@ class TestLastFlag:
         with patch("hns.cli.WhisperTranscriber"):
             result = runner.invoke(main, ["--last"])
         assert result.exit_code == 1
+
+
+class TestBackgroundModelLoading:
+    def test_future_resolves_to_transcriber(self):
+        with patch("hns.cli._create_transcriber", return_value="transcriber") as mock_create:
+            future = _load_transcriber_in_background("whisper", "base", None, "cpu")
+            assert future.result(timeout=5) == "transcriber"
+        mock_create.assert_called_once_with("whisper", "base", None, "cpu", decoding_options=None)
+
+    def test_load_error_is_raised_from_future(self):
+        with patch("hns.cli._create_transcriber", side_effect=RuntimeError("Failed to load model: boom")):
+            future = _load_transcriber_in_background("whisper", "base", None, "cpu")
+            with pytest.raises(RuntimeError, match="boom"):
+                future.result(timeout=5)
+
+    def test_await_returns_loaded_transcriber(self):
+        future = Future()
+        future.set_result("transcriber")
+        assert _await_transcriber(future) == "transcriber"
+
+
+class TestDraftMode:
+    @pytest.fixture
+    def run(self, mock_home, monkeypatch):
+        for name in ("HNS_BACKEND", "HNS_WHISPER_MODEL", "HNS_LANG"):
+            monkeypatch.delenv(name, raising=False)
+        AudioRecorder(16000, 1)._get_audio_file_path().write_bytes(b"RIFF fake audio")
+
+        def invoke(args, results, wait_for=None):
+            """`wait_for` maps a model to the text that must reach the clipboard before its decode returns."""
+            copied = {}
+
+            def create(backend, model, language, device, decoding_options=None):
+                transcriber = MagicMock()
+                transcriber._get_audio_duration.return_value = 2.0
+                transcriber.timings = None
+
+                def transcribe(audio, show_progress=False):
+                    if model in (wait_for or {}):
+                        assert copied.setdefault(wait_for[model], threading.Event()).wait(timeout=5)
+                    if isinstance(results[model], Exception):
+                        raise results[model]
+                    return results[model], 1.5
+
+                transcriber.transcribe.side_effect = transcribe
+                created.append((backend, model))
+                return transcriber
+
+            def copy(text):
+                copied.setdefault(text, threading.Event()).set()
+
+            created = []
+            with (
+                patch("hns.cli._create_transcriber", side_effect=create),
+                patch("hns.cli._daemon_serves", return_value=False),
+                patch("hns.cli.copy_to_clipboard", side_effect=copy) as clipboard,
+                patch("hns.storage.save_recording") as save,
+            ):
+                result = CliRunner().invoke(main, ["--last", "--no-cache", *args])
+            return result, created, [call.args[0] for call in clipboard.call_args_list], save
+
+        return invoke
+
+    def test_draft_is_copied_then_replaced(self, run):
+        result, created, copied, save = run(
+            ["--model", "large-v3", "--draft"],
+            {"base": "draft text", "large-v3": "refined text"},
+            wait_for={"large-v3": "draft text"},
+        )
+        assert result.exit_code == 0
+        assert sorted(created) == [("whisper", "base"), ("whisper", "large-v3")]
+        assert copied == ["draft text", "refined text"]
+        assert result.stdout.strip() == "refined text"
+        assert "Draft:" in result.stderr
+        assert save.call_args.args[1] == "refined text"
+        draft = save.call_args.kwargs["extra_metadata"]["draft"]
+        assert draft["text"] == "draft text"
+        assert draft["model"] == "base"
+
+    def test_draft_runs_alongside_the_main_model_and_is_dropped_when_late(self, run):
+        result, _, copied, save = run(
+            ["--model", "large-v3", "--draft"],
+            {"base": "draft text", "large-v3": "refined text"},
+            wait_for={"base": "refined text"},
+        )
+        assert result.exit_code == 0
+        assert copied == ["refined text"]
+        assert "Draft:" not in result.stderr
+        assert "draft" not in save.call_args.kwargs["extra_metadata"]
+
+    def test_parakeet_draft_model_is_recognized(self, run):
+        result, created, _, _ = run(
+            ["--model", "large-v3", "--draft", "nemo-parakeet-ctc-0.6b"],
+            {"nemo-parakeet-ctc-0.6b": "draft", "large-v3": "refined"},
+        )
+        assert result.exit_code == 0
+        assert ("parakeet", "nemo-parakeet-ctc-0.6b") in created
+
+    def test_failed_refinement_keeps_the_draft(self, run):
+        result, _, copied, save = run(
+            ["--model", "large-v3", "--draft", "tiny"],
+            {"tiny": "draft text", "large-v3": RuntimeError("Transcription failed: out of memory")},
+        )
+        assert result.exit_code == 0
+        assert result.stdout.strip() == "draft text"
+        assert "keeping the draft" in result.stderr
+        assert save.call_args.args[1:3] == ("draft text", "tiny")
+        assert save.call_args.kwargs["extra_metadata"] == {"decoding_profile": "fast"}
+
+    def test_same_model_is_transcribed_once(self, run):
+        result, created, copied, _ = run(["--model", "base", "--draft", "base"], {"base": "text"})
+        assert result.exit_code == 0
+        assert created == [("whisper", "base")]
+        assert copied == ["text"]
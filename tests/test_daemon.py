@@ -0,0 +1,77 @@
+import threading
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from hns.daemon import (
+    TranscriptionDaemon,
+    _daemon_serves,
+    _get_daemon_socket_path,
+    _send_daemon_request,
+    _transcribe_with_daemon,
+)
+
+
+@pytest.fixture
+def daemon(mock_home):
+    """Run a TranscriptionDaemon with a fake transcriber on a background thread."""
+    transcriber = MagicMock()
+    transcriber.model_name = "base"
+    transcriber.language = None
+    transcriber._get_audio_duration.return_value = 3.0
+    transcriber.transcribe.return_value = ("hello world", None)
+
+    server = TranscriptionDaemon(_get_daemon_socket_path(), transcriber, "whisper")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join(timeout=2)
+
+
+class TestDaemonClient:
+    def test_no_socket_returns_none(self, mock_home):
+        assert _send_daemon_request({"command": "status"}) is None
+
+    def test_stale_socket_returns_none(self, mock_home):
+        _get_daemon_socket_path().touch()
+        assert _send_daemon_request({"command": "status"}) is None
+
+    def test_status_reports_loaded_model(self, daemon):
+        assert _send_daemon_request({"command": "status"}) == {"backend": "whisper", "model": "base"}
+
+    def test_daemon_serves_matching_model(self, daemon):
+        assert _daemon_serves("whisper", "base")
+        assert not _daemon_serves("whisper", "small")
+        assert not _daemon_serves("parakeet", "base")
+
+    def test_transcribe_returns_text_and_duration(self, daemon, tmp_path):
+        text, transcription_time, audio_duration, timings = _transcribe_with_daemon(
+            tmp_path / "audio.wav", "whisper", "base", None
+        )
+        assert text == "hello world"
+        assert audio_duration == 3.0
+        assert transcription_time >= 0
+        assert timings is None
+
+    def test_transcribe_sends_in_memory_samples(self, daemon):
+        samples = np.linspace(-1, 1, 16000, dtype=np.float32)
+        text, _, _, _ = _transcribe_with_daemon(samples, "whisper", "base", None)
+        assert text == "hello world"
+        sent = daemon.transcriber.transcribe.call_args.args[0]
+        np.testing.assert_array_equal(sent, samples)
+        daemon.transcriber._get_audio_duration.assert_called_once()
+
+    def test_transcribe_applies_requested_language(self, daemon, tmp_path):
+        _transcribe_with_daemon(tmp_path / "audio.wav", "whisper", "base", "fr")
+        assert daemon.transcriber.language == "fr"
+
+    def test_transcribe_model_mismatch_returns_none(self, daemon, tmp_path):
+        assert _transcribe_with_daemon(tmp_path / "audio.wav", "whisper", "small", None) is None
+
+    def test_transcribe_error_is_raised(self, daemon, tmp_path):
+        daemon.transcriber.transcribe.side_effect = RuntimeError("Transcription failed: No speech detected in audio")
+        with pytest.raises(RuntimeError, match="No speech detected"):
+            _transcribe_with_daemon(tmp_path / "audio.wav", "whisper", "base", None)
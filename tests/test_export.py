@@ -0,0 +1,73 @@
+import json
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+
+from hns.cli import main
+from hns.export import _iter_export_batches
+from hns.storage import save_recording
+
+
+@pytest.fixture
+def save_dir(save_dir):
+    wav = Path.home() / "source.wav"
+    wav.write_bytes(b"RIFF")
+    save_recording(wav, "First note.", "base", "en", 4.0, 1.0, save_dir, datetime(2026, 2, 22, 10, 30))
+    save_recording(wav, "Second note.", "small", "fr", 2.0, 1.0, save_dir, datetime(2026, 2, 23, 9, 0))
+    broken = save_dir / "2026_02_24_broken"
+    broken.mkdir()
+    (broken / "2026_02_24_broken.json").write_text("{not json")
+    return save_dir
+
+
+class TestExport:
+    def test_jsonl_to_stdout(self, save_dir):
+        result = CliRunner().invoke(main, ["export", "-"])
+        assert result.exit_code == 0
+        rows = [json.loads(line) for line in result.stdout.splitlines()]
+        assert [row["text"] for row in rows] == ["First note.", "Second note."]
+        assert rows[0]["recorded_at"] == "2026-02-22T10:30:00"
+        assert rows[0]["rtf"] == 0.25
+        assert rows[1]["language"] == "fr"
+        assert rows[0]["audio_file"].endswith(".wav")
+        assert "Exported 2 recording(s)" in result.stderr
+
+    def test_format_from_extension(self, save_dir, tmp_path):
+        result = CliRunner().invoke(main, ["export", str(tmp_path / "library.jsonl")])
+        assert result.exit_code == 0
+        assert len((tmp_path / "library.jsonl").read_text().splitlines()) == 2
+        assert not list(tmp_path.glob("*.partial"))
+
+    def test_unknown_extension_is_rejected(self, save_dir, tmp_path):
+        result = CliRunner().invoke(main, ["export", str(tmp_path / "library.txt")])
+        assert result.exit_code == 1
+        assert "--format" in result.stderr
+
+    def test_batches_are_bounded(self, save_dir):
+        batches = list(_iter_export_batches(save_dir, workers=2, batch_rows=2))
+        assert [len(batch) for batch in batches] == [2]
+
+    def test_missing_pyarrow_is_explained(self, save_dir, tmp_path):
+        with patch.dict("sys.modules", {"pyarrow": None}):
+            result = CliRunner().invoke(main, ["export", str(tmp_path / "library.parquet")])
+        assert result.exit_code == 1
+        assert "hns[export]" in result.stderr
+        assert not list(tmp_path.glob("library.parquet*"))
+
+    @pytest.mark.parametrize("name", ["library.parquet", "library.arrow"])
+    def test_columnar_formats(self, save_dir, tmp_path, name):
+        pa = pytest.importorskip("pyarrow")
+        result = CliRunner().invoke(main, ["export", str(tmp_path / name)])
+        assert result.exit_code == 0
+        if name.endswith(".parquet"):
+            import pyarrow.parquet as pq
+
+            table = pq.read_table(tmp_path / name)
+        else:
+            table = pa.ipc.open_file(tmp_path / name).read_all()
+        assert table.column("text").to_pylist() == ["First note.", "Second note."]
+        assert table.column("recorded_at").type == pa.timestamp("us")
+        assert table.column("rtf").to_pylist() == [0.25, 0.5]
@@ -0,0 +1,124 @@
+import json
+from datetime import datetime
+
+import pytest
+from click.testing import CliRunner
+
+from hns.cli import main
+from hns.search import RecordingIndex
+from tests.conftest import save_transcript
+
+
+class TestRecordingIndex:
+    def test_save_recording_updates_index(self, save_dir):
+        save_transcript(save_dir, "Deploy the billing service on Friday.")
+        with RecordingIndex(save_dir) as index:
+            hits = index.search("billing")
+        assert len(hits) == 1
+        assert hits[0]["model"] == "base"
+        assert hits[0]["audio_duration_seconds"] == 3.0
+        assert hits[0]["json_path"].endswith(".json")
+        assert f"{RecordingIndex.MATCH_START}billing{RecordingIndex.MATCH_END}" in hits[0]["snippet"]
+
+    def test_results_are_ranked(self, save_dir):
+        save_transcript(save_dir, "The garden needs water.")
+        save_transcript(
+            save_dir, "Release notes: release the release branch today.", recorded_at=datetime(2026, 2, 23, 9, 0)
+        )
+        with RecordingIndex(save_dir) as index:
+            hits = index.search("release")
+        assert [h["text"] for h in hits] == ["Release notes: release the release branch today."]
+
+    def test_all_words_must_match_and_prefixes_work(self, save_dir):
+        save_transcript(save_dir, "Refactor the parser module.")
+        save_transcript(save_dir, "Refactor the lexer.", recorded_at=datetime(2026, 2, 23, 9, 0))
+        with RecordingIndex(save_dir) as index:
+            assert len(index.search("refactor parser")) == 1
+            assert len(index.search("pars*")) == 1
+            assert len(index.search("refactor")) == 2
+
+    def test_filters(self, save_dir):
+        save_transcript(save_dir, "Bonjour le monde.", language="fr")
+        save_transcript(save_dir, "Hello monde.", recorded_at=datetime(2026, 2, 23, 9, 0), model="small")
+        with RecordingIndex(save_dir) as index:
+            assert [h["language"] for h in index.search("monde", language="fr")] == ["fr"]
+            assert [h["model"] for h in index.search("monde", model="small")] == ["small"]
+
+    def test_query_syntax_characters_are_treated_as_text(self, save_dir):
+        save_transcript(save_dir, "Ship it or not.")
+        with RecordingIndex(save_dir) as index:
+            assert len(index.search('ship" OR (not')) == 1
+            with pytest.raises(ValueError):
+                index.search('"*()')
+
+    def test_sync_picks_up_added_edited_and_deleted_files(self, save_dir):
+        save_transcript(save_dir, "Original text.")
+        json_path = next(save_dir.glob("*/*.json"))
+        other_dir = save_dir / "2026_01_01_manual"
+        other_dir.mkdir()
+        (other_dir / "2026_01_01_manual.json").write_text(json.dumps({"text": "Added by hand."}))
+        (save_dir / "2026_01_02_broken").mkdir()
+        (save_dir / "2026_01_02_broken" / "broken.json").write_text("{not json")
+
+        metadata = json.loads(json_path.read_text())
+        metadata["text"] = "Corrected text."
+        json_path.write_text(json.dumps(metadata))
+
+        with RecordingIndex(save_dir) as index:
+            assert index.sync() == (2, 0)
+            assert index.search("original") == []
+            assert len(index.search("corrected")) == 1
+            assert len(index.search("hand")) == 1
+            assert index.sync() == (0, 0)
+
+            (other_dir / "2026_01_01_manual.json").unlink()
+            assert index.sync() == (0, 1)
+            assert index.search("hand") == []
+
+
+class TestSearchCommand:
+    def test_prints_highlighted_snippets(self, save_dir):
+        save_transcript(save_dir, "Deploy the billing service on Friday.")
+        result = CliRunner().invoke(main, ["search", "billing"])
+        assert result.exit_code == 0
+        assert "billing" in result.stdout
+        assert "1 result(s)" in result.stderr
+
+    def test_json_output(self, save_dir):
+        save_transcript(save_dir, "Deploy the billing service on Friday.")
+        result = CliRunner().invoke(main, ["search", "billing", "--json"])
+        hit = json.loads(result.stdout)
+        assert hit["text"] == "Deploy the billing service on Friday."
+        assert "snippet" not in hit
+
+    def test_existing_library_is_backfilled(self, save_dir):
+        folder = save_dir / "2025_12_01_old_note"
+        folder.mkdir(parents=True)
+        (folder / "2025_12_01_old_note.json").write_text(json.dumps({"text": "An old note.", "model": "base"}))
+        result = CliRunner().invoke(main, ["search", "note"])
+        assert result.exit_code == 0
+        assert "old_note" in result.stdout
+
+    def test_library_is_backfilled_after_a_save_created_the_index(self, save_dir):
+        folder = save_dir / "2025_12_01_pricing"
+        folder.mkdir(parents=True)
+        (folder / "2025_12_01_pricing.json").write_text(json.dumps({"text": "The pricing review.", "model": "base"}))
+        save_transcript(save_dir, "First dictation after upgrading.")
+        result = CliRunner().invoke(main, ["search", "pricing"])
+        assert result.exit_code == 0
+        assert "2025_12_01_pricing" in result.stdout
+        assert "Building search index" in result.stderr
+
+        result = CliRunner().invoke(main, ["search", "pricing"])
+        assert "Building search index" not in result.stderr
+
+    def test_no_results_exits_nonzero(self, save_dir):
+        save_transcript(save_dir, "Something else.")
+        result = CliRunner().invoke(main, ["search", "billing"])
+        assert result.exit_code == 1
+
+    def test_index_command_reports_counts(self, save_dir):
+        save_transcript(save_dir, "First.")
+        result = CliRunner().invoke(main, ["index"])
+        assert result.exit_code == 0
+        assert "1 total" in result.stderr
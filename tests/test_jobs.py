@@ -0,0 +1,123 @@
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+from click.testing import CliRunner
+
+from hns.cli import _release_stdout, main
+from hns.recorder import AudioRecorder
+from hns.storage import JobQueue
+from tests.conftest import silence, write_wav
+
+
+def _save_job(save_dir, text="Hello there."):
+    return {
+        "text": text,
+        "model": "base",
+        "language": "en",
+        "audio_duration": 0.1,
+        "transcription_time": 0.5,
+        "save_dir": str(save_dir),
+        "recorded_at": datetime(2026, 2, 22, 10, 30).isoformat(),
+        "audio_format": "wav",
+    }
+
+
+class TestJobQueue:
+    def test_durable_job_runs_and_cleans_up(self, tmp_path):
+        audio = write_wav(tmp_path / "last.wav", silence(0.1))
+        jobs = JobQueue(tmp_path / "jobs")
+        jobs.submit_durable("save", _save_job(tmp_path / "recs"), audio)
+        jobs.flush()
+        assert len(list((tmp_path / "recs").glob("*/*.wav"))) == 1
+        assert list((tmp_path / "jobs").iterdir()) == []
+        assert audio.exists()
+
+    def test_jobs_left_by_a_killed_process_are_recovered(self, tmp_path):
+        audio = write_wav(tmp_path / "last.wav", silence(0.1))
+        killed = JobQueue(tmp_path / "jobs")
+        with patch.object(JobQueue, "submit"):  # persisted, but the process dies before running it
+            killed.submit_durable("save", _save_job(tmp_path / "recs"), audio)
+        audio.unlink()  # the next recording replaces last_recording.wav
+
+        jobs = JobQueue(tmp_path / "jobs")
+        assert jobs.recover() == 1
+        jobs.flush()
+        metadata = json.loads(next((tmp_path / "recs").glob("*/*.json")).read_text())
+        assert metadata["text"] == "Hello there."
+        assert list((tmp_path / "jobs").iterdir()) == []
+
+    def test_claim_of_dead_process_is_recovered(self, tmp_path):
+        jobs_dir = tmp_path / "jobs"
+        with patch.object(JobQueue, "submit"):
+            JobQueue(jobs_dir).submit_durable(
+                "save", _save_job(tmp_path / "recs"), write_wav(tmp_path / "a.wav", silence(0.1))
+            )
+        dead = subprocess.Popen([sys.executable, "-c", "pass"])
+        dead.wait()
+        job_path = next(jobs_dir.glob("*.json"))
+        job_path.rename(jobs_dir / f"{job_path.stem}.{dead.pid}.claimed")
+
+        jobs = JobQueue(jobs_dir)
+        assert jobs.recover() == 1
+        jobs.flush()
+        assert len(list((tmp_path / "recs").glob("*/*.json"))) == 1
+
+    def test_claim_of_running_process_is_left_alone(self, tmp_path):
+        jobs_dir = tmp_path / "jobs"
+        with patch.object(JobQueue, "submit"):
+            JobQueue(jobs_dir).submit_durable(
+                "save", _save_job(tmp_path / "recs"), write_wav(tmp_path / "a.wav", silence(0.1))
+            )
+        job_path = next(jobs_dir.glob("*.json"))
+        job_path.rename(jobs_dir / f"{job_path.stem}.{os.getppid()}.claimed")
+        assert JobQueue(jobs_dir).recover() == 0
+
+    def test_failing_job_is_reported_not_raised(self, tmp_path):
+        jobs = JobQueue(tmp_path / "jobs")
+        jobs.submit(MagicMock(side_effect=OSError("disk full")))
+        done = MagicMock()
+        jobs.submit(done)
+        jobs.flush()
+        done.assert_called_once()
+
+
+class TestReleaseStdout:
+    def test_pipe_reader_sees_eof(self, monkeypatch):
+        read_fd, write_fd = os.pipe()
+        writer = os.fdopen(write_fd, "w")
+        monkeypatch.setattr(sys, "stdout", writer)
+        writer.write("hello\n")
+        _release_stdout()
+        with os.fdopen(read_fd) as reader:
+            assert reader.read() == "hello\n"
+        writer.close()
+
+
+class TestMainPrintsFirst:
+    def test_transcript_is_printed_before_saving(self, mock_home, monkeypatch):
+        monkeypatch.delenv("HNS_BACKEND", raising=False)
+        write_wav(AudioRecorder(16000, 1)._get_audio_file_path(), silence(0.1))
+        printed_before_save = []
+
+        def fake_save(*args, **kwargs):
+            sys.stdout.flush()
+            printed_before_save.append(sys.stdout.buffer.getvalue().decode())
+
+        with (
+            patch("hns.cli._load_transcriber_in_background"),
+            patch("hns.cli._await_transcriber") as await_transcriber,
+            patch("hns.cli._daemon_serves", return_value=False),
+            patch("hns.cli.copy_to_clipboard"),
+            patch("hns.storage.save_recording", side_effect=fake_save),
+        ):
+            await_transcriber.return_value.transcribe.return_value = ("fresh text", 0.1)
+            await_transcriber.return_value._get_audio_duration.return_value = 0.1
+            await_transcriber.return_value.timings = None
+            result = CliRunner().invoke(main, ["--last", "--no-cache"])
+
+        assert result.exit_code == 0
+        assert printed_before_save == ["fresh text\n"]
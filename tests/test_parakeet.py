@@ -1,6 +1,8 @@
 import sys
+import wave
 from unittest.mock import MagicMock
 
+import numpy as np
 import pytest
 
 from hns.cli import ParakeetTranscriber
@@ -62,3 +64,68 @@ class TestResolveDevice:
         monkeypatch.setenv("HNS_DEVICE", "cuda")
         mock_ort.get_available_providers.return_value = ["CPUExecutionProvider"]
         assert _new()._resolve_device(None) == "cuda"
+
+
+class TestTranscribe:
+    def _transcriber(self, result):
+        t = _new()
+        t.model = MagicMock()
+        t.model.recognize.return_value = result
+        return t
+
+    def test_array_is_passed_to_model_unchanged(self):
+        t = self._transcriber("hello")
+        samples = (0.3 * np.sin(2 * np.pi * 220 * np.arange(16000) / 16000)).astype(np.float32)
+        text, _ = t.transcribe(samples, show_progress=False)
+        assert text == "hello"
+        assert t.model.recognize.call_args.args[0] is samples
+
+    def test_path_is_passed_as_string(self, tmp_path):
+        t = self._transcriber(" hello ")
+        t.transcribe(tmp_path / "audio.wav", show_progress=False)
+        assert t.model.recognize.call_args.args[0] == str(tmp_path / "audio.wav")
+
+    def test_empty_result_raises(self):
+        t = self._transcriber("")
+        with pytest.raises(RuntimeError, match="No speech detected"):
+            t.transcribe(np.zeros(10, dtype=np.float32), show_progress=False)
+
+    def test_duration_of_array(self):
+        assert _new()._get_audio_duration(np.zeros(8000, dtype=np.float32)) == 0.5
+
+
+class TestChunkedRecognition:
+    def _transcriber(self):
+        t = _new()
+        t.model = MagicMock()
+        t.model.recognize.side_effect = lambda audio, **kwargs: (
+            [f"chunk{i}" for i in range(len(audio))] if isinstance(audio, list) else "whole"
+        )
+        return t
+
+    def test_short_audio_is_recognized_in_one_call(self):
+        t = self._transcriber()
+        assert t._recognize_audio(np.zeros(16000 * 5, dtype=np.float32)) == "whole"
+
+    def test_long_audio_is_batched_in_bounded_chunks(self):
+        t = self._transcriber()
+        samples = np.random.default_rng(0).normal(0, 0.1, 16000 * 400).astype(np.float32)
+        t._recognize(samples)
+
+        batches = [call.args[0] for call in t.model.recognize.call_args_list]
+        assert all(len(batch) <= ParakeetTranscriber.BATCH_SIZE for batch in batches)
+        chunks = [chunk for batch in batches for chunk in batch]
+        assert all(len(chunk) <= ParakeetTranscriber.MAX_CHUNK_SECONDS * 16000 for chunk in chunks)
+        assert sum(len(chunk) for chunk in chunks) == len(samples)
+
+    def test_long_wav_file_is_streamed(self, tmp_path):
+        path = tmp_path / "long.wav"
+        with wave.open(str(path), "wb") as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(16000)
+            f.writeframes(np.zeros(16000 * 45, dtype=np.int16).tobytes())
+
+        t = self._transcriber()
+        assert t._recognize_audio(str(path)) == "chunk0 chunk1 chunk2"
+        assert t.model.recognize.call_args.kwargs["sample_rate"] == 16000
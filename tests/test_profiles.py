@@ -0,0 +1,180 @@
+import threading
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from hns.cli import DECODING_PROFILES, WhisperTranscriber, _resolve_decoding_profile, _write_config, main
+from hns.config import load_config
+from hns.daemon import TranscriptionDaemon, _daemon_serves, _get_daemon_socket_path, _transcribe_with_daemon
+from hns.recorder import AudioRecorder
+
+MEETING_PROFILE = {"base": "accurate", "beam_size": 10, "vad_parameters": {"min_silence_duration_ms": 1000}}
+
+
+@pytest.fixture(autouse=True)
+def no_profile_env(monkeypatch):
+    monkeypatch.delenv("HNS_PROFILE", raising=False)
+
+
+class TestResolveDecodingProfile:
+    def test_balanced_is_the_default_and_keeps_the_previous_settings(self):
+        name, options = _resolve_decoding_profile({}, None)
+        assert name == "balanced"
+        assert WhisperTranscriber.transcribe_options(None, options) == {
+            "beam_size": 5,
+            "vad_filter": True,
+            "vad_parameters": {
+                "min_silence_duration_ms": 500,
+                "speech_pad_ms": 400,
+                "threshold": 0.5,
+                "max_speech_duration_s": 29.0,
+            },
+        }
+
+    def test_option_then_environment_then_config(self, monkeypatch):
+        cfg = {"profile": "accurate"}
+        assert _resolve_decoding_profile(cfg, None)[0] == "accurate"
+        monkeypatch.setenv("HNS_PROFILE", "fast")
+        assert _resolve_decoding_profile(cfg, None)[0] == "fast"
+        assert _resolve_decoding_profile(cfg, "balanced")[0] == "balanced"
+
+    def test_custom_profile_extends_its_base(self):
+        name, options = _resolve_decoding_profile({"profiles": {"meeting": MEETING_PROFILE}}, "meeting")
+        assert name == "meeting"
+        assert options["beam_size"] == 10
+        assert options["best_of"] == DECODING_PROFILES["accurate"]["best_of"]
+        assert options["vad_parameters"] == {
+            **DECODING_PROFILES["accurate"]["vad_parameters"],
+            "min_silence_duration_ms": 1000,
+        }
+        assert "base" not in options
+
+    def test_builtin_profile_can_be_adjusted_in_config(self):
+        _, options = _resolve_decoding_profile({"profiles": {"fast": {"no_speech_threshold": 0.8}}}, "fast")
+        assert options["beam_size"] == 1
+        assert options["no_speech_threshold"] == 0.8
+        assert "no_speech_threshold" not in DECODING_PROFILES["fast"]
+
+    @pytest.mark.parametrize(
+        ("profiles", "name", "message"),
+        [
+            ({}, "turbo", "Unknown decoding profile 'turbo'"),
+            ({"meeting": {"base": "turbo"}}, "meeting", "unknown base 'turbo'"),
+            ({"meeting": {"beam_width": 3}}, "meeting", "Unknown setting"),
+            ({"meeting": {"vad_filter": False}}, "meeting", "vad_filter = false"),
+            ({"fast": {"vad_filter": False}}, "fast", "vad_filter = false"),
+        ],
+    )
+    def test_invalid_profiles_are_rejected(self, profiles, name, message):
+        with pytest.raises(ValueError, match=message):
+            _resolve_decoding_profile({"profiles": profiles}, name)
+
+
+class TestProfileDecoding:
+    def test_profile_options_reach_the_model(self):
+        t = WhisperTranscriber.__new__(WhisperTranscriber)
+        t.language = "en"
+        t.batch_threshold = 60
+        t.decoding_options = DECODING_PROFILES["fast"]
+        t.model = MagicMock()
+        t.model.transcribe.return_value = ([MagicMock(text="text")], None)
+        t._recognize_audio(np.zeros(16000, dtype=np.float32))
+
+        kwargs = t.model.transcribe.call_args.kwargs
+        assert kwargs["beam_size"] == 1
+        assert kwargs["temperature"] == 0.0
+        assert kwargs["condition_on_previous_text"] is False
+        assert kwargs["language"] == "en"
+
+    def test_options_are_copied(self):
+        options = WhisperTranscriber.transcribe_options(None, DECODING_PROFILES["fast"])
+        options["vad_parameters"]["threshold"] = 0.9
+        assert DECODING_PROFILES["fast"]["vad_parameters"]["threshold"] == 0.5
+
+
+class TestProfileOption:
+    @pytest.fixture
+    def run(self, mock_home, monkeypatch):
+        for name in ("HNS_BACKEND", "HNS_WHISPER_MODEL", "HNS_MODEL", "HNS_LANG"):
+            monkeypatch.delenv(name, raising=False)
+        AudioRecorder(16000, 1)._get_audio_file_path().write_bytes(b"RIFF fake audio")
+
+        def invoke(args):
+            transcriber = MagicMock()
+            transcriber.transcribe.return_value = ("text", 1.0)
+            transcriber._get_audio_duration.return_value = 2.0
+            transcriber.timings = None
+            with (
+                patch("hns.cli._create_transcriber", return_value=transcriber) as create,
+                patch("hns.cli._daemon_serves", return_value=False),
+                patch("hns.cli.copy_to_clipboard"),
+                patch("hns.storage.save_recording") as save,
+            ):
+                result = CliRunner().invoke(main, ["--last", "--no-cache", *args])
+            return result, create, save
+
+        return invoke
+
+    def test_profile_is_used_and_saved(self, run):
+        result, create, save = run(["--profile", "fast"])
+        assert result.exit_code == 0
+        assert create.call_args.kwargs["decoding_options"]["beam_size"] == 1
+        assert save.call_args.kwargs["extra_metadata"] == {"decoding_profile": "fast"}
+
+    def test_unknown_profile_fails(self, run):
+        result, create, _ = run(["--profile", "turbo"])
+        assert result.exit_code == 1
+        assert "Unknown decoding profile 'turbo'" in result.stderr
+        create.assert_not_called()
+
+    def test_parakeet_ignores_profiles(self, run):
+        result, create, save = run(["--backend", "parakeet", "--profile", "fast"])
+        assert result.exit_code == 0
+        assert "only applies to the Whisper backend" in result.stderr
+        assert create.call_args.kwargs["decoding_options"] is None
+        assert save.call_args.kwargs["extra_metadata"] is None
+
+
+class TestDaemonProfile:
+    def test_daemon_only_serves_its_profile(self, mock_home):
+        transcriber = MagicMock()
+        transcriber.model_name = "base"
+        transcriber.language = None
+        server = TranscriptionDaemon(_get_daemon_socket_path(), transcriber, "whisper", profile="fast")
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            assert _daemon_serves("whisper", "base", "fast")
+            assert not _daemon_serves("whisper", "base", "balanced")
+            assert _transcribe_with_daemon(mock_home / "audio.wav", "whisper", "base", None, "accurate") is None
+            transcriber.transcribe.assert_not_called()
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join(timeout=2)
+
+
+class TestWriteConfigProfiles:
+    def test_profile_tables_are_preserved(self, mock_home):
+        config_dir = mock_home / ".config" / "hns"
+        config_dir.mkdir(parents=True)
+        (config_dir / "config.toml").write_text(
+            'profile = "meeting"\n\n'
+            '[profiles.meeting]\nbase = "accurate"\nbeam_size = 10\ntemperature = [0.0, 0.2]\n\n'
+            "[profiles.meeting.vad_parameters]\nmin_silence_duration_ms = 1000\n"
+        )
+        before = load_config()
+        _write_config(backend="whisper", model=None, language=None, save_dir=None)
+        assert load_config() == {**before, "backend": "whisper"}
+
+    def test_config_command_sets_the_default_profile(self, mock_home):
+        result = CliRunner().invoke(main, ["config", "--profile", "accurate"])
+        assert result.exit_code == 0
+        assert load_config()["profile"] == "accurate"
+        assert "Decoding profile: accurate" in result.stderr
+
+        result = CliRunner().invoke(main, ["config", "--profile", "turbo"])
+        assert result.exit_code == 1
+        assert load_config()["profile"] == "accurate"
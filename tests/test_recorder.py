@@ -0,0 +1,277 @@
+import io
+import os
+import threading
+import time
+import wave
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from hns.audio import AudioRingBuffer, PolyphaseResampler, VoiceActivityGate
+from hns.recorder import AudioRecorder
+from tests.conftest import SAMPLE_RATE, silence, tone
+
+
+def _frames(start: int, count: int, channels: int = 1) -> np.ndarray:
+    return np.arange(start, start + count, dtype=np.float32).reshape(-1, 1).repeat(channels, axis=1)
+
+
+def _sine(frequency: float, rate: int, seconds: float, channels: int = 1) -> np.ndarray:
+    t = np.arange(int(seconds * rate)) / rate
+    return (0.3 * np.sin(2 * np.pi * frequency * t)).astype(np.float32).reshape(-1, 1).repeat(channels, axis=1)
+
+
+def _fake_sounddevice(native_rate: int, audio: np.ndarray, refuse_native: bool = False):
+    opened = []
+
+    class InputStream:
+        def __init__(self, samplerate, channels, callback, dtype):
+            if refuse_native and samplerate == native_rate:
+                raise RuntimeError("Invalid sample rate")
+            opened.append(samplerate)
+            self.callback = callback
+
+        def __enter__(self):
+            self.callback(audio, len(audio), None, None)
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    device = {"name": "Fake mic", "default_samplerate": float(native_rate)}
+    module = SimpleNamespace(InputStream=InputStream, query_devices=lambda kind=None: device)
+    return module, opened
+
+
+def _feed(gate: VoiceActivityGate, audio: np.ndarray, block_size: int = 800) -> np.ndarray:
+    kept = [gate.process(audio[start : start + block_size]) for start in range(0, len(audio), block_size)]
+    return np.concatenate(kept)
+
+
+class TestAudioRingBuffer:
+    def test_read_returns_written_frames(self):
+        ring = AudioRingBuffer(8, 1)
+        ring.write(_frames(0, 5))
+        np.testing.assert_array_equal(ring.read(), _frames(0, 5))
+
+    def test_read_empty(self):
+        assert len(AudioRingBuffer(8, 1).read()) == 0
+
+    def test_wraparound_preserves_order(self):
+        ring = AudioRingBuffer(8, 2)
+        ring.write(_frames(0, 6, 2))
+        ring.read()
+        ring.write(_frames(6, 6, 2))
+        np.testing.assert_array_equal(ring.read(), _frames(6, 6, 2))
+
+    def test_overflow_drops_and_counts_frames(self):
+        ring = AudioRingBuffer(8, 1)
+        assert ring.write(_frames(0, 5)) == 5
+        assert ring.write(_frames(5, 5)) == 3
+        assert ring.dropped_frames == 2
+        np.testing.assert_array_equal(ring.read(), _frames(0, 8))
+
+
+class TestAudioRecorderWriter:
+    def test_callback_frames_reach_wave_file(self, mock_home):
+        recorder = AudioRecorder(16000, 1)
+        recorder._prepare_capture()
+        block = np.full((160, 1), 0.5, dtype=np.float32)
+        recorder._audio_callback(block, 160, None, None)
+        recorder._audio_callback(block, 160, None, None)
+        recorder._drain_ring_buffer()
+        recorder._close_wave_file()
+
+        assert recorder.recording_frames == 320
+        with wave.open(str(recorder.audio_file_path), "rb") as f:
+            samples = np.frombuffer(f.readframes(f.getnframes()), dtype=np.int16)
+        assert len(samples) == 320
+        assert samples[0] == int(0.5 * 32767)
+
+    def test_writer_thread_drains_on_stop(self, mock_home):
+        received = []
+        recorder = AudioRecorder(16000, 2, on_audio=received.append)
+        recorder._prepare_capture()
+        recorder._start_writer()
+        recorder._audio_callback(np.ones((100, 2), dtype=np.float32), 100, None, None)
+        recorder._stop_writer()
+        recorder._close_wave_file()
+
+        assert recorder.recording_frames == 100
+        assert sum(len(block) for block in received) == 100
+        assert received[0].ndim == 1
+
+    def test_drained_audio_is_kept_in_memory_as_mono(self, mock_home):
+        recorder = AudioRecorder(16000, 2)
+        recorder._prepare_capture()
+        recorder._audio_callback(np.full((50, 2), [0.2, 0.4], dtype=np.float32), 50, None, None)
+        recorder._drain_ring_buffer()
+        recorder._close_wave_file()
+        captured = np.concatenate(recorder._captured_blocks)
+        assert captured.shape == (50,)
+        np.testing.assert_allclose(captured, 0.3)
+
+    def test_input_overflow_is_counted(self, mock_home):
+        recorder = AudioRecorder(16000, 1)
+        recorder._prepare_capture()
+
+        class Status:
+            input_overflow = True
+
+        recorder._audio_callback(np.zeros((10, 1), dtype=np.float32), 10, None, Status())
+        recorder._close_wave_file()
+        assert recorder.input_overflows == 1
+
+    def test_capture_replaces_last_recording_only_when_complete(self, mock_home):
+        recorder = AudioRecorder(16000, 1)
+        recorder.audio_file_path.write_bytes(b"previous")
+        linked = mock_home / "linked.wav"
+        linked.hardlink_to(recorder.audio_file_path)
+
+        recorder._prepare_capture()
+        recorder._audio_callback(np.zeros((10, 1), dtype=np.float32), 10, None, None)
+        recorder._drain_ring_buffer()
+        assert recorder.audio_file_path.read_bytes() == b"previous"
+        recorder._close_wave_file()
+
+        assert recorder.audio_file_path.read_bytes() != b"previous"
+        assert linked.read_bytes() == b"previous"  # replaced by rename, not truncated in place
+        assert list(recorder.audio_file_path.parent.glob(".*.partial")) == []
+
+    def test_cancelled_capture_keeps_last_recording(self, mock_home):
+        recorder = AudioRecorder(16000, 1)
+        recorder.audio_file_path.write_bytes(b"previous")
+        recorder._prepare_capture()
+        recorder._audio_callback(np.zeros((10, 1), dtype=np.float32), 10, None, None)
+        recorder._drain_ring_buffer()
+        recorder._close_wave_file(keep=False)
+        assert recorder.audio_file_path.read_bytes() == b"previous"
+        assert list(recorder.audio_file_path.parent.glob(".*.partial")) == []
+
+
+class TestVoiceActivityGate:
+    def test_keeps_speech_with_pre_roll_and_short_tail(self):
+        gate = VoiceActivityGate(SAMPLE_RATE, stop_seconds=1.0)
+        kept = _feed(gate, np.concatenate([silence(3.0, 1), tone(2.0, 1), silence(1.5, 1), tone(1.0, 1)]))
+        assert gate.started and gate.stopped
+        expected = VoiceActivityGate.PRE_ROLL_SECONDS + 2.0 + VoiceActivityGate.TAIL_SECONDS
+        assert len(kept) / SAMPLE_RATE == pytest.approx(expected, abs=0.05)
+
+    def test_pauses_shorter_than_stop_duration_are_kept(self):
+        gate = VoiceActivityGate(SAMPLE_RATE, stop_seconds=1.0)
+        kept = _feed(gate, np.concatenate([tone(1.0, 1), silence(0.6, 1), tone(1.0, 1), silence(0.2, 1)]))
+        assert not gate.stopped
+        assert len(kept) / SAMPLE_RATE == pytest.approx(2.6, abs=0.05)
+        assert len(gate.finish()) / SAMPLE_RATE == pytest.approx(0.18, abs=0.05)
+
+    def test_click_does_not_start_recording(self):
+        gate = VoiceActivityGate(SAMPLE_RATE)
+        kept = _feed(gate, np.concatenate([silence(1.0, 1), tone(0.03, 1), silence(1.0, 1)]))
+        assert not gate.started
+        assert len(kept) == 0
+        assert gate.finish() is None
+
+
+class TestAudioRecorderVadStop:
+    def test_only_speech_reaches_wave_file_and_gate_closes(self, mock_home):
+        recorder = AudioRecorder(SAMPLE_RATE, 2, vad_stop_seconds=0.5)
+        recorder._prepare_capture()
+        for part in (silence(2.0, 2), tone(1.0, 2), silence(1.0, 2)):
+            recorder._audio_callback(part, len(part), None, None)
+            recorder._drain_ring_buffer()
+        recorder._close_wave_file()
+
+        assert recorder._gate_closed.is_set()
+        assert recorder.recording_frames / SAMPLE_RATE == pytest.approx(1.6, abs=0.05)
+        with wave.open(str(recorder.audio_file_path), "rb") as f:
+            assert f.getnframes() == recorder.recording_frames
+
+    def test_wait_ignores_closed_stdin(self, mock_home, monkeypatch):
+        recorder = AudioRecorder(SAMPLE_RATE, 1, vad_stop_seconds=0.5)
+        recorder._prepare_capture()
+        monkeypatch.setattr("sys.stdin", io.StringIO(""))
+        threading.Timer(0.1, recorder._gate_closed.set).start()
+        recorder._wait_for_gate()
+        recorder._close_wave_file(keep=False)
+
+    def test_wait_gives_up_without_speech_or_terminal(self, mock_home, monkeypatch):
+        monkeypatch.setattr(AudioRecorder, "NO_SPEECH_TIMEOUT_SECONDS", 0.1)
+        monkeypatch.setattr("sys.stdin", io.StringIO(""))
+        recorder = AudioRecorder(SAMPLE_RATE, 1, vad_stop_seconds=0.5)
+        recorder._prepare_capture()
+        recorder._wait_for_gate()
+        recorder._close_wave_file(keep=False)
+        assert not recorder._gate_closed.is_set()
+        assert recorder.recording_frames == 0
+
+
+class TestPolyphaseResampler:
+    @pytest.mark.parametrize("input_rate", [48000, 44100, 22050])
+    def test_tone_keeps_frequency_and_level(self, input_rate):
+        resampler = PolyphaseResampler(input_rate, SAMPLE_RATE)
+        out = resampler.process(_sine(1000, input_rate, 1.0))[:, 0]
+        assert len(out) == SAMPLE_RATE
+        steady = out[1600:]
+        spectrum = np.abs(np.fft.rfft(steady * np.hanning(len(steady))))
+        assert np.fft.rfftfreq(len(steady), 1 / SAMPLE_RATE)[spectrum.argmax()] == pytest.approx(1000, abs=2)
+        assert np.sqrt(2 * np.mean(steady**2)) == pytest.approx(0.3, rel=0.01)
+
+    def test_frequencies_above_the_new_nyquist_are_removed(self):
+        out = PolyphaseResampler(48000, SAMPLE_RATE).process(_sine(11000, 48000, 1.0))[1600:]
+        assert 20 * np.log10(np.sqrt(2 * np.mean(out**2)) / 0.3) < -50
+
+    def test_block_size_does_not_change_the_output(self):
+        audio = _sine(440, 44100, 0.5, channels=2) + np.random.default_rng(0).normal(0, 0.01, (22050, 2))
+        whole = PolyphaseResampler(44100, SAMPLE_RATE, channels=2).process(audio.astype(np.float32))
+        resampler = PolyphaseResampler(44100, SAMPLE_RATE, channels=2)
+        blocks = [resampler.process(audio[start : start + 441].astype(np.float32)) for start in range(0, 22050, 441)]
+        np.testing.assert_allclose(np.concatenate(blocks), whole, atol=1e-6)
+
+    def test_a_minute_in_writer_blocks_keeps_its_length(self):
+        audio = _sine(440, 48000, 60.0)
+        resampler = PolyphaseResampler(48000, SAMPLE_RATE)
+        # 50 ms writer-stage blocks
+        frames = sum(len(resampler.process(audio[offset : offset + 2400])) for offset in range(0, len(audio), 2400))
+        assert frames == 60 * SAMPLE_RATE
+
+
+# CPU time depends on the machine, so this only runs when asked for (HNS_BENCHMARK=1)
+@pytest.mark.skipif(not os.environ.get("HNS_BENCHMARK"), reason="CPU-time benchmark; set HNS_BENCHMARK=1 to run")
+class TestPolyphaseResamplerBenchmark:
+    def test_cpu_cost_per_minute_of_audio(self):
+        audio = _sine(440, 48000, 60.0)
+        resampler = PolyphaseResampler(48000, SAMPLE_RATE)
+        start = time.process_time()
+        for offset in range(0, len(audio), 2400):  # 50 ms writer-stage blocks
+            resampler.process(audio[offset : offset + 2400])
+        # About 0.3 s on a laptop core: well under 1% of the minute it resamples
+        elapsed = time.process_time() - start
+        assert elapsed < 3.0, f"resampling a minute of 48 kHz audio took {elapsed:.2f} s of CPU"
+
+
+class TestAudioRecorderNativeRate:
+    def test_device_is_opened_at_native_rate_and_saved_at_16k(self, mock_home, monkeypatch):
+        module, opened = _fake_sounddevice(48000, _sine(1000, 48000, 1.5, channels=2))
+        monkeypatch.setattr("builtins.input", lambda: "")
+        recorder = AudioRecorder(SAMPLE_RATE, 2)
+        with patch.dict("sys.modules", {"sounddevice": module}):
+            recorder.record()
+
+        assert opened == [48000]
+        with wave.open(str(recorder.audio_file_path), "rb") as f:
+            assert f.getframerate() == SAMPLE_RATE
+            assert f.getnframes() == int(1.5 * SAMPLE_RATE)
+        assert recorder.samples.shape == (int(1.5 * SAMPLE_RATE),)
+
+    def test_falls_back_to_requested_rate_when_native_rate_is_refused(self, mock_home, monkeypatch):
+        module, opened = _fake_sounddevice(44100, tone(1.0, 1), refuse_native=True)
+        monkeypatch.setattr("builtins.input", lambda: "")
+        recorder = AudioRecorder(SAMPLE_RATE, 1)
+        with patch.dict("sys.modules", {"sounddevice": module}):
+            recorder.record()
+
+        assert opened == [SAMPLE_RATE]
+        assert recorder.resampler is None
+        assert recorder.recording_frames == SAMPLE_RATE
@@ -0,0 +1,164 @@
+import json
+import os
+import re
+import time
+import zlib
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from hns.cli import main
+from hns.search import EmbeddingIndex, RecordingIndex, _chunk_transcript
+from hns.timings import TranscriptTimings
+from tests.conftest import save_transcript
+
+DIM = 64
+
+
+class FakeEmbedder:
+    """Bag-of-words vectors: passages that share words with the query score highest."""
+
+    DEFAULT_MODEL = "fake"
+
+    def __init__(self, model_name=None):
+        self.model_name = model_name
+
+    def embed(self, texts):
+        vectors = np.zeros((len(texts), DIM), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for word in re.findall(r"\w+", text.lower()):
+                vectors[i, zlib.crc32(word.encode()) % DIM] += 1
+        return vectors
+
+    def embed_query(self, text):
+        return self.embed([text])[0]
+
+
+@pytest.fixture
+def save_dir(save_dir):
+    with patch("hns.cli.TranscriptEmbedder", FakeEmbedder):
+        yield save_dir
+
+
+class TestChunkTranscript:
+    def test_sentences_are_grouped_up_to_the_word_limit(self):
+        chunks = _chunk_transcript("One two three. Four five. Six seven eight nine.", max_words=5)
+        assert chunks == [(None, "One two three. Four five."), (None, "Six seven eight nine.")]
+
+    def test_long_sentences_are_split(self):
+        chunks = _chunk_transcript(" ".join(["word"] * 25), max_words=10)
+        assert [len(text.split()) for _, text in chunks] == [10, 10, 5]
+
+    def test_timed_segments_keep_their_start(self):
+        timings = TranscriptTimings([(0.0, 4.0, "a b c"), (4.0, 8.0, "d e f"), (8.0, 9.0, "g")])
+        assert _chunk_transcript("ignored", timings, max_words=4) == [(0.0, "a b c"), (4.0, "d e f g")]
+
+
+class TestEmbeddingIndex:
+    def test_quantization_preserves_similarity(self):
+        vectors = np.random.default_rng(0).standard_normal((50, 384)).astype(np.float32)
+        codes, scales = EmbeddingIndex.quantize(vectors)
+        assert codes.dtype == np.int8
+        normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.testing.assert_allclose(codes * scales[:, None], normalized, atol=0.01)
+
+    def test_search_ranks_100k_passages(self, tmp_path):
+        rng = np.random.default_rng(0)
+        query = rng.standard_normal(384).astype(np.float32)
+        with RecordingIndex(tmp_path) as index:
+            vectors = EmbeddingIndex(index)
+            vectors.reset("fake")
+            with index.conn:
+                index.conn.execute("INSERT INTO recordings (id, json_path, text) VALUES (1, 'a/a.json', 'text')")
+            for i in range(10):
+                batch = rng.standard_normal((10_000, 384)).astype(np.float32)
+                chunks = [(1, None, "passage")] * len(batch)
+                if i == 7:  # past the first scoring blocks
+                    batch[1234] = query * 3
+                    chunks[1234] = (1, None, "needle")
+                vectors.add(chunks, batch)
+            hits = vectors.search(query, limit=10)
+        assert len(hits) == 10
+        assert hits[0]["text"] == "needle"
+        assert hits[0]["score"] == pytest.approx(1.0, abs=0.01)
+        assert all(hit["score"] < 0.5 for hit in hits[1:])
+
+
+# Wall-clock time depends on the machine, so this only runs when asked for (HNS_BENCHMARK=1)
+@pytest.mark.skipif(not os.environ.get("HNS_BENCHMARK"), reason="timing benchmark; set HNS_BENCHMARK=1 to run")
+class TestEmbeddingIndexBenchmark:
+    def test_search_100k_passages_is_fast(self, tmp_path):
+        rng = np.random.default_rng(0)
+        with RecordingIndex(tmp_path) as index:
+            vectors = EmbeddingIndex(index)
+            vectors.reset("fake")
+            with index.conn:
+                index.conn.execute("INSERT INTO recordings (id, json_path, text) VALUES (1, 'a/a.json', 'text')")
+            for _ in range(10):
+                batch = rng.standard_normal((10_000, 384)).astype(np.float32)
+                vectors.add([(1, None, "passage")] * len(batch), batch)
+            query = rng.standard_normal(384).astype(np.float32)
+            vectors.search(query)
+            start = time.perf_counter()
+            hits = vectors.search(query, limit=10)
+            elapsed = time.perf_counter() - start
+        assert len(hits) == 10
+        assert elapsed < 0.1, f"searching 100k passages took {elapsed * 1000:.0f} ms"
+
+
+class TestSemanticSearch:
+    def test_index_embeddings_backfills_and_ask_finds_passages(self, save_dir):
+        save_transcript(save_dir, "The quarterly pricing review moved to Thursday.")
+        save_transcript(save_dir, "Remember to water the garden tomato plants.")
+        result = CliRunner().invoke(main, ["index", "--embeddings"])
+        assert result.exit_code == 0, result.output
+        assert "Embedded 2 recording(s)" in result.stderr
+
+        result = CliRunner().invoke(main, ["ask", "garden", "tomato", "--json", "--limit", "1"])
+        assert result.exit_code == 0
+        assert json.loads(result.stdout)["text"] == "Remember to water the garden tomato plants."
+
+    def test_new_recordings_are_embedded_by_the_next_search(self, save_dir):
+        CliRunner().invoke(main, ["index", "--embeddings"])
+        timings = TranscriptTimings([(0.0, 2.0, "Hello there."), (75.0, 80.0, "Budget approved for hiring.")])
+        with patch("hns.cli.TranscriptEmbedder", side_effect=AssertionError("saving loaded the embedding model")):
+            save_transcript(save_dir, "Hello there. Budget approved for hiring.", timings=timings)
+        with RecordingIndex(save_dir) as index:
+            assert index.conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0] == 0
+
+        result = CliRunner().invoke(main, ["search", "--semantic", "budget", "hiring"])
+        assert result.exit_code == 0
+        assert "Embedded 1 new recording(s)" in result.stderr
+        assert "Budget approved" in result.stdout
+        assert "@ 00:00" in result.stdout
+
+    def test_deleted_recordings_are_dropped_and_compacted(self, save_dir):
+        save_transcript(save_dir, "Alpha release notes.")
+        save_transcript(save_dir, "Beta release notes.")
+        CliRunner().invoke(main, ["index", "--embeddings"])
+        for json_path in save_dir.glob("*alpha*/*.json"):
+            json_path.unlink()
+
+        result = CliRunner().invoke(main, ["index"])
+        assert result.exit_code == 0
+        with RecordingIndex(save_dir) as index:
+            vectors = EmbeddingIndex(index)
+            assert len(vectors._load()[0]) == 1
+            hits = vectors.search(FakeEmbedder().embed_query("alpha release"))
+        assert [hit["text"] for hit in hits] == ["Beta release notes."]
+        assert len(list(save_dir.glob("embeddings.*"))) == 2
+
+    def test_language_filter(self, save_dir):
+        save_transcript(save_dir, "Release planning meeting.", language="en")
+        save_transcript(save_dir, "Release planning reunion.", language="fr")
+        CliRunner().invoke(main, ["index", "--embeddings"])
+        result = CliRunner().invoke(main, ["ask", "release", "planning", "--language", "fr", "--json"])
+        assert [json.loads(line)["language"] for line in result.stdout.splitlines()] == ["fr"]
+
+    def test_ask_without_embeddings_explains_setup(self, save_dir):
+        save_transcript(save_dir, "Something.")
+        result = CliRunner().invoke(main, ["ask", "something"])
+        assert result.exit_code == 1
+        assert "hns index --embeddings" in result.stderr
@@ -0,0 +1,141 @@
+import json
+import os
+import subprocess
+import sys
+import wave
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from hns.cli import SessionTranscription
+from hns.recorder import AudioRecorder
+from hns.storage import JobQueue
+from tests.conftest import SAMPLE_RATE, silence, tone
+
+
+def _capture(recorder: AudioRecorder, audio: np.ndarray, block_size: int = 800):
+    for start in range(0, len(audio), block_size):
+        block = audio[start : start + block_size]
+        recorder._audio_callback(block, len(block), None, None)
+        recorder._drain_ring_buffer()
+
+
+class TestSegmentedCapture:
+    def test_segments_are_cut_at_pauses_and_joined(self, mock_home):
+        closed = []
+        recorder = AudioRecorder(SAMPLE_RATE, 1, segment_seconds=1.0, on_segment=lambda *args: closed.append(args))
+        recorder._prepare_capture()
+        _capture(recorder, np.concatenate([tone(1.5, 1), silence(0.5, 1), tone(0.5, 1), silence(0.1, 1), tone(0.5, 1)]))
+        assert len(closed) == 1
+        recorder._close_wave_file()
+
+        assert [path.name for path, _ in closed] == ["segment_0001.wav", "segment_0002.wav"]
+        assert [start for _, start in closed] == [0.0, pytest.approx(1.8, abs=0.05)]
+        assert recorder._captured_blocks == []
+        with wave.open(str(recorder.audio_file_path), "rb") as f:
+            assert f.getnframes() == recorder.recording_frames == int(3.1 * SAMPLE_RATE)
+        segment_frames = []
+        for path, _ in closed:
+            with wave.open(str(path), "rb") as f:
+                segment_frames.append(f.getnframes())
+        assert sum(segment_frames) == recorder.recording_frames
+
+    def test_continuous_speech_is_cut_after_the_overrun(self, mock_home, monkeypatch):
+        monkeypatch.setattr(AudioRecorder, "SEGMENT_MAX_OVERRUN_SECONDS", 0.5)
+        closed = []
+        recorder = AudioRecorder(SAMPLE_RATE, 1, segment_seconds=1.0, on_segment=lambda *args: closed.append(args))
+        recorder._prepare_capture()
+        _capture(recorder, tone(3.2, 1))
+        recorder._close_wave_file()
+        assert [start for _, start in closed] == [0.0, 1.5, 3.0]
+
+    def test_cancelled_session_is_removed(self, mock_home):
+        recorder = AudioRecorder(SAMPLE_RATE, 1, segment_seconds=1.0)
+        recorder._prepare_capture()
+        _capture(recorder, tone(0.5, 1))
+        recorder._close_wave_file(keep=False)
+        assert not recorder.session_dir.exists()
+        assert not recorder.audio_file_path.exists()
+
+
+class TestSessionTranscription:
+    def _segments(self, tmp_path, count):
+        return [(tmp_path / f"segment_{i:04d}.wav", 300.0 * (i - 1)) for i in range(1, count + 1)]
+
+    def test_segments_are_appended_to_the_running_transcript(self, tmp_path):
+        transcriber = MagicMock()
+        transcriber._recognize.side_effect = ["Welcome everyone.", "", "Let's wrap up."]
+        session = SessionTranscription(transcriber)
+        session.start()
+        for segment in self._segments(tmp_path, 3):
+            session.add_segment(*segment)
+        text, _ = session.finish()
+
+        assert text == "Welcome everyone. Let's wrap up."
+        assert (tmp_path / SessionTranscription.TRANSCRIPT_NAME).read_text() == "Welcome everyone.\nLet's wrap up.\n"
+        prompts = [call.kwargs["initial_prompt"] for call in transcriber._recognize.call_args_list]
+        assert prompts == [None, "Welcome everyone.", "Welcome everyone."]
+
+    def test_timings_are_offset_by_segment_start(self, tmp_path):
+        transcriber = MagicMock()
+
+        def recognize(path, initial_prompt=None, timings=None):
+            timings.add_segment(1.0, 2.0, path)
+            return path
+
+        transcriber._recognize.side_effect = recognize
+        session = SessionTranscription(transcriber)
+        session.start()
+        for segment in self._segments(tmp_path, 2):
+            session.add_segment(*segment)
+        session.finish()
+        assert [start for start, _, _ in session.timings.segments] == [1.0, 301.0]
+
+    def test_decode_error_is_raised_on_finish(self, tmp_path):
+        transcriber = MagicMock()
+        transcriber._recognize.side_effect = RuntimeError("model exploded")
+        session = SessionTranscription(transcriber)
+        session.start()
+        session.add_segment(*self._segments(tmp_path, 1)[0])
+        with pytest.raises(RuntimeError, match="model exploded"):
+            session.finish()
+
+
+class TestSessionRecovery:
+    def _crash(self, recorder: AudioRecorder):
+        """Leave the session as a killed process would: the last segment's header is never finalized."""
+        recorder.wave_file._file.flush()
+        dead = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True, text=True)
+        (recorder.session_dir / AudioRecorder.SESSION_OWNER_NAME).write_text(dead.stdout.strip())
+
+    def test_interrupted_session_is_saved_with_its_partial_transcript(self, mock_home):
+        recorder = AudioRecorder(SAMPLE_RATE, 1, segment_seconds=1.0)
+        recorder._prepare_capture()
+        _capture(recorder, np.concatenate([tone(1.5, 1), silence(0.5, 1), tone(0.8, 1)]))
+        assert len(recorder.segment_paths) == 2
+        (recorder.session_dir / SessionTranscription.TRANSCRIPT_NAME).write_text("Welcome everyone.\n")
+        self._crash(recorder)
+
+        jobs = JobQueue()
+        assert SessionTranscription.recover(jobs, mock_home / "recordings", "wav") == 1
+        jobs.flush()
+
+        assert not recorder.session_dir.exists()
+        [metadata_path] = (mock_home / "recordings").glob("*/*.json")
+        metadata = json.loads(metadata_path.read_text())
+        assert metadata["text"] == "Welcome everyone."
+        assert metadata["recovered_session"] is True
+        assert metadata["audio_duration_seconds"] == pytest.approx(2.8, abs=0.01)
+        with wave.open(str(metadata_path.with_suffix(".wav")), "rb") as f:
+            assert f.getnframes() == recorder.recording_frames
+
+    def test_running_session_is_left_alone(self, mock_home):
+        recorder = AudioRecorder(SAMPLE_RATE, 1, segment_seconds=1.0)
+        recorder._prepare_capture()
+        _capture(recorder, tone(0.5, 1))
+        assert (recorder.session_dir / AudioRecorder.SESSION_OWNER_NAME).read_text() == str(os.getpid())
+
+        assert SessionTranscription.recover(JobQueue(), mock_home / "recordings", "wav") == 0
+        assert recorder.session_dir.exists()
+        recorder._close_wave_file()
@@ -0,0 +1,155 @@
+import os
+import time
+import tracemalloc
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from hns.audio import PackedSpeech, _recognize_packed
+from hns.cli import DECODING_PROFILES, ParakeetTranscriber, WhisperTranscriber
+from hns.timings import TranscriptTimings
+from tests.conftest import SAMPLE_RATE, silence, tone, write_wav
+
+
+def _meeting() -> np.ndarray:
+    # Speech at 2-3 s and 3.3-4.3 s (one region, the pause is short), then at 10-11 s
+    return np.concatenate([silence(2), tone(1), silence(0.3), tone(1), silence(5.7), tone(1), silence(3)])
+
+
+class TestPackedSpeech:
+    def test_regions_are_padded_and_short_pauses_kept(self):
+        regions = PackedSpeech.detect(_meeting()) / SAMPLE_RATE
+        assert regions.shape == (2, 2)
+        np.testing.assert_allclose(regions, [[1.8, 4.5], [9.8, 11.2]], atol=0.05)
+
+    def test_packed_audio_maps_back_to_original_time(self):
+        packed = PackedSpeech(_meeting())
+        assert len(packed.audio) / SAMPLE_RATE == pytest.approx(2.7 + PackedSpeech.GAP_SECONDS + 1.4, abs=0.1)
+        second_region = packed.packed_starts[1]
+        assert packed.to_original(0.5) == pytest.approx(packed.original_starts[0] + 0.5)
+        assert packed.to_original(second_region + 0.4) == pytest.approx(packed.original_starts[1] + 0.4)
+        np.testing.assert_allclose(packed.to_original(np.array([0.0, second_region])), packed.original_starts)
+
+    def test_quiet_speech_over_a_low_noise_floor_is_kept(self):
+        noise = np.random.default_rng(0).normal(0, 0.0003, 6 * SAMPLE_RATE).astype(np.float32)
+        noise[2 * SAMPLE_RATE : 3 * SAMPLE_RATE] += tone(1, amplitude=0.006)  # about -47 dBFS
+        regions = PackedSpeech.detect(noise) / SAMPLE_RATE
+        np.testing.assert_allclose(regions, [[1.8, 3.2]], atol=0.05)
+
+    def test_every_region_of_an_hour_is_found(self):
+        audio = np.tile(np.concatenate([tone(4), silence(2)]), 600)
+        regions = PackedSpeech.detect(audio)
+        assert len(regions) == 600
+
+
+# CPU time depends on the machine, so this only runs when asked for (HNS_BENCHMARK=1)
+@pytest.mark.skipif(not os.environ.get("HNS_BENCHMARK"), reason="CPU-time benchmark; set HNS_BENCHMARK=1 to run")
+class TestPackedSpeechBenchmark:
+    def test_detection_of_an_hour_is_fast(self):
+        audio = np.tile(np.concatenate([tone(4), silence(2)]), 600)
+        start = time.process_time()
+        PackedSpeech.detect(audio)
+        elapsed = time.process_time() - start
+        assert elapsed < 2.0, f"finding the speech in an hour of audio took {elapsed:.2f} s of CPU"
+
+
+class TestRecognizePacked:
+    def test_backend_sees_speech_only_and_timings_are_restored(self):
+        received = []
+
+        def recognize(audio, initial_prompt=None, timings=None):
+            received.append(audio)
+            timings.add_segment(0.2, 2.5, "first")
+            timings.add_segment(3.0, 3.5, "second")  # the second region starts at 2.8 s in the packed audio
+            timings.add_word(3.1, 3.3, "second")
+            return "first second"
+
+        timings = TranscriptTimings()
+        timings.offset = 100.0
+        assert _recognize_packed(recognize, _meeting(), timings=timings) == "first second"
+        assert len(received[0]) < len(_meeting()) / 2
+        starts = [start for start, _, _ in timings.segments]
+        assert starts == [pytest.approx(102.0, abs=0.05), pytest.approx(110.0, abs=0.05)]
+        assert timings.words[0][0] == pytest.approx(110.1, abs=0.05)
+
+    def test_audio_without_detected_speech_is_left_to_the_backend(self):
+        recognize = MagicMock(return_value="")
+        audio = silence(30)
+        assert _recognize_packed(recognize, audio) == ""
+        assert recognize.call_args.args[0] is audio
+
+    def test_quiet_speech_over_noise_reaches_the_backend(self):
+        rng = np.random.default_rng(0)
+        audio = tone(20, amplitude=0.009) + rng.normal(0, 0.003, 20 * SAMPLE_RATE).astype(np.float32)
+        recognize = MagicMock(return_value="quiet words")
+        assert _recognize_packed(recognize, audio) == "quiet words"
+        assert recognize.call_args.args[0] is audio
+
+    def test_audio_with_little_silence_is_passed_through(self):
+        recognize = MagicMock(return_value="text")
+        audio = tone(10)
+        _recognize_packed(recognize, audio)
+        assert recognize.call_args.args[0] is audio
+
+    def test_file_with_little_silence_is_decoded_once(self, tmp_path):
+        recognize = MagicMock(return_value="text")
+        _recognize_packed(recognize, write_wav(tmp_path / "speech.wav", tone(10)))
+        samples = recognize.call_args.args[0]
+        assert isinstance(samples, np.ndarray)
+        assert len(samples) == 10 * SAMPLE_RATE
+
+    def test_long_files_are_left_to_the_backend(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(PackedSpeech, "MAX_FILE_SECONDS", 10.0)
+        path = write_wav(tmp_path / "meeting.wav", _meeting())
+        recognize = MagicMock(return_value="text")
+        _recognize_packed(recognize, path)
+        assert recognize.call_args.args[0] == path
+
+    def test_loading_and_packing_holds_about_two_copies(self, tmp_path):
+        minute = np.tile(_meeting(), 4)
+        path = write_wav(tmp_path / "meeting.wav", minute)
+        tracemalloc.start()
+        try:
+            packed = PackedSpeech(PackedSpeech.read(path))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert len(packed.audio) < len(minute) / 2
+        assert peak < 2.5 * minute.nbytes
+
+    def test_whisper_skips_its_own_vad_on_packed_audio(self):
+        t = WhisperTranscriber.__new__(WhisperTranscriber)
+        t.language = None
+        t.batch_threshold = 600
+        t.model = MagicMock()
+        t.model.transcribe.return_value = ([MagicMock(text="text")], None)
+        t._recognize(_meeting())
+        assert t.model.transcribe.call_args.kwargs["vad_filter"] is False
+        t._recognize(tone(10))
+        assert t.model.transcribe.call_args.kwargs["vad_filter"] is True
+
+    def test_whisper_profiles_with_tuned_vad_see_all_the_audio(self):
+        t = WhisperTranscriber.__new__(WhisperTranscriber)
+        t.language = None
+        t.batch_threshold = 600
+        t.decoding_options = DECODING_PROFILES["accurate"]
+        t.model = MagicMock()
+        t.model.transcribe.return_value = ([MagicMock(text="text")], None)
+        audio = _meeting()
+        t._recognize(audio)
+        assert t.model.transcribe.call_args.args[0] is audio
+        kwargs = t.model.transcribe.call_args.kwargs
+        assert kwargs["vad_filter"] is True
+        assert kwargs["vad_parameters"]["threshold"] == 0.35
+
+    def test_parakeet_only_recognizes_speech(self, tmp_path):
+        path = write_wav(tmp_path / "meeting.wav", np.tile(_meeting(), 3))
+        transcriber = ParakeetTranscriber.__new__(ParakeetTranscriber)
+        transcriber.model = MagicMock()
+        transcriber.model.recognize.return_value = "hello"
+
+        text, _ = transcriber.transcribe(path, show_progress=False)
+        assert text == "hello"
+        audio = transcriber.model.recognize.call_args.args[0]
+        assert len(audio) < 0.4 * 3 * len(_meeting())
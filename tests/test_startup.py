@@ -0,0 +1,86 @@
+"""Cold-start checks for lightweight commands, measured with `python -X importtime`."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Only the record/transcribe path needs these; lightweight commands must not import them
+HEAVY_MODULES = {
+    "numpy",
+    "sounddevice",
+    "pyperclip",
+    "ctranslate2",
+    "faster_whisper",
+    "onnx_asr",
+    "onnxruntime",
+    "av",
+    "fastembed",
+    "pyarrow",
+}
+
+# Wall-clock budgets depend on the machine, so they only run when asked for (HNS_STARTUP_BUDGET=1).
+# The heavy-module checks above them are what guard startup on every run.
+IMPORT_BUDGET_MS = 150
+COMMAND_BUDGET_MS = 250
+
+LIGHTWEIGHT_COMMANDS = {
+    "list-models": ["--list-models"],
+    "config-show": ["config", "--show"],
+    "help": ["--help"],
+}
+
+
+def _import_profile(code: str, home) -> list[tuple[str, int, int]]:
+    """Run `code` under -X importtime and return (module, nesting depth, cumulative microseconds) per import."""
+    env = {**os.environ, "HOME": str(home), "USERPROFILE": str(home)}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, env=env, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+
+    profile = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        profile.append((name.strip(), depth, int(cumulative)))
+    return profile
+
+
+def _run_command_code(args: list[str]) -> str:
+    return f"from hns.cli import main; main({args!r}, standalone_mode=False)"
+
+
+def _total_ms(profile: list[tuple[str, int, int]]) -> float:
+    return sum(cumulative for _, depth, cumulative in profile if depth == 0) / 1000
+
+
+def _heavy_imports(profile: list[tuple[str, int, int]]) -> set[str]:
+    return {name for name, _, _ in profile if name.split(".")[0] in HEAVY_MODULES}
+
+
+class TestLazyImports:
+    def test_module_import_is_lightweight(self, tmp_path):
+        profile = _import_profile("import hns.cli", tmp_path)
+        imported = {name.split(".")[0] for name, _, _ in profile}
+        assert not _heavy_imports(profile)
+        assert "rich" not in imported
+
+    @pytest.mark.parametrize("args", LIGHTWEIGHT_COMMANDS.values(), ids=LIGHTWEIGHT_COMMANDS.keys())
+    def test_lightweight_commands_skip_heavy_modules(self, tmp_path, args):
+        assert not _heavy_imports(_import_profile(_run_command_code(args), tmp_path))
+
+
+@pytest.mark.skipif(not os.environ.get("HNS_STARTUP_BUDGET"), reason="timing budget; set HNS_STARTUP_BUDGET=1 to run")
+class TestStartupBudget:
+    def test_module_import_within_budget(self, tmp_path):
+        best_ms = min(_total_ms(_import_profile("import hns.cli", tmp_path)) for _ in range(3))
+        assert best_ms < IMPORT_BUDGET_MS, f"importing hns.cli took {best_ms:.0f} ms (budget {IMPORT_BUDGET_MS} ms)"
+
+    @pytest.mark.parametrize("args", LIGHTWEIGHT_COMMANDS.values(), ids=LIGHTWEIGHT_COMMANDS.keys())
+    def test_lightweight_commands_within_budget(self, tmp_path, args):
+        best_ms = min(_total_ms(_import_profile(_run_command_code(args), tmp_path)) for _ in range(3))
+        assert best_ms < COMMAND_BUDGET_MS, f"hns {' '.join(args)} spent {best_ms:.0f} ms importing"
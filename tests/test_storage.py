@@ -0,0 +1,81 @@
+import json
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from hns.files import _write_text_atomic
+from hns.storage import save_recording
+
+RECORDED_AT = datetime(2026, 2, 22, 10, 30)
+
+
+def _save(tmp_path, text="Hello world, this is a test."):
+    source = tmp_path / "last_recording.wav"
+    if not source.exists():
+        source.write_bytes(b"RIFF audio")
+    save_recording(source, text, "base", "en", 3.2, 1.1, tmp_path / "recs", RECORDED_AT)
+    return source
+
+
+class TestSaveRecordingPersistence:
+    def test_wav_is_hard_linked_not_copied(self, tmp_path):
+        source = _save(tmp_path)
+        saved = next((tmp_path / "recs").glob("*/*.wav"))
+        assert saved.stat().st_ino == source.stat().st_ino
+
+    def test_falls_back_to_copy_across_filesystems(self, tmp_path):
+        with patch("hns.files.os.link", side_effect=OSError("Invalid cross-device link")):
+            source = _save(tmp_path)
+        saved = next((tmp_path / "recs").glob("*/*.wav"))
+        assert saved.read_bytes() == source.read_bytes()
+        assert saved.stat().st_ino != source.stat().st_ino
+
+    def test_same_day_same_words_do_not_overwrite(self, tmp_path):
+        _save(tmp_path, "Hello world, this is a test.")
+        _save(tmp_path, "Hello world, this is a test again.")
+        _save(tmp_path, "Hello world, this is a test once more.")
+        folders = sorted(p.name for p in (tmp_path / "recs").iterdir() if p.is_dir())
+        base = "2026_02_22_hello_world_this_is_a"
+        assert folders == [base, f"{base}_2", f"{base}_3"]
+
+        metadata = json.loads((tmp_path / "recs" / f"{base}_2" / f"{base}_2.json").read_text())
+        assert metadata["text"] == "Hello world, this is a test again."
+        assert metadata["audio_file"] == f"{base}_2.wav"
+        assert (tmp_path / "recs" / f"{base}_2" / f"{base}_2.wav").exists()
+
+    def test_extra_metadata_is_stored(self, tmp_path):
+        source = tmp_path / "last_recording.wav"
+        source.write_bytes(b"RIFF audio")
+        draft = {"text": "Hello word.", "model": "base", "transcription_time_seconds": 0.4}
+        save_recording(
+            source,
+            "Hello world.",
+            "large-v3",
+            "en",
+            3.2,
+            1.1,
+            tmp_path / "recs",
+            RECORDED_AT,
+            extra_metadata={"draft": draft},
+        )
+        metadata = json.loads(next((tmp_path / "recs").glob("*/*.json")).read_text())
+        assert metadata["text"] == "Hello world."
+        assert metadata["draft"] == draft
+
+
+class TestWriteTextAtomic:
+    def test_replaces_content(self, tmp_path):
+        path = tmp_path / "data.json"
+        path.write_text("old")
+        _write_text_atomic(path, "new")
+        assert path.read_text() == "new"
+        assert [p.name for p in tmp_path.iterdir()] == ["data.json"]
+
+    def test_failed_write_keeps_old_content_and_no_temp_file(self, tmp_path):
+        path = tmp_path / "data.json"
+        path.write_text("old")
+        with patch("pathlib.Path.replace", side_effect=OSError("disk full")), pytest.raises(OSError):
+            _write_text_atomic(path, "new")
+        assert path.read_text() == "old"
+        assert [p.name for p in tmp_path.iterdir()] == ["data.json"]
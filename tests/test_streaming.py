@@ -0,0 +1,98 @@
+from concurrent.futures import Future
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from hns.audio import SpeechSegmenter
+from hns.cli import StreamingTranscription
+from tests.conftest import SAMPLE_RATE, silence, tone
+
+
+def _feed_in_blocks(segmenter: SpeechSegmenter, audio: np.ndarray, block_size: int = 1024) -> list:
+    segments = []
+    for start in range(0, len(audio), block_size):
+        segments.extend(segmenter.feed(audio[start : start + block_size]))
+    return segments
+
+
+class TestSpeechSegmenter:
+    def test_pause_closes_segment(self):
+        segmenter = SpeechSegmenter(SAMPLE_RATE)
+        audio = np.concatenate([tone(1.0), silence(1.0), tone(1.0)])
+        segments = _feed_in_blocks(segmenter, audio)
+        assert len(segments) == 1
+        assert segmenter.flush() is not None
+
+    def test_short_pause_does_not_split(self):
+        segmenter = SpeechSegmenter(SAMPLE_RATE)
+        audio = np.concatenate([tone(1.0), silence(0.2), tone(1.0)])
+        assert _feed_in_blocks(segmenter, audio) == []
+        tail = segmenter.flush()
+        assert len(tail) >= len(audio) - segmenter.frame_length
+
+    def test_silence_only_produces_nothing(self):
+        segmenter = SpeechSegmenter(SAMPLE_RATE)
+        assert _feed_in_blocks(segmenter, silence(5.0)) == []
+        assert segmenter.flush() is None
+
+    def test_leading_silence_is_trimmed_to_pre_roll(self):
+        segmenter = SpeechSegmenter(SAMPLE_RATE)
+        segments = _feed_in_blocks(segmenter, np.concatenate([silence(10.0), tone(1.0), silence(1.0)]))
+        assert len(segments) == 1
+        assert len(segments[0]) < 3 * SAMPLE_RATE
+
+    def test_continuous_speech_is_cut_at_max_length(self):
+        segmenter = SpeechSegmenter(SAMPLE_RATE)
+        segments = _feed_in_blocks(segmenter, tone(60.0))
+        assert len(segments) == 2
+        assert all(len(s) <= SpeechSegmenter.MAX_SEGMENT_SECONDS * SAMPLE_RATE for s in segments)
+
+
+class TestStreamingTranscription:
+    def _transcriber(self, texts):
+        transcriber = MagicMock()
+        transcriber._recognize.side_effect = texts
+        return transcriber
+
+    def test_segments_are_joined_in_order(self):
+        transcriber = self._transcriber(["hello there.", "general kenobi."])
+        streaming = StreamingTranscription(transcriber, SAMPLE_RATE)
+        streaming.start()
+        streaming.feed(np.concatenate([tone(1.0), silence(1.0)]))
+        streaming.feed(tone(1.0))
+        text, _ = streaming.finish()
+        assert text == "hello there. general kenobi."
+        assert transcriber._recognize.call_count == 2
+
+    def test_previous_segment_is_used_as_prompt(self):
+        transcriber = self._transcriber(["first.", "second."])
+        streaming = StreamingTranscription(transcriber, SAMPLE_RATE)
+        streaming.start()
+        streaming.feed(np.concatenate([tone(1.0), silence(1.0), tone(1.0)]))
+        streaming.finish()
+        prompts = [call.kwargs["initial_prompt"] for call in transcriber._recognize.call_args_list]
+        assert prompts == [None, "first."]
+
+    def test_waits_for_transcriber_future(self):
+        future = Future()
+        streaming = StreamingTranscription(future, SAMPLE_RATE)
+        streaming.start()
+        streaming.feed(np.concatenate([tone(1.0), silence(1.0)]))
+        future.set_result(self._transcriber(["loaded late."]))
+        text, _ = streaming.finish()
+        assert text == "loaded late."
+
+    def test_no_speech_raises(self):
+        streaming = StreamingTranscription(self._transcriber([]), SAMPLE_RATE)
+        streaming.start()
+        streaming.feed(silence(2.0))
+        with pytest.raises(RuntimeError, match="No speech detected"):
+            streaming.finish()
+
+    def test_decode_error_is_raised_on_finish(self):
+        streaming = StreamingTranscription(self._transcriber(RuntimeError("model exploded")), SAMPLE_RATE)
+        streaming.start()
+        streaming.feed(np.concatenate([tone(1.0), silence(1.0), tone(1.0)]))
+        with pytest.raises(RuntimeError, match="model exploded"):
+            streaming.finish()
@@ -0,0 +1,126 @@
+import json
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from hns.audio import SpeechSegmenter
+from hns.cli import ParakeetTranscriber, WhisperTranscriber, main
+from hns.config import get_default_save_dir
+from hns.storage import save_recording
+from hns.timings import TranscriptTimings
+from tests.conftest import SAMPLE_RATE, silence, write_wav
+
+
+def _timings():
+    timings = TranscriptTimings()
+    timings.add_segment(0.0, 2.5, "Good morning everyone.")
+    timings.add_segment(2.5, 6.0, "Let's review the billing service.")
+    timings.add_word(2.5, 2.9, "Let's")
+    return timings
+
+
+class TestTranscriptTimings:
+    def test_save_and_load_round_trip(self, tmp_path):
+        path = tmp_path / f"note{TranscriptTimings.SUFFIX}"
+        _timings().save(path)
+        loaded = TranscriptTimings.load(path)
+        assert [text for _, _, text in loaded.segments] == [
+            "Good morning everyone.",
+            "Let's review the billing service.",
+        ]
+        assert loaded.segments[1][:2] == pytest.approx((2.5, 6.0))
+        assert loaded.words == [pytest.approx((2.5, 2.9, "Let's"))]
+        with np.load(path) as data:
+            assert data["segment_start"].dtype == np.float32
+
+    def test_tokens_are_grouped_into_words(self):
+        timings = TranscriptTimings()
+        timings.offset = 10.0
+        timings.add_tokens([" he", "llo", " wor", "ld"], [0.0, 0.2, 0.5, 0.7], 1.0)
+        assert timings.words == [(10.0, 10.5, "hello"), (10.5, 11.0, "world")]
+
+    def test_find_returns_first_matching_segment(self):
+        timings = _timings()
+        assert timings.find(["BILLING"]) == 2.5
+        assert timings.find(["invoice"]) is None
+
+
+class TestBackendTimings:
+    def test_whisper_records_segments_and_words(self):
+        transcriber = WhisperTranscriber.__new__(WhisperTranscriber)
+        transcriber.language = None
+        transcriber.batch_threshold = WhisperTranscriber.DEFAULT_BATCH_THRESHOLD_SECONDS
+        transcriber.word_timestamps = True
+        transcriber.model = MagicMock()
+        word = SimpleNamespace(start=1.0, end=1.4, word=" hello")
+        segments = [SimpleNamespace(start=1.0, end=2.0, text=" hello there", words=[word])]
+        transcriber.model.transcribe.return_value = (iter(segments), None)
+        timings = TranscriptTimings()
+
+        assert transcriber._recognize_audio(np.zeros(SAMPLE_RATE, dtype=np.float32), timings=timings) == "hello there"
+        assert transcriber.model.transcribe.call_args.kwargs["word_timestamps"] is True
+        assert timings.segments == [(1.0, 2.0, "hello there")]
+        assert timings.words == [(1.0, 1.4, "hello")]
+
+    def test_parakeet_offsets_chunks(self):
+        transcriber = ParakeetTranscriber.__new__(ParakeetTranscriber)
+        transcriber.model = MagicMock()
+        transcriber.model.recognize.side_effect = lambda batch, sample_rate: [
+            SimpleNamespace(text=" part", tokens=[" part"], timestamps=[0.5]) for _ in batch
+        ]
+        audio = np.zeros(45 * SAMPLE_RATE, dtype=np.float32)
+        timings = TranscriptTimings()
+        transcriber._recognize_audio(audio, timings=timings)
+
+        starts = [start for start, _, _ in timings.segments]
+        assert len(starts) >= 3
+        assert starts == sorted(starts)
+        assert [start + 0.5 for start in starts] == [start for start, _, _ in timings.words]
+        assert timings.segments[-1][1] == pytest.approx(45.0)
+
+    def test_segmenter_reports_segment_starts(self):
+        segmenter = SpeechSegmenter(SAMPLE_RATE)
+        tone = (0.3 * np.sin(2 * np.pi * 220 * np.arange(SAMPLE_RATE) / SAMPLE_RATE)).astype(np.float32)
+        audio = np.concatenate([np.zeros(3 * SAMPLE_RATE, dtype=np.float32), tone])
+        for start in range(0, len(audio), 1024):
+            segmenter.feed(audio[start : start + 1024])
+        segmenter.flush()
+        assert len(segmenter.segment_starts) == 1
+        assert 2.0 < segmenter.segment_starts[0] < 3.0
+
+
+class TestTimingsSidecar:
+    def test_save_recording_writes_sidecar(self, tmp_path):
+        write_wav(tmp_path / "in.wav", silence(1.0))
+        save_dir = tmp_path / "recs"
+        save_recording(
+            tmp_path / "in.wav", "Hello.", "base", "en", 1.0, 0.5, save_dir, datetime.now(), timings=_timings()
+        )
+        json_path = next(save_dir.glob("*/*.json"))
+        metadata = json.loads(json_path.read_text())
+        assert metadata["timings_file"] == f"{json_path.stem}{TranscriptTimings.SUFFIX}"
+        assert len(TranscriptTimings.load(json_path.parent / metadata["timings_file"]).segments) == 2
+
+    def test_no_sidecar_without_timings(self, tmp_path):
+        write_wav(tmp_path / "in.wav", silence(1.0))
+        save_dir = tmp_path / "recs"
+        save_recording(tmp_path / "in.wav", "Hello.", "base", "en", 1.0, 0.5, save_dir, datetime.now())
+        assert "timings_file" not in json.loads(next(save_dir.glob("*/*.json")).read_text())
+        assert not list(save_dir.glob(f"*/*{TranscriptTimings.SUFFIX}"))
+
+    def test_search_shows_where_the_match_was_said(self, mock_home):
+        wav = write_wav(Path.home() / "source.wav", silence(1.0))
+        text = "Good morning everyone. Let's review the billing service."
+        save_recording(wav, text, "base", "en", 6.0, 0.5, get_default_save_dir(), datetime.now(), timings=_timings())
+
+        result = CliRunner().invoke(main, ["search", "billing"])
+        assert result.exit_code == 0
+        assert "@ 00:02" in result.stdout
+
+        hit = json.loads(CliRunner().invoke(main, ["search", "billing", "--json"]).stdout)
+        assert hit["segment_start"] == pytest.approx(2.5)
@@ -1,7 +1,13 @@
 import sys
+import wave
 from pathlib import Path
 
-from hns.cli import _write_config, format_duration, get_default_save_dir, load_config
+import numpy as np
+
+from hns.audio import _iter_wav_blocks, _split_at_pauses
+from hns.cli import _write_config
+from hns.config import get_default_save_dir, load_config
+from hns.console import format_duration
 
 
 class TestFormatDuration:
@@ -78,3 +84,46 @@ class TestWriteConfig:
         cfg = load_config()
         assert cfg["backend"] == "parakeet"
         assert cfg["model"] == "nemo-parakeet-ctc-0.6b"
+
+    def test_file_only_keys_are_preserved(self, mock_home):
+        config_dir = mock_home / ".config" / "hns"
+        config_dir.mkdir(parents=True)
+        (config_dir / "config.toml").write_text('model = "small"\nbatch_threshold = 300\n')
+        _write_config(backend="whisper", model=None, language=None, save_dir=None)
+        assert load_config() == {"backend": "whisper", "model": "small", "batch_threshold": 300}
+
+
+class TestIterWavBlocks:
+    def test_stereo_int16_is_downmixed_to_float(self, tmp_path):
+        path = tmp_path / "stereo.wav"
+        frames = np.array([[16384, 0], [-16384, -16384]] * 1000, dtype=np.int16)
+        with wave.open(str(path), "wb") as f:
+            f.setnchannels(2)
+            f.setsampwidth(2)
+            f.setframerate(1000)
+            f.writeframes(frames.tobytes())
+
+        blocks = list(_iter_wav_blocks(path, block_seconds=0.5))
+        assert [len(b) for b in blocks] == [500, 500, 500, 500]
+        samples = np.concatenate(blocks)
+        np.testing.assert_allclose(samples[:2], [0.25, -0.5])
+
+
+class TestSplitAtPauses:
+    def test_cuts_fall_in_pauses_and_keep_all_audio(self):
+        rate = 1000
+        speech = np.full(rate * 9, 0.5, dtype=np.float32)
+        pause = np.zeros(rate // 2, dtype=np.float32)
+        audio = np.concatenate([speech, pause, speech, pause, speech])
+
+        chunks = list(_split_at_pauses([audio[i : i + 700] for i in range(0, len(audio), 700)], rate, 12.0))
+        assert sum(len(c) for c in chunks) == len(audio)
+        assert all(len(c) <= 12 * rate for c in chunks)
+        assert len(chunks) == 3
+        # Every chunk boundary lands inside a pause
+        for chunk in chunks[:-1]:
+            assert abs(chunk[-1]) < 1e-6
+
+    def test_short_stream_is_a_single_chunk(self):
+        chunks = list(_split_at_pauses([np.ones(100, dtype=np.float32)] * 3, 1000, 10.0))
+        assert len(chunks) == 1 and len(chunks[0]) == 300
@@ -1,6 +1,8 @@
 import sys
-from unittest.mock import MagicMock
+import threading
+from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pytest
 
 from hns.cli import WhisperTranscriber
@@ -73,3 +75,96 @@ class TestResolveDevice:
         device, compute_type = _new()._resolve_device(None)
         assert device == "cpu"
         assert compute_type == "int8"
+
+
+class TestRecognize:
+    def _transcriber(self, texts):
+        t = _new()
+        t.language = None
+        t.batch_threshold = WhisperTranscriber.DEFAULT_BATCH_THRESHOLD_SECONDS
+        t._batched_pipeline = None
+        t.model = MagicMock()
+        t.model.transcribe.return_value = ([MagicMock(text=text) for text in texts], None)
+        return t
+
+    def test_joins_non_empty_segments(self):
+        t = self._transcriber([" Hello there. ", "  ", "General Kenobi."])
+        assert t._recognize("audio.wav") == "Hello there. General Kenobi."
+
+    def test_initial_prompt_is_forwarded(self):
+        t = self._transcriber(["again"])
+        t._recognize("audio.wav", initial_prompt="previous text")
+        assert t.model.transcribe.call_args.kwargs["initial_prompt"] == "previous text"
+
+    def test_no_prompt_by_default(self):
+        t = self._transcriber(["text"])
+        t._recognize("audio.wav")
+        assert "initial_prompt" not in t.model.transcribe.call_args.kwargs
+
+
+class TestBatchedInference:
+    def _transcriber(self, batch_threshold):
+        t = _new()
+        t.language = None
+        t.batch_threshold = batch_threshold
+        t.model = MagicMock()
+        t.model.transcribe.return_value = ([MagicMock(text="sequential")], None)
+        t._batched_pipeline = MagicMock()
+        t._batched_pipeline.transcribe.return_value = ([MagicMock(text="batched")], None)
+        return t
+
+    def test_short_audio_is_decoded_sequentially(self):
+        t = self._transcriber(batch_threshold=60)
+        assert t._recognize_audio(np.zeros(16000 * 10, dtype=np.float32)) == "sequential"
+        t._batched_pipeline.transcribe.assert_not_called()
+
+    def test_long_audio_uses_batched_pipeline(self):
+        t = self._transcriber(batch_threshold=60)
+        assert t._recognize_audio(np.zeros(16000 * 61, dtype=np.float32)) == "batched"
+        assert t._batched_pipeline.transcribe.call_args.kwargs["batch_size"] == WhisperTranscriber.BATCH_SIZE
+        t.model.transcribe.assert_not_called()
+
+    def test_unreadable_duration_is_decoded_sequentially(self, tmp_path):
+        t = self._transcriber(batch_threshold=0)
+        assert t._recognize(str(tmp_path / "missing.wav")) == "sequential"
+
+
+class TestGetBatchThreshold:
+    def test_default(self, monkeypatch):
+        monkeypatch.delenv("HNS_BATCH_THRESHOLD", raising=False)
+        assert _new()._get_batch_threshold(None) == WhisperTranscriber.DEFAULT_BATCH_THRESHOLD_SECONDS
+
+    def test_env_var(self, monkeypatch):
+        monkeypatch.setenv("HNS_BATCH_THRESHOLD", "120")
+        assert _new()._get_batch_threshold(None) == 120.0
+
+    def test_arg_takes_precedence_over_env(self, monkeypatch):
+        monkeypatch.setenv("HNS_BATCH_THRESHOLD", "120")
+        assert _new()._get_batch_threshold(30) == 30.0
+
+    def test_invalid_value_falls_back_to_default(self):
+        assert _new()._get_batch_threshold("soon") == WhisperTranscriber.DEFAULT_BATCH_THRESHOLD_SECONDS
+
+
+class TestTranscriptionTime:
+    def test_decode_time_is_not_rounded_to_the_progress_tick(self):
+        clock = [100.0]
+        progress_shown = threading.Event()
+
+        def recognize(*args, **kwargs):
+            progress_shown.wait(5)
+            clock[0] += 0.25
+            return "text"
+
+        t = _new()
+        t._recognize = recognize
+        fake_time = MagicMock()
+        fake_time.time.side_effect = lambda: clock[0]
+        fake_time.sleep.side_effect = lambda seconds: clock.__setitem__(0, clock[0] + seconds)
+        fake_console = MagicMock()
+        fake_console.print.side_effect = lambda *args, **kwargs: progress_shown.set()
+
+        with patch("hns.cli.time", fake_time), patch("hns.cli.console", fake_console):
+            text, elapsed = t.transcribe(np.zeros(16000, dtype=np.float32), show_progress=True)
+        assert text == "text"
+        assert elapsed == pytest.approx(0.25)